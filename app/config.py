@@ -24,24 +24,123 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str | None = None
+    REDIS_MAX_CONNECTIONS: int = 20
+    REDIS_SOCKET_TIMEOUT: float = 0.5  # seconds
+    REDIS_RETRY_INTERVAL: int = 30  # seconds to fall back to L1 after an error
     CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"  # memory | redis | disk
+    CACHE_L1_MAXSIZE: int = 1000  # in-process entries
+    CACHE_L1_MAX_BYTES: int = 64 * 1024 * 1024  # in-process memory budget
+    CACHE_MAX_ENTRY_BYTES: int = 2 * 1024 * 1024  # largest entry cached, 0 = no limit
+    CACHE_MAX_ENTRY_OPTIONS: int = 8 * 1024 * 1024  # full options chains
+    CACHE_L1_MAX_TTL: int = 30  # seconds an L1 copy of a Redis/disk entry lives
+
+    # Disk cache (CACHE_BACKEND=disk): SQLite file shared by the host's workers
+    CACHE_DISK_PATH: str = "data/http_cache.sqlite3"
+    CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024  # size budget of stored entries
+    CACHE_DISK_MMAP_BYTES: int = 256 * 1024 * 1024  # memory-mapped read window
+    CACHE_DISK_COMPACT_INTERVAL: int = 300  # seconds between compaction passes
+    CACHE_DISK_BUSY_TIMEOUT: float = 2.0  # seconds to wait on another worker's write
 
     # Cache TTL (seconds)
     CACHE_TTL_QUOTE: int = 60  # 1 minute
     CACHE_TTL_SCREENER: int = 900  # 15 minutes
     CACHE_TTL_HISTORICAL: int = 86400  # 24 hours
     CACHE_TTL_PROFILE: int = 604800  # 7 days
+    CACHE_TTL_HISTORICAL_CLOSED: int = 2592000  # 30 days, end_date a final day
+    CACHE_TTL_ECONOMY: int = 3600  # 1 hour
+    CACHE_TTL_DEFAULT: int = 300  # 5 minutes
+
+    # Stale-while-revalidate window past the TTL
+    CACHE_STALE_RATIO: float = 0.5  # fraction of the route TTL
+    CACHE_STALE_MAX: int = 86400  # 1 day
+
+    # Cache Warmer (routes re-rendered into the cache on a fixed interval)
+    CACHE_WARMER_ENABLED: bool = True
+    CACHE_WARM_JOBS: dict[str, int] = {  # route (under API_PREFIX) -> seconds
+        "/yfinance/screener/gainers": 300,
+        "/yfinance/screener/losers": 300,
+        "/yfinance/screener/active": 300,
+        "/fed/treasury/rates": 1800,
+        "/fed/federal/funds/rate": 1800,
+        "/fed/sofr/rate": 1800,
+    }
+
+    # Hot key tracking and prewarming of the most requested cache keys
+    CACHE_HOT_KEYS_ENABLED: bool = True
+    CACHE_HOT_KEY_SKETCH_WIDTH: int = 2048  # count-min counters per row
+    CACHE_HOT_KEY_SKETCH_DEPTH: int = 4  # count-min rows
+    CACHE_HOT_KEY_TOP_K: int = 64  # heavy hitters tracked
+    CACHE_HOT_KEY_DECAY: int = 600  # seconds between halving counts
+    CACHE_PREWARM_TOP_N: int = 20  # hottest keys kept warm, 0 disables
+    CACHE_PREWARM_LEAD: int = 15  # seconds before expiry to refresh
+    CACHE_PREWARM_INTERVAL: int = 5  # seconds between expiry checks
+    CACHE_PREWARM_MIN_COUNT: int = 3  # requests needed to be prewarmed
+
+    # Quote streaming (one shared upstream poll for all subscribers)
+    QUOTE_STREAM_INTERVAL: float = 5.0  # seconds between upstream polls
+    QUOTE_STREAM_HEARTBEAT: int = 15  # seconds between keep-alives when idle
+    QUOTE_STREAM_MAX_SYMBOLS: int = 50  # per subscription
+
+    # Quote versions for delta responses
+    QUOTE_VERSION_MAX_SYMBOLS: int = 5000  # symbols with version history
+    QUOTE_VERSION_HISTORY: int = 8  # versions kept per symbol
+
+    # Prometheus metrics at /metrics (set PROMETHEUS_MULTIPROC_DIR with several workers)
+    METRICS_ENABLED: bool = True
+
+    # Admin API (disabled while empty)
+    ADMIN_TOKEN: str = ""
+
+    # Request profiling (X-Profile + X-Admin-Token header, or sampled)
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of API requests profiled
+    PROFILE_INTERVAL: float = 0.005  # seconds between stack samples
+    PROFILE_MAX_DURATION: int = 30  # seconds sampled per request
+    PROFILE_MAX_PROFILES: int = 50  # profiles kept
+    PROFILE_DIR: str = "data/profiles"  # shared by workers, empty = per-worker memory
 
     # Pagination
     DEFAULT_PAGE_SIZE: int = 50
     MAX_PAGE_SIZE: int = 200
 
+    # Batch Requests
+    BATCH_QUOTE_CHUNK_SIZE: int = 25  # symbols per multi-symbol upstream call
+    BATCH_QUOTE_CONCURRENCY: int = 10  # concurrent upstream quote calls
+    BATCH_QUOTE_TIMEOUT: float = 10.0  # seconds per upstream call
+
+    # Options Chain Index
+    OPTIONS_INDEX_CACHE_SIZE: int = 64  # indexed chains held in memory
+    OPTIONS_INDEX_MAX_BYTES: int = 64 * 1024 * 1024  # memory budget of indexed chains
+    OPTIONS_INDEX_TTL: int = 300  # seconds before a chain is refetched
+
+    # Streaming (NDJSON)
+    STREAM_CHUNK_SIZE: int = 500  # records encoded per chunk
+
     # Compression
     GZIP_MIN_SIZE: int = 1000  # bytes
+    CACHE_GZIP_LEVEL: int = 6  # precompressed cache entries
+
+    # Historical Bar Store (incremental range cache)
+    BAR_STORE_MAX_SERIES: int = 256  # (symbol, provider) series in memory
+    BAR_STORE_MIN_FETCH_DAYS: int = 5  # short gaps are widened to this
+    BAR_STORE_DIR: str = "data/bars"  # columnar .npy files, empty = memory only
+    BAR_STORE_FINAL_LAG_DAYS: int = 1  # UTC days before a bar is stored as final
+    HISTORICAL_DATASET_CACHE_SIZE: int = 128  # extracted (symbol, range) datasets
+    HISTORICAL_DATASET_MAX_BYTES: int = 64 * 1024 * 1024  # memory budget of datasets
+    HISTORICAL_DATASET_TTL: int = 300  # seconds, ranges with non-final days
 
     # OpenBB Settings
     OPENBB_USER_DATA_PATH: str | None = None
 
+    # Upstream Executor Settings (worker threads per provider pool)
+    EXECUTOR_WORKERS_YFINANCE: int = 16
+    EXECUTOR_WORKERS_FEDERAL_RESERVE: int = 4
+    EXECUTOR_WORKERS_SEC: int = 4
+    EXECUTOR_WORKERS_CBOE: int = 4
+    EXECUTOR_WORKERS_ECB: int = 2
+    EXECUTOR_WORKERS_CFTC: int = 2
+    EXECUTOR_WORKERS_DEFAULT: int = 4
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -3,10 +3,10 @@ OpenBB Mobile API - Main FastAPI Application.
 
 Mobile-optimized REST API for financial data using OpenBB Platform's free providers.
 """
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 from datetime import datetime
 import uvicorn
 
@@ -18,9 +18,43 @@ from app.routers import (
     crypto_router,
     currency_router,
     etf_router,
-    extra_providers_router
+    extra_providers_router,
+    admin_router
+)
+from app.middleware import (
+    CacheMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    get_cache,
+    start_cache_warmer,
+    stop_cache_warmer
 )
-from app.middleware import CacheMiddleware
+from app.metrics import check_metrics_setup, render_metrics, shutdown_metrics
+from app.responses import ORJSONResponse
+from app.services import (
+    get_quote_hub,
+    peek_openbb_service,
+    shutdown_openbb_service,
+    shutdown_quote_hub
+)
+
+
+# ============================================================================
+# Lifespan
+# ============================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks."""
+    if settings.METRICS_ENABLED:
+        check_metrics_setup()
+    start_cache_warmer(app)
+    yield
+    await stop_cache_warmer()
+    await shutdown_quote_hub()
+    shutdown_openbb_service()
+    await get_cache().close()
+    shutdown_metrics()
 
 
 # Create FastAPI application
@@ -54,14 +88,28 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # ============================================================================
 # Middleware
 # ============================================================================
 
-# CORS middleware
+# Request profiling (innermost; opt-in via admin header or sample rate)
+if settings.ADMIN_TOKEN or settings.PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilingMiddleware)
+
+# GZip compression for responses > 1KB
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MIN_SIZE)
+
+# Cache middleware (optional, can be disabled via settings)
+if settings.CACHE_ENABLED:
+    app.add_middleware(CacheMiddleware, cache_get_requests=True)
+
+# CORS middleware (outside the cache, so CORS headers follow each request's
+# Origin instead of being replayed from the entry)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -70,12 +118,9 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
-# GZip compression for responses > 1KB
-app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MIN_SIZE)
-
-# Cache middleware (optional, can be disabled via settings)
-if settings.CACHE_ENABLED:
-    app.add_middleware(CacheMiddleware, cache_get_requests=True)
+# Request metrics (outermost, so cache hits are timed too)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 
 # ============================================================================
@@ -85,7 +130,7 @@ if settings.CACHE_ENABLED:
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -105,14 +150,28 @@ async def global_exception_handler(request: Request, exc: Exception):
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint."""
+    obb = peek_openbb_service()
     return {
         "status": "healthy",
         "version": settings.APP_VERSION,
         "timestamp": datetime.now().isoformat(),
-        "cache_enabled": settings.CACHE_ENABLED
+        "cache_enabled": settings.CACHE_ENABLED,
+        "cache_backend": settings.CACHE_BACKEND,
+        "cache": get_cache().stats(),
+        "single_flight": obb.get_single_flight_stats() if obb else None,
+        "bar_store": obb.get_bar_store_stats() if obb else None,
+        "quote_stream": get_quote_hub().stats()
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics, aggregated across workers."""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+
 # ============================================================================
 # Root Endpoint
 # ============================================================================
@@ -182,6 +241,12 @@ app.include_router(
     tags=["Extra Providers"]
 )
 
+app.include_router(
+    admin_router,
+    prefix=settings.API_PREFIX,
+    tags=["Admin"]
+)
+
 
 # ============================================================================
 # Main Entry Point
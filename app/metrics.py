@@ -0,0 +1,177 @@
+"""
+Prometheus metrics.
+
+Request latency per route, upstream calls per provider, extraction and
+serialization time, and cache outcomes and memory. Every observation is
+an in-process counter update; nothing is computed until `/metrics` is
+scraped.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory before starting them (scripts/start_prod.sh and the Docker
+entrypoint do): each worker then writes its samples to memory-mapped
+files there, and a scrape, in whichever worker receives it, aggregates
+the files of all workers.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from typing import Any, Callable, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Bucket upper bounds in seconds
+_REQUEST_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30
+)
+_UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+_CPU_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1
+)
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template",
+    ["method", "route", "status"],
+    buckets=_REQUEST_BUCKETS
+)
+
+UPSTREAM_CALLS = Counter(
+    "upstream_calls_total",
+    "OpenBB SDK calls, by provider and outcome (ok/error)",
+    ["provider", "outcome"]
+)
+
+UPSTREAM_DURATION = Histogram(
+    "upstream_call_duration_seconds",
+    "OpenBB SDK call time on the provider's thread pool",
+    ["provider"],
+    buckets=_UPSTREAM_BUCKETS
+)
+
+EXTRACT_DURATION = Histogram(
+    "extract_duration_seconds",
+    "Time to extract SDK results into response records, by function",
+    ["function"],
+    buckets=_CPU_BUCKETS
+)
+
+SERIALIZE_DURATION = Histogram(
+    "serialize_duration_seconds",
+    "Time to encode response bodies, by format (json/ndjson)",
+    ["format"],
+    buckets=_CPU_BUCKETS
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cacheable requests, by result (hit/stale/miss)",
+    ["result"]
+)
+
+CACHE_MEMORY_BYTES = Gauge(
+    "cache_memory_bytes",
+    "Approximate bytes held by the in-process (L1) response cache",
+    multiprocess_mode="livesum"
+)
+
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entries in the in-process (L1) response cache",
+    multiprocess_mode="livesum"
+)
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def timed_call(provider: str, func: Callable, /, *args, **kwargs) -> Any:
+    """
+    Call a blocking function and record its time.
+
+    Functions defined in this app are extraction steps (timed by name);
+    anything else is an SDK call (counted and timed per provider).
+
+    Args:
+        provider: Provider whose thread pool runs the call
+        func: Blocking callable
+
+    Returns:
+        The callable's return value
+    """
+    if getattr(func, "__module__", "").startswith("app."):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            EXTRACT_DURATION.labels(func.__name__).observe(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = func(*args, **kwargs)
+        outcome = "ok"
+        return result
+    finally:
+        UPSTREAM_DURATION.labels(provider).observe(time.perf_counter() - started)
+        UPSTREAM_CALLS.labels(provider, outcome).inc()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render every metric in the Prometheus text format.
+
+    Returns:
+        Tuple of (body, content_type)
+    """
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def _multiple_workers() -> bool:
+    """Whether this process is one of several server workers."""
+    try:
+        if int(os.environ.get("WEB_CONCURRENCY", "1")) > 1:
+            return True
+    except ValueError:
+        pass
+    # uvicorn --workers N spawns each worker from a supervisor process
+    return multiprocessing.parent_process() is not None
+
+
+def check_metrics_setup() -> None:
+    """Warn when several workers run without a shared multiprocess directory."""
+    if not MULTIPROC_DIR and _multiple_workers():
+        logger.warning(
+            "Several workers are running without PROMETHEUS_MULTIPROC_DIR; "
+            "/metrics will only report the worker that serves each scrape"
+        )
+
+
+def shutdown_metrics() -> None:
+    """Drop this worker's live gauges from the multiprocess directory."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -2,14 +2,54 @@
 
 from .cache import (
     SimpleCache,
+    create_cache_backend,
     get_cache,
     cached_response,
     CacheMiddleware
 )
+from .cache_entry import CacheEntry
+from .cache_backends import (
+    CacheBackend,
+    DiskCacheBackend,
+    RedisCacheBackend,
+    TieredCacheBackend
+)
+from .cache_policy import CacheRule, CachePolicy, get_cache_policy
+from .cache_warmer import (
+    CacheWarmer,
+    HotKeyPrewarmer,
+    start_cache_warmer,
+    stop_cache_warmer,
+    get_cache_warmer,
+    get_hot_key_prewarmer
+)
+from .hot_keys import HotKey, HotKeyTracker, get_hot_key_tracker
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
 
 __all__ = [
     "SimpleCache",
+    "create_cache_backend",
     "get_cache",
     "cached_response",
     "CacheMiddleware",
+    "CacheEntry",
+    "CacheBackend",
+    "DiskCacheBackend",
+    "RedisCacheBackend",
+    "TieredCacheBackend",
+    "CacheRule",
+    "CachePolicy",
+    "get_cache_policy",
+    "CacheWarmer",
+    "start_cache_warmer",
+    "stop_cache_warmer",
+    "get_cache_warmer",
+    "HotKeyPrewarmer",
+    "get_hot_key_prewarmer",
+    "HotKey",
+    "HotKeyTracker",
+    "get_hot_key_tracker",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
 ]
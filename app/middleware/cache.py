@@ -1,53 +1,128 @@
 """
 Caching middleware for FastAPI.
 
-Implements in-memory caching with optional Redis backend.
+Implements in-memory caching with optional Redis (CACHE_BACKEND=redis)
+or on-disk (CACHE_BACKEND=disk) shared backends, see cache_backends.py.
 """
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.datastructures import Headers
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set, Tuple
+import asyncio
 import hashlib
-import json
+import logging
+import sys
 import time
 from functools import wraps
-from cachetools import TTLCache
+from cachetools import TLRUCache
 
 from app.config import settings
+from app.metrics import CACHE_ENTRIES, CACHE_MEMORY_BYTES, CACHE_REQUESTS
+from app.responses import accepts_gzip, dumps, wants_ndjson
+from app.middleware.cache_policy import get_cache_policy
+from app.middleware.cache_entry import CACHE_KEY_PREFIX, CacheEntry
+from app.middleware.hot_keys import get_hot_key_tracker
+from app.middleware.profiling import profile_requested
+from app.middleware.cache_backends import (
+    CacheBackend,
+    DiskCacheBackend,
+    RedisCacheBackend,
+    TieredCacheBackend
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _item_size(item: Tuple[float, Any]) -> int:
+    """Approximate bytes held by a cached (expires_at, value) item."""
+    value = item[1]
+    size = getattr(value, "size", None)
+    return size if isinstance(size, int) else sys.getsizeof(value)
+
+
+class SimpleCache(CacheBackend):
+    """
+    Simple in-memory cache with TTL support.
 
+    Bounded by the approximate bytes of its values (CacheEntry.size), so a
+    few full options chains weigh as much as thousands of quotes; expired
+    items go first, then least recently used ones.
+    """
 
-class SimpleCache:
-    """Simple in-memory cache with TTL support."""
-
-    def __init__(self):
-        """Initialize cache."""
-        self._cache: TTLCache = TTLCache(maxsize=1000, ttl=300)  # 5 min default
+    def __init__(self, maxsize: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize cache.
 
-    def get(self, key: str) -> Optional[Any]:
+        Args:
+            maxsize: Maximum number of entries
+            max_bytes: Memory budget for stored values, in bytes
+        """
+        self._max_entries = maxsize
+        # Items are (expires_at, value); each expires at its own timestamp
+        self._cache: TLRUCache = TLRUCache(
+            maxsize=max_bytes,
+            ttu=lambda _key, item, _now: item[0],
+            timer=time.time,
+            getsizeof=_item_size
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        return self._cache.get(key)
-
-    def set(self, key: str, value: Any, ttl: int = 300) -> None:
-        """Set value in cache with TTL."""
-        # Create a new cache entry with specific TTL
-        entry = {"value": value, "expires": time.time() + ttl}
-        self._cache[key] = entry
-
-    def delete(self, key: str) -> None:
+        item = self._cache.get(key)
+        return None if item is None else item[1]
+
+    async def set(self, key: str, value: Any, ttl: int = 300) -> None:
+        """Set value in cache with TTL (values over the whole budget are dropped)."""
+        try:
+            self._cache[key] = (time.time() + ttl, value)
+        except ValueError:
+            self._cache.pop(key, None)
+            self._report_size()
+            return
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem()
+        self._report_size()
+
+    async def delete(self, key: str) -> None:
         """Delete value from cache."""
-        if key in self._cache:
-            del self._cache[key]
+        self._cache.pop(key, None)
+        self._report_size()
 
-    def clear(self) -> None:
+    async def clear(self) -> None:
         """Clear all cache entries."""
         self._cache.clear()
+        self._report_size()
+
+    def _report_size(self) -> None:
+        """Publish entry count and memory use to the metrics gauges."""
+        CACHE_ENTRIES.set(len(self._cache))
+        CACHE_MEMORY_BYTES.set(self._cache.currsize)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and memory use."""
+        return {
+            "entries": len(self._cache),
+            "max_entries": self._max_entries,
+            "bytes": self._cache.currsize,
+            "max_bytes": self._cache.maxsize,
+        }
+
+
+def create_cache_backend() -> CacheBackend:
+    """Create the cache backend selected by CACHE_BACKEND."""
+    l1 = SimpleCache(maxsize=settings.CACHE_L1_MAXSIZE, max_bytes=settings.CACHE_L1_MAX_BYTES)
+    if settings.CACHE_BACKEND == "redis":
+        return TieredCacheBackend(l1, RedisCacheBackend())
+    if settings.CACHE_BACKEND == "disk":
+        return TieredCacheBackend(l1, DiskCacheBackend())
+    return l1
 
 
 # Global cache instance
-_cache = SimpleCache()
+_cache: CacheBackend = create_cache_backend()
 
 
-def get_cache() -> SimpleCache:
+def get_cache() -> CacheBackend:
     """Get cache instance."""
     return _cache
 
@@ -66,7 +141,135 @@ def cache_key_builder(request: Request) -> str:
     ]
 
     key_string = ":".join(key_parts)
-    return f"mobile:{hashlib.md5(key_string.encode()).hexdigest()}"
+    return f"{CACHE_KEY_PREFIX}{hashlib.md5(key_string.encode()).hexdigest()}"
+
+
+def _strip_accept_encoding(request: Request) -> None:
+    """
+    Remove Accept-Encoding before the request reaches GZipMiddleware.
+
+    Cacheable responses are compressed once, when the entry is stored,
+    instead of on every response. `request.headers` is materialized first,
+    so this middleware keeps seeing the client's original headers.
+    """
+    if "accept-encoding" not in request.headers:
+        return
+    request.scope["headers"] = [
+        (name, value) for name, value in request.scope["headers"]
+        if name != b"accept-encoding"
+    ]
+
+
+def _entry_response(entry: CacheEntry, request: Request, x_cache: str, max_age: int) -> Response:
+    """Serve a cache entry: 304 if the client's copy is current, else its bytes."""
+    if entry.is_not_modified(request.headers):
+        response = entry.not_modified_response()
+    else:
+        response = entry.response(accepts_gzip(request))
+    response.headers["X-Cache"] = x_cache
+    response.headers["Cache-Control"] = f"public, max-age={max(max_age, 0)}"
+    return response
+
+
+def _fits(entry: CacheEntry, path: str) -> bool:
+    """Check an entry against its route's per-entry size limit."""
+    limit = get_cache_policy().max_entry_size_for(path)
+    return not limit or entry.size <= limit
+
+
+# Scope flag: skip the cache lookup and store a freshly rendered response
+FORCE_REFRESH_SCOPE_KEY = "cache.force_refresh"
+
+# Scope flag marking a request replayed in-process (kept out of request metrics)
+REPLAY_SCOPE_KEY = "cache.replay"
+
+# Client headers that must not leak into a background replay
+_REPLAY_EXCLUDED_HEADERS = {b"accept-encoding", b"if-none-match", b"if-modified-since"}
+
+
+async def _replay(app, scope: Dict[str, Any]) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Run a GET request through an ASGI app outside any client connection.
+
+    Args:
+        app: ASGI application to call
+        scope: HTTP scope of the original request
+
+    Returns:
+        Tuple of (status_code, headers, body)
+    """
+    scope = dict(scope)
+    scope[REPLAY_SCOPE_KEY] = True
+    scope["headers"] = [
+        (name, value) for name, value in scope["headers"]
+        if name not in _REPLAY_EXCLUDED_HEADERS
+    ]
+    if "state" in scope:
+        scope["state"] = dict(scope["state"])
+
+    status_code = 500
+    headers: Dict[str, str] = {}
+    chunks = []
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status_code, headers
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            headers = {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in message["headers"]
+            }
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    return status_code, headers, b"".join(chunks)
+
+
+async def refresh_cached_route(app, path: str, query_string: str = "") -> int:
+    """
+    Render a GET route through the full app, bypassing cache lookup.
+
+    CacheMiddleware stores the fresh response as on a miss, so the next
+    client request is a hit.
+
+    Args:
+        app: The application (outermost ASGI app)
+        path: Request path, including the API prefix
+        query_string: Raw query string (without "?")
+
+    Returns:
+        Response status code
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string.encode(),
+        "headers": [(b"host", b"cache-warmer"), (b"accept", b"application/json")],
+        "client": None,
+        "server": None,
+        FORCE_REFRESH_SCOPE_KEY: True,
+    }
+    status_code, _, _ = await _replay(app, scope)
+    return status_code
 
 
 def cached_response(ttl: int = 300, cache_headers: bool = True):
@@ -88,23 +291,13 @@ def cached_response(ttl: int = 300, cache_headers: bool = True):
 
             if request:
                 cache_key = cache_key_builder(request)
-                cached = _cache.get(cache_key)
+                cached = await _cache.get(cache_key)
+                now = time.time()
 
-                if cached is not None:
-                    # Check if expired
-                    if cached.get("expires", 0) > time.time():
-                        response_data = cached["value"]
-                        response = Response(
-                            content=json.dumps(response_data),
-                            media_type="application/json",
-                            status_code=200
-                        )
-
-                        if cache_headers:
-                            response.headers["X-Cache"] = "HIT"
-                            response.headers["Cache-Control"] = f"public, max-age={ttl}"
-
-                        return response
+                if cached is not None and cached.is_fresh(now):
+                    if cache_headers:
+                        return _entry_response(cached, request, "HIT", int(cached.expires - now))
+                    return cached.response(accepts_gzip(request))
 
             # Call the actual function
             result = await func(*args, **kwargs)
@@ -112,14 +305,13 @@ def cached_response(ttl: int = 300, cache_headers: bool = True):
             # Cache the result
             if request and isinstance(result, (dict, list)):
                 cache_key = cache_key_builder(request)
-                _cache.set(cache_key, result, ttl)
-
-                # Add cache headers to response
-                if hasattr(result, "__dict__"):
-                    # It's a Pydantic model
-                    if cache_headers:
-                        # We'll handle this in the response
-                        pass
+                entry = CacheEntry.build(
+                    body=dumps(result),
+                    headers={"content-type": "application/json"},
+                    fetched_at=time.time(),
+                    ttl=ttl
+                )
+                await _cache.set(cache_key, entry, ttl)
 
             return result
 
@@ -132,7 +324,22 @@ class CacheMiddleware(BaseHTTPMiddleware):
     """
     Cache middleware for FastAPI.
 
-    Automatically caches GET requests based on TTL settings.
+    Automatically caches GET requests, with per-route TTLs taken from
+    the cache policy table (see cache_policy.py). Entries hold the final
+    response bytes plus a precompressed gzip variant, so hits do no JSON
+    or compression work, and answer If-None-Match / If-Modified-Since
+    with 304 Not Modified.
+
+    Entries larger than their route's size limit (cache_policy.py) are
+    served but not stored.
+
+    Past its TTL an entry is still served for a stale window (X-Cache:
+    STALE) while one background task per key replays the request and
+    refreshes it; past the window the normal miss path applies.
+
+    Client requests for cacheable routes are counted in the hot key
+    tracker (hot_keys.py), which drives the prewarmer, and by result in
+    the `cache_requests_total` metric.
     """
 
     def __init__(self, app, cache_get_requests: bool = True):
@@ -145,6 +352,40 @@ class CacheMiddleware(BaseHTTPMiddleware):
         """
         super().__init__(app)
         self.cache_get_requests = cache_get_requests
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _schedule_refresh(self, request: Request, cache_key: str, ttl: int, stale_ttl: int) -> None:
+        """Start one background refresh per stale key."""
+        if cache_key in self._refreshing:
+            return
+        self._refreshing.add(cache_key)
+        task = asyncio.create_task(
+            self._refresh(dict(request.scope), cache_key, ttl, stale_ttl)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, scope: Dict[str, Any], cache_key: str, ttl: int, stale_ttl: int) -> None:
+        """Replay a request through the downstream app and store the result."""
+        try:
+            status_code, headers, body = await _replay(self.app, scope)
+            if status_code == 200 and "application/json" in headers.get("content-type", ""):
+                entry = CacheEntry.build(
+                    body=body,
+                    headers=headers,
+                    fetched_at=time.time(),
+                    ttl=ttl,
+                    stale_ttl=stale_ttl
+                )
+                if _fits(entry, scope["path"]):
+                    await _cache.set(cache_key, entry, ttl=ttl + stale_ttl)
+                else:
+                    await _cache.delete(cache_key)
+        except Exception:
+            logger.exception("Background cache refresh failed for %s", scope.get("path"))
+        finally:
+            self._refreshing.discard(cache_key)
 
     async def dispatch(self, request: Request, call_next):
         """Process request with caching."""
@@ -157,52 +398,67 @@ class CacheMiddleware(BaseHTTPMiddleware):
         if any(path.startswith(p) for p in ["/docs", "/redoc", "/openapi.json", "/static"]):
             return await call_next(request)
 
-        # 3. Check cache
-        cache_key = cache_key_builder(request)
-        cached = _cache.get(cache_key)
-        if cached and cached.get("expires", 0) > time.time():
-            response_data = cached["value"]
-            response = Response(
-                content=json.dumps(response_data),
-                media_type="application/json",
-                status_code=200
-            )
-            response.headers["X-Cache"] = "HIT"
-            response.headers["Cache-Control"] = "public, max-age=300"
-            return response
+        # Streamed (NDJSON) responses are never buffered into the cache
+        if wants_ndjson(request):
+            return await call_next(request)
+
+        # Profiled requests always run the route, and are not stored
+        if profile_requested(request.headers):
+            return await call_next(request)
 
-        # 4. Process request
+        # 3. Resolve TTL for this route (0 disables caching)
+        policy = get_cache_policy()
+        ttl = policy.ttl_for(path, request.query_params)
+        if ttl <= 0:
+            return await call_next(request)
+        stale_ttl = policy.stale_for(ttl)
+
+        # 4. Check cache: fresh hit, or stale hit + background refresh
+        cache_key = cache_key_builder(request)
+        force_refresh = request.scope.get(FORCE_REFRESH_SCOPE_KEY, False)
+        if settings.CACHE_HOT_KEYS_ENABLED and not force_refresh:
+            get_hot_key_tracker().record(cache_key, path, request.url.query)
+        cached = None if force_refresh else await _cache.get(cache_key)
+        now = time.time()
+        if cached is not None and cached.is_fresh(now):
+            CACHE_REQUESTS.labels("hit").inc()
+            return _entry_response(cached, request, "HIT", int(cached.expires - now))
+        if cached is not None and cached.is_stale(now):
+            CACHE_REQUESTS.labels("stale").inc()
+            self._schedule_refresh(request, cache_key, ttl, stale_ttl)
+            return _entry_response(cached, request, "STALE", 0)
+        if not force_refresh:
+            CACHE_REQUESTS.labels("miss").inc()
+
+        # 5. Process request (uncompressed; the entry carries its own gzip)
+        _strip_accept_encoding(request)
         response = await call_next(request)
 
-        # 5. Only try to cache successful JSON responses
+        # 6. Only cache successful JSON responses
         content_type = response.headers.get("content-type", "")
-        if response.status_code == 200 and "application/json" in content_type:
-            try:
-                # Buffer the response body
-                body = b""
-                async for chunk in response.body_iterator:
-                    body += chunk
-
-                # Try to cache it
-                try:
-                    json_data = json.loads(body.decode())
-                    _cache.set(cache_key, json_data, ttl=300)
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    pass
-
-                # Re-construct response ALWAYS after consuming body_iterator
-                new_response = Response(
-                    content=body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers),
-                    media_type=response.media_type
-                )
-                new_response.headers["X-Cache"] = "MISS"
-                return new_response
+        if response.status_code != 200 or "application/json" not in content_type:
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        try:
+            # Buffer the response body
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        except Exception:
+            # Fallback to the original response if consumption failed (rare)
+            return response
 
-            except Exception:
-                # Fallback to empty response if consumption failed (rare)
-                return response
+        entry = CacheEntry.build(
+            body=body,
+            headers=dict(response.headers),
+            fetched_at=time.time(),
+            ttl=ttl,
+            stale_ttl=stale_ttl
+        )
+        if not _fits(entry, path):
+            # Too large to keep in memory: serve it uncached
+            response = entry.response(accepts_gzip(request))
+            response.headers["X-Cache"] = "MISS"
+            return response
+        await _cache.set(cache_key, entry, ttl=ttl + stale_ttl)
 
-        response.headers["X-Cache"] = "MISS"
-        return response
+        return _entry_response(entry, request, "MISS", ttl)
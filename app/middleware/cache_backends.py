@@ -0,0 +1,471 @@
+"""
+Pluggable cache backends.
+
+`CacheBackend` is the async interface the cache middleware talks to.
+`RedisCacheBackend` shares entries across uvicorn workers,
+`DiskCacheBackend` does the same for the workers of a single host without
+Redis (and survives restarts), and `TieredCacheBackend` puts a small
+in-process L1 in front of either, falling back to L1-only while Redis is
+unreachable.
+
+Shared backends also hand out named leases, so background work on the
+shared cache (e.g. the cache warmer) runs in one worker instead of all.
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import redis.asyncio as aioredis
+from redis.asyncio.retry import Retry
+from redis.backoff import NoBackoff
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.middleware.cache_entry import CACHE_KEY_PREFIX, CacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Prefix of lease keys; outside CACHE_KEY_PREFIX so clear() leaves them
+LEASE_KEY_PREFIX = "mobile:lease:"
+
+
+class CacheBackend:
+    """Async cache backend interface."""
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Get entry from cache."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: CacheEntry, ttl: int = 300) -> None:
+        """Set entry in cache with TTL."""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        """Delete value from cache."""
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        """Clear all cache entries."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        Take or renew a named lease for `ttl` seconds.
+
+        A process-local cache is warmed by every worker for itself, so the
+        default always grants it.
+
+        Args:
+            name: Lease name
+            owner: Identity of the caller (stable across renewals)
+            ttl: Seconds the lease is held unless renewed
+
+        Returns:
+            Whether `owner` holds the lease
+        """
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend size counters."""
+        return {}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis cache backend shared by all workers.
+
+    Errors never propagate: a failing Redis is marked unavailable for
+    REDIS_RETRY_INTERVAL seconds, during which reads miss and writes are
+    dropped. A value that does not decode as an entry is deleted and
+    read as a miss.
+    """
+
+    def __init__(
+        self,
+        client: Optional[aioredis.Redis] = None,
+        key_prefix: str = CACHE_KEY_PREFIX,
+        retry_interval: Optional[float] = None
+    ):
+        """
+        Initialize Redis backend.
+
+        Args:
+            client: Redis client (default: pooled client from settings)
+            key_prefix: Prefix of keys owned by this cache (used by clear)
+            retry_interval: Seconds to back off after a Redis error
+        """
+        if client is None:
+            pool = aioredis.ConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD or None,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                # Fail fast; the backend's own back-off handles outages
+                retry=Retry(NoBackoff(), 0)
+            )
+            client = aioredis.Redis(connection_pool=pool)
+        self._client = client
+        self._key_prefix = key_prefix
+        self._retry_interval = (
+            settings.REDIS_RETRY_INTERVAL if retry_interval is None else retry_interval
+        )
+        self._down_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Whether Redis is currently considered reachable."""
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception) -> None:
+        """Back off after a Redis error."""
+        if self.available:
+            logger.warning("Redis cache unavailable, using L1 only: %s", error)
+        self._down_until = time.monotonic() + self._retry_interval
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Get entry from Redis."""
+        if not self.available:
+            return None
+        try:
+            raw = await self._client.get(key)
+        except RedisError as e:
+            self._mark_down(e)
+            return None
+        if raw is None:
+            return None
+        try:
+            return CacheEntry.from_bytes(raw)
+        except Exception:
+            # Written by an incompatible version (or not by this cache): drop it
+            await self.delete(key)
+            return None
+
+    async def set(self, key: str, value: CacheEntry, ttl: int = 300) -> None:
+        """Set entry in Redis with TTL."""
+        if not self.available:
+            return
+        try:
+            await self._client.set(key, value.to_bytes(), ex=max(int(ttl), 1))
+        except RedisError as e:
+            self._mark_down(e)
+
+    async def delete(self, key: str) -> None:
+        """Delete value from Redis."""
+        if not self.available:
+            return
+        try:
+            await self._client.delete(key)
+        except RedisError as e:
+            self._mark_down(e)
+
+    async def clear(self) -> None:
+        """Delete all keys owned by this cache."""
+        if not self.available:
+            return
+        try:
+            async for key in self._client.scan_iter(match=f"{self._key_prefix}*"):
+                await self._client.delete(key)
+        except RedisError as e:
+            self._mark_down(e)
+
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take a lease with SET NX, or extend it if `owner` already holds it."""
+        if not self.available:
+            # Workers fall back to their own L1, which each keeps warm
+            return True
+        key = f"{LEASE_KEY_PREFIX}{name}"
+        ex = max(int(ttl), 1)
+        try:
+            if await self._client.set(key, owner, nx=True, ex=ex):
+                return True
+            if await self._client.get(key) == owner.encode():
+                return bool(await self._client.expire(key, ex))
+            return False
+        except RedisError as e:
+            self._mark_down(e)
+            return True
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._client.aclose()
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    SQLite cache file shared by the workers of one host.
+
+    The database runs in WAL mode with memory-mapped reads, so every
+    worker process reads concurrently while one writes, and entries
+    survive restarts and deploys. TTLs are enforced on read; a background
+    task deletes expired rows, trims the file to `max_bytes` (entries
+    closest to expiry first) and returns freed pages to the OS. Database
+    calls run on one dedicated thread so disk I/O never blocks the event
+    loop, and errors are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        compact_interval: Optional[float] = None
+    ):
+        """
+        Initialize disk backend.
+
+        Args:
+            path: Database file (created with its directory if missing)
+            max_bytes: Size budget of stored entries
+            compact_interval: Seconds between compaction passes
+        """
+        self._path = path or settings.CACHE_DISK_PATH
+        self._max_bytes = settings.CACHE_DISK_MAX_BYTES if max_bytes is None else max_bytes
+        self._compact_interval = (
+            settings.CACHE_DISK_COMPACT_INTERVAL if compact_interval is None else compact_interval
+        )
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-cache")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._compactor: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Any] = {
+            "entries": None,
+            "bytes": None,
+            "expired_removed": 0,
+            "evicted": 0,
+            "last_compaction": None,
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the database on first use (runs on the cache thread)."""
+        if self._conn is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self._path,
+                timeout=settings.CACHE_DISK_BUSY_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # only applies to a new file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(settings.CACHE_DISK_MMAP_BYTES)}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, "
+                "size INTEGER NOT NULL, value BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_expires ON cache_entries (expires_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_leases ("
+                "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    async def _call(self, func: Callable, *args) -> Any:
+        """Run a database function on the cache thread; errors become None."""
+        self._ensure_compactor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        except (sqlite3.Error, OSError) as e:
+            # OSError: the database directory cannot be created
+            logger.warning("Disk cache error: %s", e)
+            return None
+
+    def _ensure_compactor(self) -> None:
+        """Start the compaction loop on first use."""
+        if self._compactor is None and self._compact_interval > 0:
+            self._compactor = asyncio.create_task(self._compact_loop())
+
+    def _get(self, key: str, now: float) -> Optional[bytes]:
+        row = self._db().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _set(self, key: str, raw: bytes, expires_at: float) -> None:
+        self._db().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, expires_at, size, value) VALUES (?, ?, ?, ?)",
+            (key, expires_at, len(key) + len(raw), raw)
+        )
+
+    def _delete(self, key: str) -> None:
+        self._db().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def _clear(self) -> None:
+        self._db().execute("DELETE FROM cache_entries")
+
+    def _acquire_lease(self, name: str, owner: str, now: float, ttl: float) -> bool:
+        # One statement, so two workers cannot both take an expired lease
+        return self._db().execute(
+            "INSERT INTO cache_leases (name, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE "
+            "SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE cache_leases.owner = excluded.owner OR cache_leases.expires_at <= ?",
+            (name, owner, now + ttl, now)
+        ).rowcount == 1
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Get an unexpired entry from disk."""
+        raw = await self._call(self._get, key, time.time())
+        if raw is None:
+            return None
+        try:
+            return CacheEntry.from_bytes(raw)
+        except Exception:
+            # Written by an incompatible version: drop it
+            await self.delete(key)
+            return None
+
+    async def set(self, key: str, value: CacheEntry, ttl: int = 300) -> None:
+        """Set entry on disk with TTL."""
+        await self._call(self._set, key, value.to_bytes(), time.time() + ttl)
+
+    async def delete(self, key: str) -> None:
+        """Delete value from disk."""
+        await self._call(self._delete, key)
+
+    async def clear(self) -> None:
+        """Delete all entries."""
+        await self._call(self._clear)
+
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take a lease row, or extend it if `owner` already holds it."""
+        return bool(await self._call(self._acquire_lease, name, owner, time.time(), ttl))
+
+    async def _compact_loop(self) -> None:
+        """Compact every `compact_interval` seconds."""
+        while True:
+            await asyncio.sleep(self._compact_interval)
+            await self.compact()
+
+    async def compact(self) -> None:
+        """Delete expired entries, trim to the size budget and release free pages."""
+        await self._call(self._compact, time.time())
+
+    def _compact(self, now: float) -> None:
+        conn = self._db()
+        expired = conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,)).rowcount
+        entries, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+
+        evicted = []
+        if total > self._max_bytes:
+            excess = total - self._max_bytes
+            for key, size in conn.execute(
+                "SELECT key, size FROM cache_entries ORDER BY expires_at"
+            ).fetchall():
+                if excess <= 0:
+                    break
+                evicted.append((key,))
+                excess -= size
+                total -= size
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", evicted)
+
+        conn.executescript("PRAGMA incremental_vacuum;")  # runs to completion, unlike execute()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._stats.update(
+            entries=entries - len(evicted),
+            bytes=total,
+            last_compaction=now
+        )
+        self._stats["expired_removed"] += expired
+        self._stats["evicted"] += len(evicted)
+
+    async def close(self) -> None:
+        """Stop compaction and close the database."""
+        if self._compactor is not None:
+            self._compactor.cancel()
+            await asyncio.gather(self._compactor, return_exceptions=True)
+            self._compactor = None
+        if self._conn is not None:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and size as of the last compaction, and counters."""
+        return {"path": self._path, "max_bytes": self._max_bytes, **self._stats}
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    In-process L1 in front of a shared L2 (Redis or disk).
+
+    L1 copies of shared entries live at most `l1_max_ttl` seconds so that
+    workers converge on L2's view; while L2 is unavailable, L1 takes the
+    entry's full TTL instead.
+    """
+
+    def __init__(self, l1: CacheBackend, l2: CacheBackend, l1_max_ttl: Optional[int] = None):
+        """
+        Initialize tiered backend.
+
+        Args:
+            l1: In-process cache
+            l2: Shared cache (must expose `available`)
+            l1_max_ttl: Max lifetime of an L1 copy in seconds
+        """
+        self.l1 = l1
+        self.l2 = l2
+        self._l1_max_ttl = settings.CACHE_L1_MAX_TTL if l1_max_ttl is None else l1_max_ttl
+
+    def _l1_ttl(self, ttl: float) -> float:
+        """TTL for the L1 copy of an entry."""
+        if getattr(self.l2, "available", True):
+            return min(ttl, self._l1_max_ttl)
+        return ttl
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Get entry from L1, then L2 (populating L1)."""
+        value = await self.l1.get(key)
+        if value is not None:
+            return value
+
+        value = await self.l2.get(key)
+        if value is not None:
+            remaining = value.stale_until - time.time()
+            if remaining > 0:
+                await self.l1.set(key, value, self._l1_ttl(remaining))
+        return value
+
+    async def set(self, key: str, value: CacheEntry, ttl: int = 300) -> None:
+        """Set entry in both tiers."""
+        await self.l1.set(key, value, self._l1_ttl(ttl))
+        await self.l2.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        """Delete value from both tiers."""
+        await self.l1.delete(key)
+        await self.l2.delete(key)
+
+    async def clear(self) -> None:
+        """Clear both tiers."""
+        await self.l1.clear()
+        await self.l2.clear()
+
+    async def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Leases live in the shared tier."""
+        return await self.l2.acquire_lease(name, owner, ttl)
+
+    async def close(self) -> None:
+        """Close both tiers."""
+        await self.l1.close()
+        await self.l2.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Size counters of both tiers."""
+        return {"l1": self.l1.stats(), "l2": self.l2.stats()}
@@ -0,0 +1,208 @@
+"""
+Pre-serialized cache entries.
+
+A cache entry holds the final encoded response body, an optional
+precompressed gzip variant and the response headers, so serving a hit is
+a byte copy with no JSON encoding or compression work. Entries also carry
+a strong ETag and their fetch time for conditional requests, and a soft
+(`expires`) and hard (`stale_until`) expiry for stale-while-revalidate.
+"""
+import gzip
+import hashlib
+import struct
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+from fastapi import Response
+
+from app.config import settings
+from app.responses import dumps, loads
+
+# Response headers that are recomputed per response, never stored
+# (CORS headers depend on the request's Origin; CORSMiddleware adds them)
+_VOLATILE_HEADERS = {
+    "content-length",
+    "etag",
+    "last-modified",
+    "content-encoding",
+    "cache-control",
+    "x-cache",
+    "vary",
+}
+
+_LENGTHS = struct.Struct(">III")
+
+# Prefix of cache keys; the version names the `to_bytes` format, so entries
+# written by an older format are never read back under the same key
+CACHE_KEY_PREFIX = "mobile:v2:"
+
+# Approximate fixed cost of an entry object (dataclass, dicts, strings)
+_ENTRY_OVERHEAD = 512
+
+
+@dataclass
+class CacheEntry:
+    """Cached response: encoded body, gzip variant and headers."""
+
+    body: bytes
+    gzip_body: Optional[bytes]
+    headers: Dict[str, str]
+    status_code: int = 200
+    fetched_at: float = 0.0
+    expires: float = 0.0
+    stale_until: float = 0.0
+    etag: str = ""
+
+    def __post_init__(self):
+        """Derive the strong ETag and hard expiry if not given."""
+        if not self.etag:
+            self.etag = f'"{hashlib.blake2b(self.body, digest_size=16).hexdigest()}"'
+        self.stale_until = max(self.stale_until, self.expires)
+
+    def is_fresh(self, now: float) -> bool:
+        """Before the soft expiry: serve as a normal hit."""
+        return now < self.expires
+
+    def is_stale(self, now: float) -> bool:
+        """Between soft and hard expiry: serve, but revalidate."""
+        return self.expires <= now < self.stale_until
+
+    @property
+    def size(self) -> int:
+        """Approximate memory held by the entry, in bytes."""
+        return (
+            len(self.body)
+            + len(self.gzip_body or b"")
+            + sum(len(k) + len(v) for k, v in self.headers.items())
+            + _ENTRY_OVERHEAD
+        )
+
+    @property
+    def last_modified(self) -> str:
+        """Fetch time as an HTTP date."""
+        return formatdate(self.fetched_at, usegmt=True)
+
+    @classmethod
+    def build(
+        cls,
+        body: bytes,
+        headers: Dict[str, str],
+        fetched_at: float,
+        ttl: float,
+        stale_ttl: float = 0,
+        status_code: int = 200
+    ) -> "CacheEntry":
+        """
+        Build an entry from a freshly rendered response.
+
+        Args:
+            body: Uncompressed response body
+            headers: Response headers (volatile ones are dropped)
+            fetched_at: Time the body was produced
+            ttl: Fresh lifetime in seconds (soft expiry)
+            stale_ttl: Extra seconds it may be served stale (hard expiry)
+            status_code: Response status
+
+        Returns:
+            CacheEntry with a gzip variant if the body is large enough
+        """
+        gzip_body = None
+        if len(body) >= settings.GZIP_MIN_SIZE:
+            gzip_body = gzip.compress(body, compresslevel=settings.CACHE_GZIP_LEVEL)
+        kept = {
+            k: v for k, v in headers.items()
+            if k.lower() not in _VOLATILE_HEADERS and not k.lower().startswith("access-control-")
+        }
+        return cls(
+            body=body,
+            gzip_body=gzip_body,
+            headers=kept,
+            status_code=status_code,
+            fetched_at=fetched_at,
+            expires=fetched_at + ttl,
+            stale_until=fetched_at + ttl + stale_ttl
+        )
+
+    def _validator_headers(self) -> Dict[str, str]:
+        """ETag / Last-Modified (and Vary) headers for this entry."""
+        headers = {"ETag": self.etag, "Last-Modified": self.last_modified}
+        if self.gzip_body is not None:
+            headers["Vary"] = "Accept-Encoding"
+        return headers
+
+    def is_not_modified(self, request_headers: Mapping[str, str]) -> bool:
+        """
+        Evaluate If-None-Match / If-Modified-Since against this entry.
+
+        If-None-Match takes precedence; If-Modified-Since compares with
+        the entry's fetch time (second precision).
+        """
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.fetched_at) <= since
+        return False
+
+    def not_modified_response(self) -> Response:
+        """Build a 304 response carrying the entry's validators."""
+        return Response(status_code=304, headers=self._validator_headers())
+
+    def response(self, accept_gzip: bool) -> Response:
+        """Build a response from the stored bytes."""
+        headers = dict(self.headers)
+        headers.update(self._validator_headers())
+        content = self.body
+        if self.gzip_body is not None:
+            if accept_gzip:
+                headers["Content-Encoding"] = "gzip"
+                content = self.gzip_body
+        return Response(content=content, status_code=self.status_code, headers=headers)
+
+    def to_bytes(self) -> bytes:
+        """Serialize for an external store (length-prefixed frames)."""
+        meta = dumps({
+            "headers": self.headers,
+            "status_code": self.status_code,
+            "fetched_at": self.fetched_at,
+            "expires": self.expires,
+            "stale_until": self.stale_until,
+            "etag": self.etag
+        })
+        gzip_body = self.gzip_body or b""
+        return b"".join((
+            _LENGTHS.pack(len(meta), len(self.body), len(gzip_body)),
+            meta,
+            self.body,
+            gzip_body
+        ))
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CacheEntry":
+        """
+        Deserialize an entry produced by `to_bytes`.
+
+        Raises:
+            ValueError: If `raw` is not a complete entry frame
+        """
+        try:
+            meta_len, body_len, gzip_len = _LENGTHS.unpack_from(raw)
+        except struct.error as e:
+            raise ValueError(f"Invalid cache entry: {e}") from e
+        if len(raw) != _LENGTHS.size + meta_len + body_len + gzip_len:
+            raise ValueError("Invalid cache entry: frame lengths do not match")
+        offset = _LENGTHS.size
+        meta = loads(raw[offset:offset + meta_len])
+        offset += meta_len
+        body = raw[offset:offset + body_len]
+        offset += body_len
+        gzip_body = raw[offset:offset + gzip_len] if gzip_len else None
+        return cls(body=body, gzip_body=gzip_body, **meta)
@@ -0,0 +1,129 @@
+"""
+Per-route cache TTL policy.
+
+Maps API routes to the CACHE_TTL_* settings so quotes, screeners,
+historical bars and profiles each get a lifetime that matches how often
+the underlying data actually changes, and to the largest response worth
+keeping in memory.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Mapping, Optional, Sequence
+
+from app.config import settings
+from app.services.bar_store import last_final_day
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """
+    TTL rule for a route pattern.
+
+    Attributes:
+        pattern: Regex matched against the path (API prefix stripped)
+        ttl_setting: Settings attribute holding the TTL in seconds
+            (None disables caching for the route)
+        closed_range_ttl_setting: TTL used instead when the request's
+            `end_date` query param is a final day (see `last_final_day`)
+        max_entry_size_setting: Settings attribute holding the largest
+            entry (bytes) stored for the route; CACHE_MAX_ENTRY_BYTES if None
+    """
+
+    pattern: str
+    ttl_setting: Optional[str]
+    closed_range_ttl_setting: Optional[str] = None
+    max_entry_size_setting: Optional[str] = None
+
+    def ttl(self, query_params: Mapping[str, str]) -> int:
+        """Resolve the TTL for a request's query params."""
+        if self.ttl_setting is None:
+            return 0
+        if self.closed_range_ttl_setting and _is_past(query_params.get("end_date")):
+            return getattr(settings, self.closed_range_ttl_setting)
+        return getattr(settings, self.ttl_setting)
+
+    def max_entry_size(self) -> int:
+        """Largest entry in bytes stored for the route (0 = no limit)."""
+        return getattr(settings, self.max_entry_size_setting or "CACHE_MAX_ENTRY_BYTES")
+
+
+def _is_past(value: Optional[str]) -> bool:
+    """Check whether a YYYY-MM-DD date string is a day whose bars are final."""
+    if not value:
+        return False
+    try:
+        return date.fromisoformat(value) <= last_final_day()
+    except ValueError:
+        return False
+
+
+class CachePolicy:
+    """Ordered route-pattern -> TTL table; first match wins."""
+
+    def __init__(self, rules: Sequence[CacheRule], default: CacheRule):
+        """
+        Initialize policy table.
+
+        Args:
+            rules: Rules checked in order
+            default: Rule used when nothing matches
+        """
+        self.rules = list(rules)
+        self.default = default
+        self._compiled = [(re.compile(rule.pattern), rule) for rule in self.rules]
+
+    def match(self, path: str) -> CacheRule:
+        """Find the rule for a request path."""
+        if path.startswith(settings.API_PREFIX):
+            path = path[len(settings.API_PREFIX):]
+        for regex, rule in self._compiled:
+            if regex.search(path):
+                return rule
+        return self.default
+
+    def ttl_for(self, path: str, query_params: Mapping[str, str]) -> int:
+        """Resolve the TTL in seconds for a request."""
+        return self.match(path).ttl(query_params)
+
+    def max_entry_size_for(self, path: str) -> int:
+        """Resolve the per-entry size limit in bytes for a request (0 = no limit)."""
+        return self.match(path).max_entry_size()
+
+    @staticmethod
+    def stale_for(ttl: int) -> int:
+        """Seconds past `ttl` an entry may be served stale while refreshing."""
+        return min(int(ttl * settings.CACHE_STALE_RATIO), settings.CACHE_STALE_MAX)
+
+
+# Default route policy
+ROUTE_CACHE_RULES = [
+    CacheRule(r"^/health$", None),
+    CacheRule(r"^/metrics$", None),
+    CacheRule(r"^/admin/", None),
+    CacheRule(r"/stream$", None),
+    CacheRule(r"^/yfinance/((crypto|currency)/)?quote$", "CACHE_TTL_QUOTE"),
+    CacheRule(r"^/yfinance/screener/", "CACHE_TTL_SCREENER"),
+    CacheRule(
+        r"^/yfinance/((etf|crypto|currency)/)?historical$",
+        "CACHE_TTL_HISTORICAL",
+        closed_range_ttl_setting="CACHE_TTL_HISTORICAL_CLOSED"
+    ),
+    CacheRule(r"^/yfinance/(profile|etf/info)$", "CACHE_TTL_PROFILE"),
+    CacheRule(r"^/(fed|ecb)/", "CACHE_TTL_ECONOMY"),
+    CacheRule(
+        r"^/cboe/options/chains$",
+        "CACHE_TTL_DEFAULT",
+        max_entry_size_setting="CACHE_MAX_ENTRY_OPTIONS"
+    ),
+]
+
+cache_policy = CachePolicy(
+    ROUTE_CACHE_RULES,
+    default=CacheRule(r"", "CACHE_TTL_DEFAULT")
+)
+
+
+def get_cache_policy() -> CachePolicy:
+    """Get the route cache policy."""
+    return cache_policy
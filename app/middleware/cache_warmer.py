@@ -0,0 +1,345 @@
+"""
+Background cache warmer.
+
+Re-renders a fixed set of routes (dashboard screeners and rates) into the
+response cache on their own intervals, so clients opening the app always
+hit warm entries instead of paying upstream latency after each expiry.
+The hot key prewarmer does the same for whatever keys are currently most
+requested, refreshing each shortly before its entry expires.
+
+Every worker runs the loops, but a refresh only happens in the worker
+holding its lease on the cache backend; with a shared backend (Redis or
+disk) that is one worker at a time, instead of each worker re-rendering
+the same routes into the same cache.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional
+
+from app.config import settings
+from app.middleware.cache import get_cache, refresh_cached_route
+from app.middleware.hot_keys import HotKey, HotKeyTracker, get_hot_key_tracker
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker as the holder of a warm lease
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+async def acquire_warm_lease(name: str, ttl: float) -> bool:
+    """
+    Take or renew a warm lease on the cache backend.
+
+    Args:
+        name: Lease name
+        ttl: Seconds the lease is held unless renewed
+
+    Returns:
+        Whether this worker should run the warm work
+    """
+    return await get_cache().acquire_lease(f"warm:{name}", WORKER_ID, ttl)
+
+
+@dataclass
+class WarmJob:
+    """A route refreshed on a fixed interval, with its last run's outcome."""
+
+    route: str
+    interval: float
+    last_refresh: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_status: Optional[int] = None
+    last_error: Optional[str] = None
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+
+    def status(self) -> Dict[str, Any]:
+        """Job status for reporting."""
+        return {
+            "route": self.route,
+            "interval": self.interval,
+            "last_refresh": (
+                datetime.fromtimestamp(self.last_refresh) if self.last_refresh else None
+            ),
+            "last_duration_ms": (
+                round(self.last_duration * 1000, 1) if self.last_duration is not None else None
+            ),
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+        }
+
+
+class CacheWarmer:
+    """Runs one refresh loop per warm job."""
+
+    def __init__(self, app, jobs: Mapping[str, float]):
+        """
+        Initialize warmer.
+
+        Args:
+            app: The application; routes are replayed through its full stack
+            jobs: Route under API_PREFIX (may include "?query") -> interval seconds
+        """
+        self._app = app
+        self.jobs = [WarmJob(route, interval) for route, interval in jobs.items()]
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the refresh loops."""
+        for job in self.jobs:
+            self._tasks.append(asyncio.create_task(self._loop(job)))
+
+    async def stop(self) -> None:
+        """Cancel the refresh loops."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _loop(self, job: WarmJob) -> None:
+        """Refresh a job now and then every `interval` seconds."""
+        while True:
+            await self.run_once(job)
+            await asyncio.sleep(job.interval)
+
+    async def run_once(self, job: WarmJob) -> bool:
+        """
+        Refresh a job unless another worker refreshed it this interval.
+
+        The job's lease is held for one interval, so across workers the
+        first to wake after it lapses does the refresh.
+
+        Returns:
+            Whether the job was refreshed
+        """
+        if not await acquire_warm_lease(job.route, job.interval):
+            job.skipped += 1
+            return False
+        await self.refresh(job)
+        return True
+
+    async def refresh(self, job: WarmJob) -> None:
+        """Render a job's route into the cache and record the outcome."""
+        path, _, query_string = job.route.partition("?")
+        started = time.perf_counter()
+        try:
+            job.last_status = await refresh_cached_route(
+                self._app, settings.API_PREFIX + path, query_string
+            )
+            job.last_error = None if job.last_status == 200 else f"HTTP {job.last_status}"
+        except Exception as e:
+            logger.exception("Cache warm failed for %s", job.route)
+            job.last_status = None
+            job.last_error = str(e)
+        job.last_duration = time.perf_counter() - started
+        job.last_refresh = time.time()
+        job.runs += 1
+        if job.last_error:
+            job.failures += 1
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Status of every job."""
+        return [job.status() for job in self.jobs]
+
+
+@dataclass
+class PrewarmState:
+    """Outcome of the last prewarm of a hot key."""
+
+    last_attempt: Optional[float] = None
+    last_status: Optional[int] = None
+    last_error: Optional[str] = None
+    refreshes: int = 0
+    failures: int = 0
+
+
+class HotKeyPrewarmer:
+    """Refreshes the most requested cache keys shortly before they expire."""
+
+    def __init__(
+        self,
+        app,
+        tracker: HotKeyTracker,
+        top_n: int = 20,
+        lead: float = 15,
+        interval: float = 5,
+        min_count: int = 3
+    ):
+        """
+        Initialize prewarmer.
+
+        Args:
+            app: The application; keys are replayed through its full stack
+            tracker: Hot key tracker fed by CacheMiddleware
+            top_n: Number of hottest keys kept warm
+            lead: Seconds before expiry at which a key is refreshed
+            interval: Seconds between expiry checks (should be below lead)
+            min_count: Estimated requests a key needs to be prewarmed
+        """
+        self._app = app
+        self.tracker = tracker
+        self.top_n = top_n
+        self.lead = lead
+        self.interval = interval
+        self.min_count = min_count
+        self._state: Dict[str, PrewarmState] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.leader = False
+
+    def start(self) -> None:
+        """Start the prewarm loop."""
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Cancel the prewarm loop."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        """Check the prewarm set every `interval` seconds."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Hot key prewarm pass failed")
+            await asyncio.sleep(self.interval)
+
+    def prewarm_set(self) -> List[HotKey]:
+        """The hot keys currently kept warm."""
+        return [hot for hot in self.tracker.top(self.top_n) if hot.count >= self.min_count]
+
+    async def run_once(self) -> int:
+        """
+        Refresh every key in the prewarm set that expires within `lead`.
+
+        Keys without a cache entry are left to the next client request;
+        a failed key is retried at most once per `lead` seconds. Only the
+        worker holding the prewarm lease refreshes, from its own tracker's
+        counts; it renews the lease on every pass, and another worker takes
+        over within a few intervals of it stopping.
+
+        Returns:
+            Number of keys refreshed
+        """
+        self.leader = await acquire_warm_lease("hot-keys", self.interval * 3)
+        if not self.leader:
+            return 0
+
+        now = time.time()
+        hot_keys = self.prewarm_set()
+        self._state = {hot.key: self._state.get(hot.key, PrewarmState()) for hot in hot_keys}
+
+        cache = get_cache()
+        due = []
+        for hot in hot_keys:
+            state = self._state[hot.key]
+            if state.last_error and now - state.last_attempt < self.lead:
+                continue
+            entry = await cache.get(hot.key)
+            if entry is not None and entry.expires - now <= self.lead:
+                due.append(hot)
+
+        await asyncio.gather(*(self.refresh(hot) for hot in due))
+        return len(due)
+
+    async def refresh(self, hot: HotKey) -> None:
+        """Render a hot key into the cache and record the outcome."""
+        state = self._state.setdefault(hot.key, PrewarmState())
+        try:
+            state.last_status = await refresh_cached_route(self._app, hot.path, hot.query_string)
+            state.last_error = None if state.last_status == 200 else f"HTTP {state.last_status}"
+        except Exception as e:
+            logger.exception("Hot key prewarm failed for %s", hot.path)
+            state.last_status = None
+            state.last_error = str(e)
+        state.last_attempt = time.time()
+        state.refreshes += 1
+        if state.last_error:
+            state.failures += 1
+
+    async def status(self) -> Dict[str, Any]:
+        """Prewarm settings and the current prewarm set with expiry times."""
+        now = time.time()
+        cache = get_cache()
+        keys = []
+        for hot in self.prewarm_set():
+            entry = await cache.get(hot.key)
+            state = self._state.get(hot.key, PrewarmState())
+            keys.append({
+                **hot.status(),
+                "expires_in": round(entry.expires - now, 1) if entry is not None else None,
+                "last_attempt": (
+                    datetime.fromtimestamp(state.last_attempt) if state.last_attempt else None
+                ),
+                "last_status": state.last_status,
+                "last_error": state.last_error,
+                "refreshes": state.refreshes,
+                "failures": state.failures,
+            })
+        return {
+            "leader": self.leader,
+            "top_n": self.top_n,
+            "lead": self.lead,
+            "interval": self.interval,
+            "min_count": self.min_count,
+            "keys": keys,
+        }
+
+
+# Global warmer instances (started by the app lifespan)
+_warmer: Optional[CacheWarmer] = None
+_prewarmer: Optional[HotKeyPrewarmer] = None
+
+
+def start_cache_warmer(app) -> Optional[CacheWarmer]:
+    """Start the warmer for the configured jobs and the hot key prewarmer, if enabled."""
+    global _warmer, _prewarmer
+    if not settings.CACHE_ENABLED:
+        return None
+    if settings.CACHE_WARMER_ENABLED and settings.CACHE_WARM_JOBS:
+        _warmer = CacheWarmer(app, settings.CACHE_WARM_JOBS)
+        _warmer.start()
+    if settings.CACHE_HOT_KEYS_ENABLED and settings.CACHE_PREWARM_TOP_N > 0:
+        _prewarmer = HotKeyPrewarmer(
+            app,
+            get_hot_key_tracker(),
+            top_n=settings.CACHE_PREWARM_TOP_N,
+            lead=settings.CACHE_PREWARM_LEAD,
+            interval=settings.CACHE_PREWARM_INTERVAL,
+            min_count=settings.CACHE_PREWARM_MIN_COUNT
+        )
+        _prewarmer.start()
+    return _warmer
+
+
+async def stop_cache_warmer() -> None:
+    """Stop the warmer and prewarmer if they are running."""
+    global _warmer, _prewarmer
+    if _warmer is not None:
+        await _warmer.stop()
+        _warmer = None
+    if _prewarmer is not None:
+        await _prewarmer.stop()
+        _prewarmer = None
+
+
+def get_cache_warmer() -> Optional[CacheWarmer]:
+    """Get the running warmer, if any."""
+    return _warmer
+
+
+def get_hot_key_prewarmer() -> Optional[HotKeyPrewarmer]:
+    """Get the running hot key prewarmer, if any."""
+    return _prewarmer
@@ -0,0 +1,164 @@
+"""
+Hot cache key tracking.
+
+A count-min sketch estimates how often each cache key is requested, in
+fixed memory regardless of how many distinct symbols clients ask for. The
+top-K keys by estimate are kept alongside the path and query needed to
+replay them, so the prewarmer can refresh them before they expire. Counts
+are halved periodically, so popularity follows what clients ask for now
+rather than since startup.
+"""
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+
+@dataclass
+class HotKey:
+    """A tracked cache key, its estimated request count and how to replay it."""
+
+    key: str
+    path: str
+    query_string: str
+    count: int = 0
+    last_seen: float = 0.0
+
+    def status(self) -> Dict[str, Any]:
+        """Key status for reporting."""
+        return {
+            "key": self.key,
+            "route": f"{self.path}?{self.query_string}" if self.query_string else self.path,
+            "count": self.count,
+            "last_seen": datetime.fromtimestamp(self.last_seen) if self.last_seen else None,
+        }
+
+
+class HotKeyTracker:
+    """Count-min sketch of cache key frequencies with a top-K heavy hitter set."""
+
+    def __init__(
+        self,
+        width: int = 2048,
+        depth: int = 4,
+        top_k: int = 64,
+        decay_interval: float = 600
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            width: Counters per sketch row
+            depth: Sketch rows (independent hashes)
+            top_k: Number of heavy hitters kept
+            decay_interval: Seconds between halving all counts (0 disables)
+        """
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.decay_interval = decay_interval
+        self._sketch = np.zeros((depth, width), dtype=np.uint32)
+        self._rows = np.arange(depth)
+        self._top: Dict[str, HotKey] = {}
+        self._floor = 0  # lowest count in a full top-K set
+        self._requests = 0
+        self._decays = 0
+        self._last_decay = time.time()
+
+    def _columns(self, key: str) -> np.ndarray:
+        """Sketch column of the key in every row."""
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype=np.uint32) % self.width
+
+    def estimate(self, key: str) -> int:
+        """Estimated request count of a key (never an undercount)."""
+        return int(self._sketch[self._rows, self._columns(key)].min())
+
+    def record(self, key: str, path: str, query_string: str = "") -> int:
+        """
+        Count one request for a cache key.
+
+        Args:
+            key: Cache key
+            path: Request path, for replaying the key
+            query_string: Raw query string, for replaying the key
+
+        Returns:
+            Estimated request count of the key
+        """
+        now = time.time()
+        self._maybe_decay(now)
+        self._requests += 1
+
+        # Conservative update: only raise counters sitting at the minimum
+        columns = self._columns(key)
+        counters = self._sketch[self._rows, columns]
+        count = int(counters.min()) + 1
+        self._sketch[self._rows, columns] = np.maximum(counters, count)
+
+        hot = self._top.get(key)
+        if hot is not None:
+            hot.count = count
+            hot.last_seen = now
+        elif len(self._top) < self.top_k:
+            self._top[key] = HotKey(key, path, query_string, count, now)
+            if len(self._top) == self.top_k:
+                self._floor = min(k.count for k in self._top.values())
+        elif count > self._floor:
+            coldest = min(self._top.values(), key=lambda k: k.count)
+            if count > coldest.count:
+                del self._top[coldest.key]
+                self._top[key] = HotKey(key, path, query_string, count, now)
+            self._floor = min(k.count for k in self._top.values())
+        return count
+
+    def _maybe_decay(self, now: float) -> None:
+        """Halve every count once per decay interval."""
+        if not self.decay_interval or now - self._last_decay < self.decay_interval:
+            return
+        self._sketch >>= 1
+        for hot in self._top.values():
+            hot.count >>= 1
+        self._top = {key: hot for key, hot in self._top.items() if hot.count > 0}
+        self._floor = min((k.count for k in self._top.values()), default=0)
+        self._last_decay = now
+        self._decays += 1
+
+    def top(self, n: Optional[int] = None) -> List[HotKey]:
+        """Tracked keys by descending count."""
+        keys = sorted(self._top.values(), key=lambda k: k.count, reverse=True)
+        return keys if n is None else keys[:n]
+
+    def stats(self) -> Dict[str, Any]:
+        """Sketch configuration and counters."""
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "top_k": self.top_k,
+            "tracked": len(self._top),
+            "requests": self._requests,
+            "decay_interval": self.decay_interval,
+            "decays": self._decays,
+        }
+
+
+# Global tracker instance (fed by CacheMiddleware)
+_tracker: Optional[HotKeyTracker] = None
+
+
+def get_hot_key_tracker() -> HotKeyTracker:
+    """Get or create the hot key tracker."""
+    global _tracker
+    if _tracker is None:
+        _tracker = HotKeyTracker(
+            width=settings.CACHE_HOT_KEY_SKETCH_WIDTH,
+            depth=settings.CACHE_HOT_KEY_SKETCH_DEPTH,
+            top_k=settings.CACHE_HOT_KEY_TOP_K,
+            decay_interval=settings.CACHE_HOT_KEY_DECAY
+        )
+    return _tracker
@@ -0,0 +1,75 @@
+"""
+Request metrics middleware.
+
+Times every HTTP request into the `http_request_duration_seconds`
+histogram. A plain ASGI middleware (no BaseHTTPMiddleware request/response
+wrapping), so the per-request cost is two clock reads and one observation.
+Requests replayed by the cache (warmer and stale refreshes) are not client
+traffic and are not timed.
+"""
+import time
+
+from app.metrics import REQUEST_DURATION
+from app.middleware.cache import REPLAY_SCOPE_KEY
+from app.responses import SSE_MEDIA_TYPE
+
+# Route label for requests that matched no route
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Record request latency by method, route template and status.
+
+    Routes are labelled with their path template, not the request path,
+    so the number of series stays bounded. Cache hits never reach the
+    router; they are labelled with their path, which is a route's path
+    since only matched routes are cached. Event streams stay open for the
+    life of the connection and are not timed.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize metrics middleware.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get(REPLAY_SCOPE_KEY):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"content-type":
+                        streaming = value.startswith(SSE_MEDIA_TYPE.encode())
+                        break
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not streaming:
+                REQUEST_DURATION.labels(
+                    scope["method"], self._route(scope, status_code), str(status_code)
+                ).observe(time.perf_counter() - started)
+
+    @staticmethod
+    def _route(scope, status_code: int) -> str:
+        """Route template of a request."""
+        route = scope.get("route")
+        if route is not None:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+        if status_code in (200, 304):
+            return scope["path"]
+        return UNMATCHED_ROUTE
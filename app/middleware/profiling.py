@@ -0,0 +1,96 @@
+"""
+Request profiling middleware.
+
+Profiles a request (see app/profiling.py) when the client sends
+`X-Profile: 1` with a valid `X-Admin-Token`, or at random for a
+PROFILE_SAMPLE_RATE fraction of API requests. Header-triggered requests
+bypass the response cache and get the profile's id back in `X-Profile-Id`;
+finished profiles are listed and downloaded under /admin/profiles.
+"""
+import asyncio
+import logging
+import random
+import secrets
+
+from starlette.datastructures import Headers
+
+from app.config import settings
+from app.profiling import RequestProfile, get_profile_store, run_profiled
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+def profile_requested(headers: Headers) -> bool:
+    """Check whether an admin asked for this request to be profiled."""
+    if not settings.ADMIN_TOKEN or headers.get(PROFILE_HEADER, "") in ("", "0"):
+        return False
+    token = headers.get("x-admin-token", "")
+    return secrets.compare_digest(token, settings.ADMIN_TOKEN)
+
+
+def _sampled(path: str) -> bool:
+    """Pick API requests at PROFILE_SAMPLE_RATE (admin routes and streams excluded)."""
+    if settings.PROFILE_SAMPLE_RATE <= 0 or random.random() >= settings.PROFILE_SAMPLE_RATE:
+        return False
+    route = path[len(settings.API_PREFIX):] if path.startswith(settings.API_PREFIX) else None
+    return route is not None and not route.startswith("/admin/") and not route.endswith("/stream")
+
+
+class ProfilingMiddleware:
+    """
+    Sample the stacks of selected requests into a profile.
+
+    Added innermost, so a profile covers routing, the endpoint, response
+    validation and serialization, and provider pool work, but not the
+    response cache (which header-triggered requests bypass).
+    """
+
+    def __init__(self, app):
+        """
+        Initialize profiling middleware.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if profile_requested(Headers(scope=scope)):
+            reason = "header"
+        elif _sampled(scope["path"]):
+            reason = "sampled"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile.create(
+            scope["method"],
+            scope["path"],
+            scope.get("query_string", b"").decode("latin-1"),
+            reason
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                if reason == "header":
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", ()), (PROFILE_ID_HEADER, profile.id.encode())]
+                    }
+            await send(message)
+
+        try:
+            await run_profiled(profile, self.app(scope, receive, send_wrapper))
+        finally:
+            try:
+                await asyncio.to_thread(get_profile_store().add, profile)
+            except Exception:
+                logger.exception("Failed to store profile %s", profile.id)
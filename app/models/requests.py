@@ -3,7 +3,7 @@ Request models for API endpoints.
 """
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 
 # =============================================================================
@@ -55,6 +55,10 @@ class BatchQuotesRequest(BaseModel):
 
     symbols: List[str] = Field(..., min_length=1, max_length=100, description="List of symbols")
     fields: Optional[str] = Field(None, description="Comma-separated fields to return")
+    versions: Optional[Dict[str, str]] = Field(
+        None,
+        description="Symbol -> quote version the client holds; returns deltas (use {} to opt in)"
+    )
 
 
 class SymbolsListRequest(BaseModel):
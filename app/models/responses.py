@@ -30,6 +30,8 @@ class PaginationMeta(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 class PaginatedResponse(BaseModel):
@@ -67,6 +69,7 @@ class EquityQuoteResponse(BaseModel):
     volume: Optional[int] = None
     market_cap: Optional[int] = None
     last_updated: datetime
+    version: Optional[str] = None
 
     class Config:
         json_encoders = {
@@ -140,6 +143,7 @@ class CryptoQuoteResponse(BaseModel):
     volume_24h: Optional[float] = None
     market_cap: Optional[float] = None
     last_updated: datetime
+    version: Optional[str] = None
 
 
 # =============================================================================
@@ -253,6 +257,7 @@ class BatchQuotesResponse(BaseModel):
     """Batch quotes response."""
 
     data: Dict[str, EquityQuoteResponse]
+    errors: Dict[str, str] = {}
     success_count: int
     error_count: int
     timestamp: datetime
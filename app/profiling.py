@@ -0,0 +1,399 @@
+"""
+Sampled request profiling.
+
+A profiled request is tagged on every thread that works for it: the event
+loop thread while one of the request's own coroutine steps runs (other
+requests interleave between steps), and a provider pool thread while it
+runs one of the request's SDK calls or extractions (`profiled`). A sampler
+thread reads the stacks of tagged threads with `sys._current_frames()`
+every PROFILE_INTERVAL seconds, so the request itself runs uninstrumented.
+A tick where no thread is working for the request (waiting on a pool queue,
+the client or I/O outside the pools) is counted as `<awaiting>`.
+
+Finished profiles are kept in a bounded ring and exported as folded stacks
+(`frame;frame;frame count` per line), the input format of flamegraph.pl,
+speedscope and similar tools. With PROFILE_DIR set, the ring is a directory
+shared by all workers.
+"""
+import contextvars
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from app.config import settings
+
+# Pseudo-frame for ticks where no thread was working for the request
+AWAITING_FRAME = "<awaiting>"
+
+# Profile of the request being handled (propagates to its child tasks)
+_current_profile: contextvars.ContextVar[Optional["RequestProfile"]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+
+@dataclass(eq=False)
+class RequestProfile:
+    """Stack samples of one request."""
+
+    id: str
+    method: str
+    path: str
+    query_string: str = ""
+    reason: str = "sampled"
+    interval: float = 0.005
+    started: float = field(default_factory=time.time)
+    duration: Optional[float] = None
+    status: Optional[int] = None
+    truncated: bool = False
+    samples: Counter = field(default_factory=Counter)
+
+    @classmethod
+    def create(
+        cls,
+        method: str,
+        path: str,
+        query_string: str = "",
+        reason: str = "sampled"
+    ) -> "RequestProfile":
+        """New profile with a time-ordered, worker-unique id."""
+        profile_id = f"{int(time.time() * 1000):013d}-{os.getpid()}-{secrets.token_hex(3)}"
+        return cls(profile_id, method, path, query_string, reason, settings.PROFILE_INTERVAL)
+
+    def folded(self) -> str:
+        """Samples in folded-stack format, heaviest stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def top_functions(self, n: int = 10) -> List[Dict[str, Any]]:
+        """Functions with the most samples at the top of the stack (self time)."""
+        leaves: Counter = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return [
+            {"function": frame, "samples": count, "percent": round(100 * count / total, 1)}
+            for frame, count in leaves.most_common(n)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Profile metadata and its hottest functions."""
+        route = f"{self.path}?{self.query_string}" if self.query_string else self.path
+        return {
+            "id": self.id,
+            "route": f"{self.method} {route}",
+            "reason": self.reason,
+            "started": datetime.fromtimestamp(self.started),
+            "duration_ms": round(self.duration * 1000, 1) if self.duration is not None else None,
+            "status": self.status,
+            "interval_ms": round(self.interval * 1000, 2),
+            "samples": sum(self.samples.values()),
+            "truncated": self.truncated,
+            "top_functions": self.top_functions(),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form, for PROFILE_DIR."""
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query_string": self.query_string,
+            "reason": self.reason,
+            "interval": self.interval,
+            "started": self.started,
+            "duration": self.duration,
+            "status": self.status,
+            "truncated": self.truncated,
+            "samples": dict(self.samples),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RequestProfile":
+        """Rebuild a profile saved with `to_dict`."""
+        data = dict(data)
+        data["samples"] = Counter(data.get("samples", {}))
+        return cls(**data)
+
+
+# =============================================================================
+# Sampler
+# =============================================================================
+
+@lru_cache(maxsize=8192)
+def _frame_label(code) -> str:
+    """Flamegraph label of a code object: `qualname (file.py:line)`."""
+    filename = code.co_filename
+    for marker in ("site-packages" + os.sep, os.getcwd() + os.sep):
+        position = filename.rfind(marker)
+        if position >= 0:
+            filename = filename[position + len(marker):]
+            break
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stacks of threads tagged for a profiled request."""
+
+    def __init__(self, interval: float = 0.005, max_duration: float = 30):
+        """
+        Initialize sampler.
+
+        Args:
+            interval: Seconds between samples
+            max_duration: Seconds after which a profile stops being sampled
+        """
+        self.interval = interval
+        self.max_duration = max_duration
+        self._lock = threading.Lock()
+        self._active: Set[RequestProfile] = set()
+        self._threads: Dict[int, RequestProfile] = {}
+        self._roots: Set[Any] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_root(self, code) -> None:
+        """Register a code object at which sampled stacks are cut (the tagging wrapper)."""
+        self._roots.add(code)
+
+    def begin(self, profile: RequestProfile) -> None:
+        """Start sampling a profile, starting the sampler thread if needed."""
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def end(self, profile: RequestProfile) -> None:
+        """Stop sampling a profile; no sample is added to it afterwards."""
+        with self._lock:
+            self._active.discard(profile)
+
+    def tag(self, profile: Optional[RequestProfile]) -> Optional[RequestProfile]:
+        """Attribute the current thread to a profile (None to untag); returns the previous tag."""
+        ident = threading.get_ident()
+        previous = self._threads.get(ident)
+        if profile is None:
+            self._threads.pop(ident, None)
+        else:
+            self._threads[ident] = profile
+        return previous
+
+    def _loop(self) -> None:
+        """Sample until no profile is active."""
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                self._sample()
+            time.sleep(self.interval)
+
+    def _sample(self) -> None:
+        """Record one sample for every active profile (lock held)."""
+        frames = sys._current_frames()
+        now = time.time()
+        sampled: Set[RequestProfile] = set()
+        for ident, profile in list(self._threads.items()):
+            frame = frames.get(ident)
+            if frame is None or profile.truncated or profile not in self._active:
+                continue
+            stack = self._stack(frame)
+            if stack:
+                profile.samples[stack] += 1
+                sampled.add(profile)
+        for profile in self._active:
+            if profile.truncated:
+                continue
+            if now - profile.started > self.max_duration:
+                profile.truncated = True
+            elif profile not in sampled:
+                profile.samples[AWAITING_FRAME] += 1
+
+    def _stack(self, frame) -> Optional[str]:
+        """Folded stack from the tagging wrapper down to `frame` (None if outside it)."""
+        labels = []
+        while frame is not None:
+            if frame.f_code in self._roots:
+                return ";".join(reversed(labels))
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        return None
+
+
+# Process-wide sampler (the tagging wrappers below refer to it directly)
+_sampler = StackSampler(
+    interval=settings.PROFILE_INTERVAL,
+    max_duration=settings.PROFILE_MAX_DURATION
+)
+
+
+def get_stack_sampler() -> StackSampler:
+    """Get the process-wide stack sampler."""
+    return _sampler
+
+
+class _Tagged:
+    """Awaitable that tags the event loop thread during each step of a coroutine."""
+
+    def __init__(self, coro: Awaitable, profile: RequestProfile):
+        self._coro = coro
+        self._profile = profile
+
+    def __await__(self):
+        inner = self._coro.__await__()
+        value, error = None, None
+        while True:
+            previous = _sampler.tag(self._profile)
+            try:
+                if error is not None:
+                    yielded = inner.throw(error)
+                else:
+                    yielded = inner.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                _sampler.tag(previous)
+                error = None
+            try:
+                value = yield yielded
+            except GeneratorExit:
+                inner.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+def _call_tagged(profile: RequestProfile, func: Callable, args, kwargs) -> Any:
+    """Run a blocking call with the current (pool) thread tagged."""
+    previous = _sampler.tag(profile)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _sampler.tag(previous)
+
+
+_sampler.add_root(_Tagged.__await__.__code__)
+_sampler.add_root(_call_tagged.__code__)
+
+
+async def run_profiled(profile: RequestProfile, coro: Awaitable) -> Any:
+    """
+    Await a coroutine while sampling it into a profile.
+
+    Args:
+        profile: Profile that collects the samples
+        coro: The request's coroutine (e.g. the downstream ASGI app call)
+
+    Returns:
+        The coroutine's result
+    """
+    token = _current_profile.set(profile)
+    _sampler.begin(profile)
+    started = time.perf_counter()
+    try:
+        return await _Tagged(coro, profile)
+    finally:
+        profile.duration = time.perf_counter() - started
+        _sampler.end(profile)
+        _current_profile.reset(token)
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Bind a blocking callable to the current request's profile, if any.
+
+    Use for callables handed to a thread pool from a request, so their
+    stacks are sampled into the request's profile.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return func
+    return lambda *args, **kwargs: _call_tagged(profile, func, args, kwargs)
+
+
+# =============================================================================
+# Profile Ring
+# =============================================================================
+
+class ProfileStore:
+    """Bounded ring of finished profiles, in memory or in a shared directory."""
+
+    def __init__(self, max_profiles: int = 50, directory: str = ""):
+        """
+        Initialize store.
+
+        Args:
+            max_profiles: Profiles kept; the oldest are dropped
+            directory: Directory shared by workers ("" keeps profiles in
+                this worker's memory)
+        """
+        self.max_profiles = max_profiles
+        self.directory = directory
+        self._profiles: Deque[RequestProfile] = deque(maxlen=max_profiles)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def _ids(self) -> List[str]:
+        """Stored profile ids, oldest first (ids start with a timestamp)."""
+        return sorted(
+            name[:-len(".json")] for name in os.listdir(self.directory) if name.endswith(".json")
+        )
+
+    def add(self, profile: RequestProfile) -> None:
+        """Store a finished profile, dropping the oldest beyond the limit (blocking)."""
+        if not self.directory:
+            self._profiles.append(profile)
+            return
+        path = self._path(profile.id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(profile.to_dict(), f)
+        os.replace(tmp_path, path)
+        for profile_id in self._ids()[:-self.max_profiles]:
+            try:
+                os.remove(self._path(profile_id))
+            except FileNotFoundError:
+                pass
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        """Get a profile by id (blocking)."""
+        if not self.directory:
+            return next((p for p in self._profiles if p.id == profile_id), None)
+        if os.path.basename(profile_id) != profile_id:
+            return None
+        try:
+            with open(self._path(profile_id)) as f:
+                return RequestProfile.from_dict(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def list(self) -> List[RequestProfile]:
+        """Stored profiles, newest first (blocking)."""
+        if not self.directory:
+            return list(reversed(self._profiles))
+        profiles = (self.get(profile_id) for profile_id in reversed(self._ids()))
+        return [profile for profile in profiles if profile is not None]
+
+
+# Global store instance
+_profile_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Get or create the profile store."""
+    global _profile_store
+    if _profile_store is None:
+        _profile_store = ProfileStore(
+            max_profiles=settings.PROFILE_MAX_PROFILES,
+            directory=settings.PROFILE_DIR
+        )
+    return _profile_store
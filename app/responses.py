@@ -0,0 +1,158 @@
+"""
+Shared response classes and JSON encoding.
+
+`ORJSONResponse` is the app-wide default response class: it encodes with
+orjson, which handles datetimes, NaN/inf (as null) and NumPy values
+natively. `NDJSONResponse` streams large result sets as newline-delimited
+JSON, one record per line, encoding chunk by chunk as the client reads.
+`EventStreamResponse` carries Server-Sent Events for live updates.
+"""
+import time
+import zlib
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List
+
+import orjson
+import pandas as pd
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.metrics import SERIALIZE_DURATION
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# SSE comment line: keeps idle connections open through proxies
+SSE_HEARTBEAT = b": keep-alive\n\n"
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Encode types orjson does not handle natively."""
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as JSON bytes (NaN/inf become null)."""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+loads = orjson.loads
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson.
+
+    Routes without a response_model return it directly so FastAPI skips
+    `jsonable_encoder`; the content is encoded as-is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Encode content with orjson."""
+        started = time.perf_counter()
+        body = dumps(content)
+        SERIALIZE_DURATION.labels("json").observe(time.perf_counter() - started)
+        return body
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Check whether the client asked for an NDJSON stream."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Check whether the client accepts gzip-encoded responses."""
+    return "gzip" in request.headers.get("accept-encoding", "")
+
+
+class NDJSONResponse(StreamingResponse):
+    """
+    Stream record chunks as NDJSON.
+
+    Chunks are consumed lazily (in the threadpool, since they are plain
+    iterators), so only one chunk of records is alive at a time. With
+    `compress`, the stream is gzipped here and sync-flushed per chunk;
+    GZipMiddleware would otherwise hold everything back until the end.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    def __init__(
+        self,
+        chunks: Iterable[List[Dict[str, Any]]],
+        compress: bool = False,
+        **kwargs
+    ):
+        """
+        Initialize NDJSON response.
+
+        Args:
+            chunks: Iterable of record lists
+            compress: Gzip the stream (client sent Accept-Encoding: gzip)
+            **kwargs: Passed to StreamingResponse (status_code, headers, ...)
+        """
+        content = self._encode(chunks)
+        if compress:
+            content = self._gzip(content)
+        super().__init__(content, media_type=self.media_type, **kwargs)
+        self.headers["Vary"] = "Accept-Encoding"
+        if compress:
+            self.headers["Content-Encoding"] = "gzip"
+
+    @staticmethod
+    def _encode(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+        """Encode each chunk into one block of JSON lines."""
+        for records in chunks:
+            if records:
+                started = time.perf_counter()
+                block = b"".join(dumps(record) + b"\n" for record in records)
+                SERIALIZE_DURATION.labels("ndjson").observe(time.perf_counter() - started)
+                yield block
+
+    @staticmethod
+    def _gzip(blocks: Iterator[bytes]) -> Iterator[bytes]:
+        """Gzip a byte stream, flushing after every block."""
+        compressor = zlib.compressobj(wbits=31)
+        for block in blocks:
+            yield compressor.compress(block) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+class EventStreamResponse(StreamingResponse):
+    """
+    Stream Server-Sent Events.
+
+    GZipMiddleware skips text/event-stream, and proxy buffering is turned
+    off, so every event reaches the client as soon as it is yielded.
+    """
+
+    media_type = SSE_MEDIA_TYPE
+
+    def __init__(self, events: AsyncIterator[bytes], **kwargs):
+        """
+        Initialize event stream response.
+
+        Args:
+            events: Async iterator of encoded events (see `sse_event`)
+            **kwargs: Passed to StreamingResponse (status_code, headers, ...)
+        """
+        super().__init__(events, media_type=self.media_type, **kwargs)
+        self.headers["Cache-Control"] = "no-cache"
+        self.headers["X-Accel-Buffering"] = "no"
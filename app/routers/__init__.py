@@ -7,8 +7,7 @@ from .crypto import router as crypto_router
 from .currency import router as currency_router
 from .etf import router as etf_router
 from .extra_providers import router as extra_providers_router
-
-from .extra_providers import router as extra_providers_router
+from .admin import router as admin_router
 
 __all__ = [
     "equity_router",
@@ -18,4 +17,5 @@ __all__ = [
     "currency_router",
     "etf_router",
     "extra_providers_router",
+    "admin_router",
 ]
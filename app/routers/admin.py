@@ -0,0 +1,116 @@
+"""
+Admin router - operational endpoints.
+
+Cache warmer and hot key status, request profiles, and other internals.
+Every route requires the `X-Admin-Token` header to match ADMIN_TOKEN;
+while ADMIN_TOKEN is empty the admin API is disabled.
+"""
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.middleware.cache_warmer import get_cache_warmer, get_hot_key_prewarmer
+from app.middleware.hot_keys import get_hot_key_tracker
+from app.profiling import get_profile_store
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Reject requests without a valid admin token."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+# =============================================================================
+# Cache Endpoints
+# =============================================================================
+
+@router.get("/admin/cache/warmer")
+async def get_cache_warmer_status():
+    """
+    Get cache warmer status.
+
+    Returns each job's route, interval, last refresh time and duration,
+    last status, failure count and the runs skipped because another
+    worker held the job's lease.
+    """
+    warmer = get_cache_warmer()
+    return {
+        "enabled": warmer is not None,
+        "jobs": warmer.status() if warmer else []
+    }
+
+
+@router.get("/admin/cache/hot-keys")
+async def get_hot_keys(
+    limit: int = Query(default=20, ge=1, le=1000, description="Max tracked keys returned")
+):
+    """
+    Get hot cache keys.
+
+    Returns the sketch settings and counters, the most requested keys by
+    estimated count, and the prewarm set with each key's time to expiry
+    and last refresh outcome. The prewarm set is only refreshed by the
+    worker holding the prewarm lease (`leader`).
+    """
+    tracker = get_hot_key_tracker()
+    prewarmer = get_hot_key_prewarmer()
+    return {
+        "enabled": settings.CACHE_HOT_KEYS_ENABLED,
+        "sketch": tracker.stats(),
+        "top_keys": [hot.status() for hot in tracker.top(limit)],
+        "prewarm": {
+            "enabled": prewarmer is not None,
+            **(await prewarmer.status() if prewarmer else {})
+        }
+    }
+
+
+# =============================================================================
+# Profiling Endpoints
+# =============================================================================
+
+@router.get("/admin/profiles")
+async def list_profiles(
+    limit: int = Query(default=20, ge=1, le=1000, description="Max profiles returned")
+):
+    """
+    List request profiles, newest first.
+
+    Each entry has the route, why it was profiled (header or sampled),
+    duration, sample count and the functions with the most self samples.
+    Send `X-Profile: 1` with the admin token on any request to profile it.
+    """
+    store = get_profile_store()
+    profiles = await asyncio.to_thread(store.list)
+    return {
+        "sample_rate": settings.PROFILE_SAMPLE_RATE,
+        "interval_ms": settings.PROFILE_INTERVAL * 1000,
+        "max_profiles": store.max_profiles,
+        "profiles": [profile.summary() for profile in profiles[:limit]]
+    }
+
+
+@router.get("/admin/profiles/{profile_id}", response_class=PlainTextResponse)
+async def download_profile(profile_id: str):
+    """
+    Download a profile as folded stacks.
+
+    One `frame;frame;frame count` line per distinct stack, ready for
+    flamegraph.pl, speedscope or inferno.
+    """
+    profile = await asyncio.to_thread(get_profile_store().get, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return PlainTextResponse(
+        profile.folded(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
+    )
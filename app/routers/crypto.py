@@ -4,10 +4,13 @@ Crypto router - YFinance crypto endpoints.
 Handles cryptocurrency-related endpoints using yfinance provider.
 """
 from fastapi import APIRouter, Query, HTTPException, Depends
+from typing import Optional
 
 from app.models.responses import CryptoQuoteResponse
+from app.responses import ORJSONResponse
 from app.services.openbb_service import get_openbb_service, OpenBBService
 from app.services.data_transformer import get_data_transformer, DataTransformer
+from app.services.quote_versions import get_quote_version_store
 
 router = APIRouter()
 
@@ -16,6 +19,10 @@ router = APIRouter()
 async def get_crypto_quote(
     symbol: str = Query("BTC-USD", description="Crypto symbol (e.g., BTC-USD, ETH-USD)"),
     fields: str = Query(None, description="Comma-separated fields to return"),
+    since: Optional[str] = Query(
+        None,
+        description="Quote version the client holds; returns only the fields changed since"
+    ),
     obb: OpenBBService = Depends(get_openbb_service),
     transformer: DataTransformer = Depends(get_data_transformer)
 ):
@@ -24,6 +31,7 @@ async def get_crypto_quote(
 
     Supports major cryptocurrencies from Yahoo Finance.
     Common symbols: BTC-USD, ETH-USD, BNB-USD, XRP-USD, ADA-USD, SOL-USD, DOGE-USD
+    With `since`, returns a delta against that version (see `/yfinance/quote`).
     """
     try:
         data = await obb.get_crypto_quote(symbol)
@@ -31,13 +39,24 @@ async def get_crypto_quote(
             raise HTTPException(status_code=404, detail=f"Crypto quote not found for {symbol}")
 
         # Map symbol to pair for consistency
-        data["pair"] = data.get("symbol", symbol)
-        data["name"] = data.get("name", symbol.split("-")[0])
+        data = {
+            **data,
+            "pair": data.get("symbol", symbol),
+            "name": data.get("name", symbol.split("-")[0])
+        }
+
+        data = transformer.sanitize_for_mobile(data)
+        versions = get_quote_version_store()
+        if since is not None:
+            return ORJSONResponse(
+                versions.delta(symbol, data, since, transformer.parse_fields(fields), scope="crypto")
+            )
+        version = versions.record(symbol, data, scope="crypto")
 
         if fields:
             data = transformer.filter_fields(data, fields)
 
-        return transformer.sanitize_for_mobile(data)
+        return {**data, "version": version}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -50,6 +69,16 @@ async def get_crypto_historical(
     end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=200, description="Items per page"),
+    response_format: str = Query(
+        "records",
+        alias="format",
+        pattern="^(records|columnar)$",
+        description="records (one object per bar) or columnar (one array per field)"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous page (overrides page and limit)"
+    ),
     obb: OpenBBService = Depends(get_openbb_service),
     transformer: DataTransformer = Depends(get_data_transformer)
 ):
@@ -59,13 +88,29 @@ async def get_crypto_historical(
     Returns OHLCV data with pagination.
     """
     try:
-        data = await obb.get_crypto_historical(symbol, start_date, end_date)
-        paginated_data, pagination = transformer.paginate_data(data, page, limit)
+        if response_format == "columnar":
+            data = await obb.get_historical_columns(symbol, start_date, end_date)
+        else:
+            data = await obb.get_crypto_historical(symbol, start_date, end_date)
+
+        # Pages (and cursors) are slices of the service's cached dataset
+        paginated_data, pagination = transformer.paginate(
+            data,
+            page,
+            limit,
+            cursor=cursor,
+            cursor_scope=f"{symbol}:{start_date}:{end_date}"
+        )
 
-        return {
+        response = {
             "data": paginated_data,
             "pagination": pagination
         }
+        if response_format == "columnar":
+            response["format"] = "columnar"
+        return ORJSONResponse(response)
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -3,7 +3,7 @@ Economy router - Federal Reserve and FRED endpoints.
 
 Handles economy-related endpoints using federal_reserve provider.
 """
-from fastapi import APIRouter, Query, HTTPException, Depends
+from fastapi import APIRouter, Query, HTTPException, Depends, Request
 from typing import List
 
 from app.models.responses import (
@@ -12,6 +12,7 @@ from app.models.responses import (
     SOFRRateResponse,
     YieldCurveResponse
 )
+from app.responses import NDJSONResponse, ORJSONResponse, accepts_gzip, wants_ndjson
 from app.services.openbb_service import get_openbb_service, OpenBBService
 from app.services.data_transformer import get_data_transformer, DataTransformer
 
@@ -24,8 +25,7 @@ router = APIRouter()
 
 @router.get("/fed/treasury/rates")
 async def get_treasury_rates(
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
     """
     Get Treasury yield curve rates.
@@ -34,7 +34,7 @@ async def get_treasury_rates(
     """
     try:
         data = await obb.get_treasury_rates()
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -84,17 +84,25 @@ async def get_sofr_rate(
 
 @router.get("/fed/yield/curve")
 async def get_yield_curve(
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    request: Request,
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
     """
     Get yield curve data.
 
     Returns historical yield curve data across multiple maturities.
+    Send `Accept: application/x-ndjson` to stream one date per line.
     """
     try:
+        if wants_ndjson(request):
+            chunks = await obb.stream_yield_curve()
+            return NDJSONResponse(
+                chunks,
+                compress=accepts_gzip(request)
+            )
+
         data = await obb.get_yield_curve()
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
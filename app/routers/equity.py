@@ -3,6 +3,7 @@ Equity router - YFinance provider endpoints.
 
 Handles all equity-related endpoints using yfinance provider.
 """
+from contextlib import aclosing
 from fastapi import APIRouter, Query, HTTPException, Depends
 from typing import Optional, List
 
@@ -14,8 +15,12 @@ from app.models.responses import (
     BatchQuotesResponse,
     PaginatedResponse
 )
+from app.config import settings
 from app.models.requests import BatchQuotesRequest
+from app.responses import EventStreamResponse, ORJSONResponse, SSE_HEARTBEAT, sse_event
 from app.services.openbb_service import get_openbb_service, OpenBBService
+from app.services.quote_stream import get_quote_hub
+from app.services.quote_versions import get_quote_version_store
 from app.services.data_transformer import get_data_transformer, DataTransformer
 
 router = APIRouter()
@@ -29,31 +34,83 @@ router = APIRouter()
 async def get_equity_quote(
     symbol: str = Query(..., description="Stock symbol (e.g., AAPL)"),
     fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    since: Optional[str] = Query(
+        None,
+        description="Quote version the client holds; returns only the fields changed since"
+    ),
     obb: OpenBBService = Depends(get_openbb_service),
     transformer: DataTransformer = Depends(get_data_transformer)
 ):
     """
     Get real-time stock quote.
 
-    Returns current stock price with essential mobile-optimized fields.
+    Returns current stock price with essential mobile-optimized fields and
+    the quote's `version`. With `since`, returns `{symbol, version,
+    unchanged: true}` if nothing changed, `{symbol, version, since,
+    changes}` with only the changed fields, or the full quote if `since`
+    is unknown.
     """
     try:
         data = await obb.get_equity_quote(symbol)
         if not data:
             raise HTTPException(status_code=404, detail=f"Quote not found for {symbol}")
 
+        # Sanitize for mobile
+        data = transformer.sanitize_for_mobile(data)
+        versions = get_quote_version_store()
+        if since is not None:
+            return ORJSONResponse(
+                versions.delta(symbol, data, since, transformer.parse_fields(fields))
+            )
+        version = versions.record(symbol, data)
+
         # Filter fields if requested
         if fields:
             data = transformer.filter_fields(data, fields)
-
-        # Sanitize for mobile
-        data = transformer.sanitize_for_mobile(data)
-        return data
+        return {**data, "version": version}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/yfinance/quote/stream")
+async def stream_equity_quotes(
+    symbols: str = Query(..., description="Comma-separated stock symbols (e.g., AAPL,MSFT)"),
+    transformer: DataTransformer = Depends(get_data_transformer)
+):
+    """
+    Stream real-time stock quotes as Server-Sent Events.
+
+    Sends a `quote` event per symbol on subscribe (once known) and whenever
+    its price changes, and an `error` event if a symbol cannot be fetched.
+    All clients share one upstream poll per QUOTE_STREAM_INTERVAL, so this
+    replaces polling `/yfinance/quote` on a timer.
+    """
+    symbol_list = list(dict.fromkeys(
+        s.strip().upper() for s in symbols.split(",") if s.strip()
+    ))
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(symbol_list) > settings.QUOTE_STREAM_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.QUOTE_STREAM_MAX_SYMBOLS} symbols per stream"
+        )
+
+    async def events():
+        async with aclosing(get_quote_hub().stream(symbol_list)) as batches:
+            async for batch in batches:
+                if not batch:
+                    yield SSE_HEARTBEAT
+                    continue
+                yield b"".join(
+                    sse_event(name, transformer.sanitize_for_mobile(data) if name == "quote" else data)
+                    for name, data in batch
+                )
+
+    return EventStreamResponse(events())
+
+
 @router.post("/yfinance/batch/quotes", response_model=BatchQuotesResponse)
 async def get_batch_quotes(
     request: BatchQuotesRequest,
@@ -64,35 +121,46 @@ async def get_batch_quotes(
     Get quotes for multiple symbols in one request.
 
     Reduces API calls for mobile apps fetching multiple stocks.
+    Symbols are fetched with a few multi-symbol upstream calls; symbols
+    that fail, time out or are missing upstream are reported in `errors`.
+    With `versions`, each symbol's entry is a delta against the version
+    the client holds (see `/yfinance/quote`).
     """
     from datetime import datetime
 
+    symbols = list(dict.fromkeys(request.symbols))
+    quotes, errors = await obb.get_equity_quotes(symbols)
+    versions = get_quote_version_store()
+    fields = transformer.parse_fields(request.fields)
+
     results = {}
-    success_count = 0
-    error_count = 0
-
-    for symbol in request.symbols:
-        try:
-            data = await obb.get_equity_quote(symbol)
-            if data:
-                if request.fields:
-                    data = transformer.filter_fields(data, request.fields)
-                data = transformer.sanitize_for_mobile(data)
-                results[symbol] = data
-                success_count += 1
-            else:
-                results[symbol] = {"error": "Not found"}
-                error_count += 1
-        except Exception as e:
-            results[symbol] = {"error": str(e)}
-            error_count += 1
-
-    return {
+
+    for symbol in symbols:
+        if symbol in errors:
+            continue
+        data = quotes.get(symbol)
+        if not data:
+            errors[symbol] = "Not found"
+            continue
+        data = transformer.sanitize_for_mobile(data)
+        if request.versions is not None:
+            results[symbol] = versions.delta(symbol, data, request.versions.get(symbol), fields)
+            continue
+        version = versions.record(symbol, data)
+        if request.fields:
+            data = transformer.filter_fields(data, request.fields)
+        results[symbol] = {**data, "version": version}
+
+    response = {
         "data": results,
-        "success_count": success_count,
-        "error_count": error_count,
+        "errors": errors,
+        "success_count": len(results),
+        "error_count": len(errors),
         "timestamp": datetime.now()
     }
+    if request.versions is not None:
+        return ORJSONResponse(response)
+    return response
 
 
 # =============================================================================
@@ -106,6 +174,16 @@ async def get_equity_historical(
     end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=200, description="Items per page"),
+    response_format: str = Query(
+        "records",
+        alias="format",
+        pattern="^(records|columnar)$",
+        description="records (one object per bar) or columnar (one array per field)"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous page (overrides page and limit)"
+    ),
     obb: OpenBBService = Depends(get_openbb_service),
     transformer: DataTransformer = Depends(get_data_transformer)
 ):
@@ -115,21 +193,30 @@ async def get_equity_historical(
     Returns OHLCV data with mobile-optimized pagination.
     """
     try:
-        data = await obb.get_equity_historical(symbol, start_date, end_date)
-
-        # Paginate
-        paginated_data, pagination = transformer.paginate_data(data, page, limit)
-
-        # Sanitize dates
-        for item in paginated_data:
-            if "date" in item and isinstance(item["date"], str):
-                item["date"] = item["date"]  # Already ISO format from service
-
-        return {
+        if response_format == "columnar":
+            data = await obb.get_historical_columns(symbol, start_date, end_date)
+        else:
+            data = await obb.get_equity_historical(symbol, start_date, end_date)
+
+        # Pages (and cursors) are slices of the service's cached dataset
+        paginated_data, pagination = transformer.paginate(
+            data,
+            page,
+            limit,
+            cursor=cursor,
+            cursor_scope=f"{symbol}:{start_date}:{end_date}"
+        )
+
+        response = {
             "data": paginated_data,
             "pagination": pagination
         }
+        if response_format == "columnar":
+            response["format"] = "columnar"
+        return ORJSONResponse(response)
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -167,13 +254,12 @@ async def get_equity_profile(
 @router.get("/yfinance/screener/gainers")
 async def get_screener_gainers(
     limit: int = Query(20, ge=1, le=100, description="Number of results"),
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
     """Get top gaining stocks."""
     try:
         data = await obb.get_screener_gainers(limit)
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -182,13 +268,12 @@ async def get_screener_gainers(
 @router.get("/yfinance/screener/losers")
 async def get_screener_losers(
     limit: int = Query(20, ge=1, le=100, description="Number of results"),
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
     """Get top losing stocks."""
     try:
         data = await obb.get_screener_losers(limit)
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -197,13 +282,12 @@ async def get_screener_losers(
 @router.get("/yfinance/screener/active")
 async def get_screener_active(
     limit: int = Query(20, ge=1, le=100, description="Number of results"),
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
     """Get most active stocks by volume."""
     try:
         data = await obb.get_screener_active(limit)
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,8 +4,10 @@ ETF router - YFinance ETF endpoints.
 Handles ETF-related endpoints using yfinance provider.
 """
 from fastapi import APIRouter, Query, HTTPException, Depends
+from typing import Optional
 
 from app.models.responses import ETFInfoResponse
+from app.responses import ORJSONResponse
 from app.services.openbb_service import get_openbb_service, OpenBBService
 from app.services.data_transformer import get_data_transformer, DataTransformer
 
@@ -57,6 +59,16 @@ async def get_etf_historical(
     end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(50, ge=1, le=200, description="Items per page"),
+    response_format: str = Query(
+        "records",
+        alias="format",
+        pattern="^(records|columnar)$",
+        description="records (one object per bar) or columnar (one array per field)"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous page (overrides page and limit)"
+    ),
     obb: OpenBBService = Depends(get_openbb_service),
     transformer: DataTransformer = Depends(get_data_transformer)
 ):
@@ -66,13 +78,29 @@ async def get_etf_historical(
     Returns OHLCV data with pagination.
     """
     try:
-        data = await obb.get_etf_historical(symbol, start_date, end_date)
-        paginated_data, pagination = transformer.paginate_data(data, page, limit)
+        if response_format == "columnar":
+            data = await obb.get_historical_columns(symbol, start_date, end_date)
+        else:
+            data = await obb.get_etf_historical(symbol, start_date, end_date)
 
-        return {
+        # Pages (and cursors) are slices of the service's cached dataset
+        paginated_data, pagination = transformer.paginate(
+            data,
+            page,
+            limit,
+            cursor=cursor,
+            cursor_scope=f"{symbol}:{start_date}:{end_date}"
+        )
+
+        response = {
             "data": paginated_data,
             "pagination": pagination
         }
+        if response_format == "columnar":
+            response["format"] = "columnar"
+        return ORJSONResponse(response)
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,53 +1,106 @@
 """
 Derivatives and European Economy Router - CBOE, ECB, and CFTC endpoints.
 """
-from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, Query, HTTPException, Depends, Request
+from typing import List, Optional
 
 from app.models.responses import (
     OptionsChainResponse,
     COTReportResponse
 )
+from app.responses import NDJSONResponse, ORJSONResponse, accepts_gzip, wants_ndjson
 from app.services.openbb_service import get_openbb_service, OpenBBService
-from app.services.data_transformer import get_data_transformer, DataTransformer
 
 router = APIRouter()
 
 @router.get("/cboe/options/chains")
 async def get_options_chains(
+    request: Request,
     symbol: str = Query(..., description="Stock symbol (e.g., AAPL)"),
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    expiration: Optional[str] = Query(None, description="Expiration date (YYYY-MM-DD)"),
+    option_type: Optional[str] = Query(None, pattern="^(call|put)$", description="call or put"),
+    strike_min: Optional[float] = Query(None, ge=0, description="Lowest strike (inclusive)"),
+    strike_max: Optional[float] = Query(None, ge=0, description="Highest strike (inclusive)"),
+    moneyness: Optional[float] = Query(
+        None,
+        gt=0,
+        le=1,
+        description="Strikes within this fraction of the underlying price (e.g., 0.05)"
+    ),
+    limit: Optional[int] = Query(None, ge=1, description="Max contracts returned"),
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
-    """Get options chain data from CBOE."""
+    """
+    Get options chain data from CBOE.
+
+    Filters are answered from a cached index of the chain (by expiration,
+    option type and sorted strike); results are ordered by expiration,
+    option type and strike. Send `Accept: application/x-ndjson` to stream
+    one contract per line.
+    """
+    if moneyness is not None and (strike_min is not None or strike_max is not None):
+        raise HTTPException(status_code=400, detail="Use either moneyness or strike_min/strike_max")
+
+    filters = {
+        "expiration": expiration,
+        "option_type": option_type,
+        "strike_min": strike_min,
+        "strike_max": strike_max,
+        "moneyness": moneyness,
+        "limit": limit
+    }
+    filtered = any(value is not None for value in filters.values())
+
     try:
-        data = await obb.get_options_chains(symbol)
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        if wants_ndjson(request) and not filtered:
+            chunks = await obb.stream_options_chains(symbol)
+            return NDJSONResponse(
+                chunks,
+                compress=accepts_gzip(request)
+            )
+
+        index = await obb.get_options_chain_index(symbol)
+        data = index.query(**filters)
+        if wants_ndjson(request):
+            return NDJSONResponse([data], compress=accepts_gzip(request))
+        return ORJSONResponse(data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/ecb/forex")
 async def get_ecb_forex(
     symbol: str = Query("EURUSD", description="Currency pair"),
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
     """Get exchange rates from ECB."""
     try:
         data = await obb.get_ecb_forex(symbol)
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/cftc/cot")
 async def get_cot_report(
+    request: Request,
     symbol: str = Query(..., description="Market ID or Commodity name"),
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
-    """Get Commitment of Traders (COT) report from CFTC."""
+    """
+    Get Commitment of Traders (COT) report from CFTC.
+
+    Send `Accept: application/x-ndjson` to stream one report row per line.
+    """
     try:
+        if wants_ndjson(request):
+            chunks = await obb.stream_cot_report(symbol)
+            return NDJSONResponse(
+                chunks,
+                compress=accepts_gzip(request)
+            )
+
         data = await obb.get_cot_report(symbol)
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -10,8 +10,8 @@ from app.models.responses import (
     SECFilingResponse,
     InsiderTradeResponse
 )
+from app.responses import ORJSONResponse
 from app.services.openbb_service import get_openbb_service, OpenBBService
-from app.services.data_transformer import get_data_transformer, DataTransformer
 
 router = APIRouter()
 
@@ -25,8 +25,7 @@ async def get_sec_filings(
     symbol: str = Query(..., description="Stock symbol"),
     filing_type: Optional[str] = Query(None, description="Filter by filing type (e.g., 10-K, 10-Q)"),
     limit: int = Query(20, ge=1, le=100, description="Number of results"),
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
     """
     Get SEC filings for a company.
@@ -35,7 +34,7 @@ async def get_sec_filings(
     """
     try:
         data = await obb.get_sec_filings(symbol, filing_type, limit)
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -45,8 +44,7 @@ async def get_sec_filings(
 async def get_insider_trading(
     symbol: str = Query(..., description="Stock symbol"),
     limit: int = Query(20, ge=1, le=100, description="Number of results"),
-    obb: OpenBBService = Depends(get_openbb_service),
-    transformer: DataTransformer = Depends(get_data_transformer)
+    obb: OpenBBService = Depends(get_openbb_service)
 ):
     """
     Get insider trading data for a company.
@@ -55,7 +53,7 @@ async def get_insider_trading(
     """
     try:
         data = await obb.get_insider_trading(symbol, limit)
-        return [transformer.sanitize_for_mobile(item) for item in data]
+        return ORJSONResponse(data)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
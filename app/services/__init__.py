@@ -1,11 +1,25 @@
 """Services package."""
 
-from .openbb_service import OpenBBService, get_openbb_service
+from .openbb_service import (
+    OpenBBService,
+    get_openbb_service,
+    peek_openbb_service,
+    shutdown_openbb_service
+)
 from .data_transformer import DataTransformer, get_data_transformer
+from .quote_stream import QuoteHub, get_quote_hub, shutdown_quote_hub
+from .quote_versions import QuoteVersionStore, get_quote_version_store
 
 __all__ = [
     "OpenBBService",
     "get_openbb_service",
+    "peek_openbb_service",
+    "shutdown_openbb_service",
     "DataTransformer",
     "get_data_transformer",
+    "QuoteHub",
+    "get_quote_hub",
+    "shutdown_quote_hub",
+    "QuoteVersionStore",
+    "get_quote_version_store",
 ]
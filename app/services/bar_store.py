@@ -0,0 +1,500 @@
+"""
+Incremental OHLCV range cache.
+
+Holds fetched bars per (symbol, provider) together with the date
+intervals already covered, so a new range request only fetches the
+uncovered gaps from upstream. Only final days (see `last_final_day`) are
+recorded as covered; later bars are always refetched.
+
+Bars are stored columnar (one sorted date array, one float array per
+field) and persisted as .npy files under BAR_STORE_DIR, which every worker
+memory-maps: a range lookup is a binary search on dates plus array views,
+and series survive restarts.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker development, saves are not locked
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Interval = Tuple[date, date]
+GapFetcher = Callable[[str, str], Awaitable[Optional[pd.DataFrame]]]
+SeriesKey = Tuple[str, str]
+
+# Stored fields, one row each in BarSeries.values
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Upstream errors meaning "no bars in this window" (OpenBB keeps the class
+# name when it re-raises a provider's EmptyDataError)
+EMPTY_DATA_ERRORS = ("EmptyDataError",)
+
+
+def _utc_today() -> date:
+    """Current UTC date; the host's local date can run ahead of the session."""
+    return datetime.now(timezone.utc).date()
+
+
+def last_final_day() -> date:
+    """
+    Last day whose bars no longer change.
+
+    BAR_STORE_FINAL_LAG_DAYS before the UTC date: by 00:00 UTC the US
+    session of the previous day has closed, and UTC-dated crypto bars
+    have completed.
+    """
+    return _utc_today() - timedelta(days=settings.BAR_STORE_FINAL_LAG_DAYS)
+
+
+def is_empty_data_error(error: BaseException) -> bool:
+    """Check whether an upstream error (or one it wraps) reports an empty result."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if any(cls.__name__ in EMPTY_DATA_ERRORS for cls in type(error).__mro__):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _normalize(frame: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Date-indexed, sorted, tz-naive copy of an OHLCV frame."""
+    if frame is None or frame.empty:
+        return pd.DataFrame()
+    frame = frame.copy()
+    index = pd.to_datetime(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.rename("date")
+    return frame.sort_index()
+
+
+def _to_arrays(frame: Optional[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+    """Dates (datetime64[ns]) and a (len(BAR_COLUMNS), n) float array of an OHLCV frame."""
+    frame = _normalize(frame)
+    dates = frame.index.to_numpy(dtype="datetime64[ns]") if not frame.empty else np.empty(0, "datetime64[ns]")
+    values = np.full((len(BAR_COLUMNS), len(dates)), np.nan)
+    for row, column in enumerate(BAR_COLUMNS):
+        if column in frame.columns:
+            values[row] = pd.to_numeric(frame[column], errors="coerce").to_numpy(
+                dtype="float64", na_value=np.nan
+            )
+    return dates, values
+
+
+class BarSeries:
+    """Bars for one (symbol, provider) and the inclusive date intervals they cover."""
+
+    def __init__(
+        self,
+        dates: Optional[np.ndarray] = None,
+        values: Optional[np.ndarray] = None,
+        intervals: Optional[List[Interval]] = None,
+        generation: Optional[str] = None
+    ):
+        """
+        Initialize a series (empty by default).
+
+        Args:
+            dates: Sorted, unique bar dates (datetime64[ns])
+            values: (len(BAR_COLUMNS), len(dates)) float array
+            intervals: Covered date intervals, sorted and disjoint
+            generation: Identity of the on-disk copy this was loaded from
+        """
+        self.dates = np.empty(0, "datetime64[ns]") if dates is None else dates
+        self.values = np.empty((len(BAR_COLUMNS), 0)) if values is None else values
+        self.intervals: List[Interval] = intervals or []
+        self.generation = generation
+
+    def missing(self, start: date, end: date) -> List[Interval]:
+        """Sub-intervals of [start, end] not covered yet."""
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in self.intervals:
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start - timedelta(days=1)))
+            cursor = max(cursor, covered_end + timedelta(days=1))
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def add(self, frame: Optional[pd.DataFrame], start: date, end: date) -> None:
+        """
+        Merge fetched bars for [start, end] into the series.
+
+        Newly fetched bars replace held ones on the same date. Only days
+        up to `last_final_day()` are marked as covered.
+        """
+        dates, values = _to_arrays(frame)
+        if len(dates):
+            # New bars first, so np.unique's first occurrence keeps them
+            merged_dates, first = np.unique(np.concatenate([dates, self.dates]), return_index=True)
+            self.values = np.concatenate([values, self.values], axis=1)[:, first]
+            self.dates = merged_dates
+
+        end = min(end, last_final_day())
+        if start <= end:
+            self._cover(start, end)
+
+    def merge(self, other: "BarSeries") -> None:
+        """Add another series' bars and covered intervals; bars held here win on the same date."""
+        if len(other.dates):
+            merged_dates, first = np.unique(np.concatenate([self.dates, other.dates]), return_index=True)
+            self.values = np.concatenate([self.values, other.values], axis=1)[:, first]
+            self.dates = merged_dates
+        for start, end in other.intervals:
+            self._cover(start, end)
+
+    def _cover(self, start: date, end: date) -> None:
+        """Insert an interval, merging overlapping and adjacent ones."""
+        merged = []
+        for covered_start, covered_end in sorted(self.intervals + [(start, end)]):
+            if merged and covered_start <= merged[-1][1] + timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], covered_end))
+            else:
+                merged.append((covered_start, covered_end))
+        self.intervals = merged
+
+    def slice(self, start: date, end: date) -> pd.DataFrame:
+        """Bars dated within [start, end] (a view over the stored arrays)."""
+        low = int(np.searchsorted(self.dates, np.datetime64(start, "ns"), "left"))
+        high = int(np.searchsorted(self.dates, np.datetime64(end + timedelta(days=1), "ns"), "left"))
+        if low >= high:
+            return pd.DataFrame()
+        return pd.DataFrame(
+            self.values[:, low:high].T,
+            columns=list(BAR_COLUMNS),
+            index=pd.DatetimeIndex(self.dates[low:high], name="date")
+        )
+
+
+class BarFiles:
+    """
+    On-disk bar series: one directory per (symbol, provider).
+
+    Each save writes `<generation>.dates.npy` and `<generation>.values.npy`
+    and then atomically replaces `meta.json` (generation, covered
+    intervals), so readers in other workers always see a complete
+    generation; superseded generations' files are removed afterwards.
+
+    Saves of one series are serialized across workers by a lock file, and
+    merge in whatever another worker stored since the series was loaded,
+    so concurrent fetches of different gaps are all kept.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize bar files.
+
+        Args:
+            root: Base directory
+        """
+        self.root = root
+
+    @staticmethod
+    def _escape(name: str) -> str:
+        """Filesystem-safe path component (no separators, no leading dot)."""
+        if not name:
+            raise ValueError("Empty symbol or provider")
+        escaped = quote(name, safe="")
+        # "." and ".." would resolve outside the series directory
+        return "%2E" + escaped[1:] if escaped.startswith(".") else escaped
+
+    def _dir(self, key: SeriesKey) -> str:
+        """Directory of a series (symbol and provider escaped for the filesystem)."""
+        symbol, provider = key
+        return os.path.join(self.root, self._escape(provider), self._escape(symbol))
+
+    @staticmethod
+    @contextmanager
+    def _locked(directory: str) -> Iterator[None]:
+        """Hold a series' lock file, exclusive across processes."""
+        with open(os.path.join(directory, ".lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _meta(self, key: SeriesKey) -> Optional[Dict[str, Any]]:
+        """Read a series' meta.json, if present."""
+        try:
+            with open(os.path.join(self._dir(key), "meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def generation(self, key: SeriesKey) -> Optional[str]:
+        """Generation currently on disk."""
+        meta = self._meta(key)
+        return None if meta is None else meta["generation"]
+
+    def load(self, key: SeriesKey) -> Optional[BarSeries]:
+        """Load a series with its arrays memory-mapped, or None if not stored."""
+        for attempt in range(2):
+            meta = self._meta(key)
+            if meta is None:
+                return None
+            generation = meta["generation"]
+            intervals = [(date.fromisoformat(a), date.fromisoformat(b)) for a, b in meta["intervals"]]
+            if not meta["rows"]:
+                return BarSeries(intervals=intervals, generation=generation)
+            directory = self._dir(key)
+            try:
+                return BarSeries(
+                    np.load(os.path.join(directory, f"{generation}.dates.npy"), mmap_mode="r"),
+                    np.load(os.path.join(directory, f"{generation}.values.npy"), mmap_mode="r"),
+                    intervals,
+                    generation
+                )
+            except FileNotFoundError:
+                # Superseded by another worker between reading meta and the arrays
+                if attempt:
+                    raise
+        return None
+
+    def save(self, key: SeriesKey, series: BarSeries) -> None:
+        """
+        Write a series as a new generation.
+
+        If another worker stored a generation since `series` was loaded,
+        its bars and intervals are merged into `series` first.
+        """
+        directory = self._dir(key)
+        os.makedirs(directory, exist_ok=True)
+        with self._locked(directory):
+            current = self.generation(key)
+            if current is not None and current != series.generation:
+                stored = self.load(key)
+                if stored is not None:
+                    series.merge(stored)
+
+            generation = f"{time.time_ns():x}-{os.getpid()}"
+            if len(series.dates):
+                np.save(os.path.join(directory, f"{generation}.dates.npy"), np.asarray(series.dates))
+                np.save(os.path.join(directory, f"{generation}.values.npy"), np.asarray(series.values))
+
+            meta_tmp = os.path.join(directory, f"meta.json.{generation}")
+            with open(meta_tmp, "w") as f:
+                json.dump({
+                    "generation": generation,
+                    "rows": len(series.dates),
+                    "columns": list(BAR_COLUMNS),
+                    "intervals": [(a.isoformat(), b.isoformat()) for a, b in series.intervals],
+                }, f)
+            os.replace(meta_tmp, os.path.join(directory, "meta.json"))
+            series.generation = generation
+            self._remove_stale(directory, generation)
+
+    @staticmethod
+    def _remove_stale(directory: str, generation: str) -> None:
+        """
+        Delete every file but the current generation's (lock held).
+
+        Covers generations superseded by any worker and files left by a
+        crashed save. Readers that mapped an old generation keep their
+        mappings after unlink.
+        """
+        for name in os.listdir(directory):
+            if name in ("meta.json", ".lock") or name.startswith(f"{generation}."):
+                continue
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+class BarStore:
+    """
+    LRU of BarSeries keyed by (symbol, provider), filled gap by gap.
+
+    With a directory, series are persisted after every fetch and loaded
+    (memory-mapped) on an LRU miss, or when a gap may already have been
+    filled by another worker.
+    """
+
+    def __init__(self, max_series: Optional[int] = None, directory: Optional[str] = None):
+        """
+        Initialize bar store.
+
+        Args:
+            max_series: Max (symbol, provider) series held in memory
+            directory: Where series are persisted (default: BAR_STORE_DIR;
+                empty keeps series in memory only)
+        """
+        self._series: LRUCache = LRUCache(
+            maxsize=max_series or settings.BAR_STORE_MAX_SERIES
+        )
+        self._locks: "weakref.WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        directory = settings.BAR_STORE_DIR if directory is None else directory
+        self._files = BarFiles(directory) if directory else None
+        self.requests = 0
+        self.gap_fetches = 0
+        self.disk_loads = 0
+        self.disk_saves = 0
+
+    def _lock(self, key: Tuple[str, str]) -> asyncio.Lock:
+        """Per-series lock so overlapping requests don't refetch the same gap."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    async def get_range(
+        self,
+        symbol: str,
+        provider: str,
+        start_date: str,
+        end_date: str,
+        fetch: GapFetcher
+    ) -> pd.DataFrame:
+        """
+        Get bars for [start_date, end_date], fetching only uncovered gaps.
+
+        A gap upstream reports as empty (e.g. weekends and holidays only)
+        is recorded as covered with no bars. Any other fetch error fails
+        the whole request, so an incomplete range is never returned; the
+        gaps that did succeed are still stored, and the next request only
+        retries the failed ones.
+
+        Args:
+            symbol: Ticker symbol
+            provider: Data provider
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), inclusive
+            fetch: Coroutine fetching a (start, end) gap as a DataFrame
+
+        Returns:
+            Date-indexed DataFrame of the requested bars
+
+        Raises:
+            Exception: The first gap fetch error, if any gap failed
+        """
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+        key = (symbol.upper(), provider)
+        self.requests += 1
+
+        async with self._lock(key):
+            series = self._series.get(key)
+            if series is None:
+                series = await self._load(key) or BarSeries()
+            elif series.missing(start, end):
+                # Another worker may have fetched the gap already
+                series = await self._load(key, series.generation) or series
+            windows = [self._fetch_window(gap) for gap in series.missing(start, end)]
+            results = await asyncio.gather(
+                *(fetch(s.isoformat(), e.isoformat()) for s, e in windows),
+                return_exceptions=True
+            )
+            self.gap_fetches += len(windows)
+
+            errors = []
+            for (window_start, window_end), result in zip(windows, results):
+                if isinstance(result, Exception):
+                    if not is_empty_data_error(result):
+                        errors.append(result)
+                        continue
+                    result = None
+                series.add(result, window_start, window_end)
+            if len(errors) < len(windows):
+                series = await self._save(key, series)
+            self._series[key] = series
+
+            if errors:
+                logger.warning(
+                    "%d of %d gap fetches failed for %s: %s", len(errors), len(windows), symbol, errors[0]
+                )
+                raise errors[0]
+            return series.slice(start, end)
+
+    def covers(self, symbol: str, provider: str, start_date: str, end_date: str) -> bool:
+        """
+        Check whether every final day of [start_date, end_date] is covered.
+
+        Days after `last_final_day()` are never covered, so a range reaching
+        them counts as covered once everything before them is.
+        """
+        series = self._series.get((symbol.upper(), provider))
+        if series is None:
+            return False
+        end = min(date.fromisoformat(end_date), last_final_day())
+        return not series.missing(date.fromisoformat(start_date), end)
+
+    async def _load(self, key: SeriesKey, known_generation: Optional[str] = None) -> Optional[BarSeries]:
+        """Load a persisted series, unless it is the generation already held."""
+        if self._files is None:
+            return None
+
+        def load() -> Optional[BarSeries]:
+            if known_generation is not None and self._files.generation(key) == known_generation:
+                return None
+            return self._files.load(key)
+
+        try:
+            series = await asyncio.to_thread(load)
+        except Exception as e:
+            logger.warning("Failed to load bars for %s: %s", key, e)
+            return None
+        if series is not None:
+            self.disk_loads += 1
+        return series
+
+    async def _save(self, key: SeriesKey, series: BarSeries) -> BarSeries:
+        """Persist a series; returns it reloaded memory-mapped."""
+        if self._files is None:
+            return series
+
+        def save() -> BarSeries:
+            self._files.save(key, series)
+            return self._files.load(key) or series
+
+        try:
+            series = await asyncio.to_thread(save)
+        except Exception as e:
+            logger.warning("Failed to persist bars for %s: %s", key, e)
+            return series
+        self.disk_saves += 1
+        return series
+
+    @staticmethod
+    def _fetch_window(gap: Interval) -> Interval:
+        """Widen very short gaps; single-day upstream ranges are unreliable."""
+        start, end = gap
+        min_start = end - timedelta(days=settings.BAR_STORE_MIN_FETCH_DAYS - 1)
+        return (min(start, min_start), end)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get bar store counters."""
+        return {
+            "series": len(self._series),
+            "requests": self.requests,
+            "gap_fetches": self.gap_fetches,
+            "persisted": self._files is not None,
+            "disk_loads": self.disk_loads,
+            "disk_saves": self.disk_saves
+        }
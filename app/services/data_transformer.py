@@ -3,13 +3,39 @@ Data transformer service.
 
 Transforms OpenBB data into mobile-optimized formats.
 """
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime
+import base64
+import binascii
+import hashlib
+import json
+
+from app.config import settings
+
+
+def _cursor_tag(scope: str) -> str:
+    """Short digest tying a cursor to the dataset it was issued for."""
+    return hashlib.blake2b(scope.encode(), digest_size=6).hexdigest()
 
 
 class DataTransformer:
     """Transform data for mobile consumption."""
 
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+        """
+        Split a comma-separated field list.
+
+        Args:
+            fields: Comma-separated field names
+
+        Returns:
+            Stripped, non-empty field names, or None if no list was given
+        """
+        if not fields:
+            return None
+        return [f.strip() for f in fields.split(",") if f.strip()]
+
     @staticmethod
     def filter_fields(data: dict, fields: Optional[str]) -> dict:
         """
@@ -25,7 +51,7 @@ class DataTransformer:
         if not fields:
             return data
 
-        field_list = [f.strip() for f in fields.split(",")]
+        field_list = DataTransformer.parse_fields(fields)
         return {k: v for k, v in data.items() if k in field_list}
 
     @staticmethod
@@ -41,14 +67,95 @@ class DataTransformer:
         Returns:
             Tuple of (paginated_data, pagination_meta)
         """
-        total = len(data)
-        total_pages = (total + limit - 1) // limit
-        start = (page - 1) * limit
-        end = start + limit
+        return DataTransformer.paginate(data, page, limit)
 
-        paginated = data[start:end]
+    @staticmethod
+    def paginate(
+        data: Union[List[Any], Dict[str, List[Any]]],
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        cursor_scope: Optional[str] = None
+    ) -> tuple:
+        """
+        Paginate records or columnar data by page number or cursor.
 
-        meta = {
+        Args:
+            data: List of items, or dict of field name -> equal-length lists
+            page: Page number (1-indexed), ignored when a cursor is given
+            limit: Items per page, ignored when a cursor is given
+            cursor: Opaque cursor from a previous page's pagination
+            cursor_scope: Identity of the dataset (e.g. symbol and range);
+                when set, next/prev cursors are issued and checked against it
+
+        Returns:
+            Tuple of (paginated_data, pagination_meta)
+
+        Raises:
+            ValueError: If the cursor is malformed or was issued for another dataset
+        """
+        if cursor:
+            offset, limit = DataTransformer.decode_cursor(cursor, cursor_scope or "")
+        else:
+            offset = (page - 1) * limit
+
+        if isinstance(data, dict):
+            total = len(next(iter(data.values()), []))
+            paginated = {name: values[offset:offset + limit] for name, values in data.items()}
+        else:
+            total = len(data)
+            paginated = data[offset:offset + limit]
+
+        meta = DataTransformer.pagination_meta(total, offset // limit + 1, limit)
+        if cursor_scope is not None:
+            end = offset + limit
+            meta["next_cursor"] = (
+                DataTransformer.encode_cursor(end, limit, cursor_scope) if end < total else None
+            )
+            meta["prev_cursor"] = (
+                DataTransformer.encode_cursor(max(offset - limit, 0), limit, cursor_scope)
+                if offset > 0 else None
+            )
+        return paginated, meta
+
+    @staticmethod
+    def encode_cursor(offset: int, limit: int, scope: str) -> str:
+        """Encode a page position as an opaque URL-safe token."""
+        payload = json.dumps(
+            {"o": offset, "l": limit, "s": _cursor_tag(scope)},
+            separators=(",", ":")
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, scope: str) -> Tuple[int, int]:
+        """
+        Decode a cursor issued by `encode_cursor`.
+
+        Returns:
+            Tuple of (offset, limit)
+
+        Raises:
+            ValueError: If the cursor is malformed or was issued for another scope
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            offset, limit, tag = int(payload["o"]), int(payload["l"]), payload["s"]
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+
+        if tag != _cursor_tag(scope):
+            raise ValueError("Cursor does not belong to this query")
+        if offset < 0 or not 1 <= limit <= settings.MAX_PAGE_SIZE:
+            raise ValueError("Cursor is out of range")
+        return offset, limit
+
+    @staticmethod
+    def pagination_meta(total: int, page: int, limit: int) -> dict:
+        """Build pagination metadata for `total` items."""
+        total_pages = (total + limit - 1) // limit
+        return {
             "page": page,
             "limit": limit,
             "total": total,
@@ -57,8 +164,6 @@ class DataTransformer:
             "has_prev": page > 1
         }
 
-        return paginated, meta
-
     @staticmethod
     def format_number(value: Any, decimals: int = 2) -> Optional[str]:
         """Format number for mobile display."""
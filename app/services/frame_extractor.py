@@ -0,0 +1,294 @@
+"""
+Vectorized DataFrame-to-record extraction.
+
+Maps OpenBB DataFrame columns to mobile response fields with whole-column
+pandas/NumPy operations (rename, cast, fill defaults) and emits records in
+a single pass, instead of calling `row.get()` / `float()` per cell inside
+`df.iterrows()`.
+"""
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    Mapping of one output field to DataFrame source columns.
+
+    Attributes:
+        name: Output field name
+        sources: Candidate source columns; the first present one wins
+        kind: Cast applied to the column:
+            float / int - numeric, `default` if the column is absent,
+                missing values -> None
+            optional_float / optional_int - numeric, None if the column is
+                absent, missing values -> None
+            datetime - parsed datetimes, missing values -> `default`
+            str - string representation of every value
+            raw - values passed through, missing values -> `default`
+        default: Fill value (callable defaults are evaluated once per call)
+        from_index: Read the DataFrame index instead of a column
+    """
+
+    name: str
+    sources: Tuple[str, ...] = ()
+    kind: str = "raw"
+    default: Any = None
+    from_index: bool = False
+
+
+def _resolve_default(spec: ColumnSpec) -> Any:
+    """Evaluate a spec's default value."""
+    return spec.default() if callable(spec.default) else spec.default
+
+
+def _source(df: pd.DataFrame, spec: ColumnSpec) -> Optional[pd.Series]:
+    """Find the source data for a spec, or None if absent."""
+    if spec.from_index:
+        return pd.Series(df.index, index=df.index)
+    for column in spec.sources or (spec.name,):
+        if column in df.columns:
+            return df[column]
+    return None
+
+
+def _convert(series: Optional[pd.Series], spec: ColumnSpec, length: int) -> List[Any]:
+    """Cast one source column to a list of Python values."""
+    default = _resolve_default(spec)
+
+    if series is None:
+        if spec.kind == "str":
+            default = str(default)
+        return [default] * length
+
+    if spec.kind in ("float", "int", "optional_float", "optional_int"):
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64")
+        missing = np.isnan(values)
+        integral = spec.kind in ("int", "optional_int")
+        if not missing.any():
+            return values.astype("int64").tolist() if integral else values.tolist()
+        # A missing cell is unknown, not `default` (a 0.0 close is a real price)
+        if integral:
+            out = np.where(missing, 0, values).astype("int64").astype(object)
+        else:
+            out = values.astype(object)
+        out[missing] = None
+        return out.tolist()
+
+    if spec.kind == "datetime":
+        if pd.api.types.is_numeric_dtype(series):
+            # e.g. a RangeIndex, not dates
+            return [default] * length
+        parsed = pd.to_datetime(series, errors="coerce")
+        # Via DatetimeIndex: Series.dt.to_pydatetime() is deprecated
+        out = pd.DatetimeIndex(parsed).to_pydatetime()
+        out[parsed.isna().to_numpy()] = default
+        return out.tolist()
+
+    if spec.kind == "str":
+        return series.astype(str).tolist()
+
+    out = series.to_numpy(dtype=object, copy=True)
+    out[series.isna().to_numpy()] = default
+    return out.tolist()
+
+
+def extract_columns(
+    df: pd.DataFrame,
+    specs: Sequence[ColumnSpec],
+    constants: Optional[Dict[str, Any]] = None
+) -> Dict[str, List[Any]]:
+    """
+    Extract one Python list per output field.
+
+    Args:
+        df: Source DataFrame
+        specs: Output field mapping
+        constants: Fields with the same value on every row (listed first)
+
+    Returns:
+        Dict of field name -> list of values
+    """
+    length = len(df)
+    columns: Dict[str, List[Any]] = {
+        name: [value] * length for name, value in (constants or {}).items()
+    }
+    for spec in specs:
+        columns[spec.name] = _convert(_source(df, spec), spec, length)
+    return columns
+
+
+def extract_records(
+    df: pd.DataFrame,
+    specs: Sequence[ColumnSpec],
+    constants: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extract a list of record dicts.
+
+    Args:
+        df: Source DataFrame
+        specs: Output field mapping
+        constants: Fields with the same value on every row (listed first)
+
+    Returns:
+        List of dicts, one per DataFrame row
+    """
+    columns = extract_columns(df, specs, constants)
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def iter_record_chunks(
+    df: pd.DataFrame,
+    specs: Sequence[ColumnSpec],
+    chunk_size: int,
+    constants: Optional[Dict[str, Any]] = None
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Lazily extract record dicts, `chunk_size` rows at a time.
+
+    Args:
+        df: Source DataFrame
+        specs: Output field mapping
+        chunk_size: Rows converted per chunk
+        constants: Fields with the same value on every row (listed first)
+
+    Yields:
+        Lists of at most `chunk_size` record dicts
+    """
+    for start in range(0, len(df), chunk_size):
+        yield extract_records(df.iloc[start:start + chunk_size], specs, constants)
+
+
+def approx_nbytes(data: Any, sample: int = 16) -> int:
+    """
+    Approximate memory held by extracted data (records, columns, scalars).
+
+    Lists are measured on up to `sample` evenly spaced items and scaled by
+    their length, so the cost does not grow with the number of rows.
+
+    Args:
+        data: Value to measure
+        sample: List items measured per list
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, dict):
+        # Keys are field names shared by every record; only values are counted
+        return sys.getsizeof(data) + sum(approx_nbytes(value, sample) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        size = sys.getsizeof(data)
+        if not data:
+            return size
+        step = max(len(data) // sample, 1)
+        measured = data[::step][:sample]
+        return size + len(data) * sum(approx_nbytes(item, sample) for item in measured) // len(measured)
+    return sys.getsizeof(data)
+
+
+def to_frame(result: Any) -> Optional[pd.DataFrame]:
+    """Convert an OBBject (or DataFrame) to a DataFrame."""
+    return result.to_df() if hasattr(result, "to_df") else result
+
+
+# =============================================================================
+# Field Mappings
+# =============================================================================
+
+QUOTE_SPECS = (
+    ColumnSpec("symbol", default=""),
+    ColumnSpec("name", ("name", "longName")),
+    ColumnSpec("price", ("price", "regularMarketPrice"), kind="float", default=0.0),
+    ColumnSpec("change", ("change", "regularMarketChange"), kind="float", default=0.0),
+    ColumnSpec("change_percent", ("change_percent", "regularMarketChangePercent"), kind="float", default=0.0),
+    ColumnSpec("volume", ("volume", "regularMarketVolume"), kind="optional_int"),
+    ColumnSpec("market_cap", ("market_cap", "marketCap"), kind="optional_int"),
+)
+
+HISTORICAL_SPECS = (
+    ColumnSpec("date", kind="datetime", default=datetime.now, from_index=True),
+    ColumnSpec("open", kind="float", default=0.0),
+    ColumnSpec("high", kind="float", default=0.0),
+    ColumnSpec("low", kind="float", default=0.0),
+    ColumnSpec("close", kind="float", default=0.0),
+    ColumnSpec("volume", kind="int", default=0),
+)
+
+SCREENER_SPECS = (
+    ColumnSpec("symbol", default=""),
+    ColumnSpec("name", ("name", "longName")),
+    ColumnSpec("price", ("price", "regularMarketPrice"), kind="float", default=0.0),
+    ColumnSpec("change", ("change", "regularMarketChange"), kind="float", default=0.0),
+    ColumnSpec("change_percent", ("change_percent", "regularMarketChangePercent"), kind="float", default=0.0),
+    ColumnSpec("volume", ("volume", "regularMarketVolume"), kind="optional_int"),
+)
+
+TREASURY_RATE_SPECS = (
+    ColumnSpec("date", kind="datetime", default=datetime.now, from_index=True),
+    ColumnSpec("maturity", default=""),
+    ColumnSpec("rate", kind="float", default=0.0),
+)
+
+YIELD_CURVE_SPECS = (
+    ColumnSpec("date", default=datetime.now),
+    ColumnSpec("rate_1m", ("1m",), kind="optional_float"),
+    ColumnSpec("rate_3m", ("3m",), kind="optional_float"),
+    ColumnSpec("rate_6m", ("6m",), kind="optional_float"),
+    ColumnSpec("rate_1y", ("1y",), kind="optional_float"),
+    ColumnSpec("rate_2y", ("2y",), kind="optional_float"),
+    ColumnSpec("rate_5y", ("5y",), kind="optional_float"),
+    ColumnSpec("rate_10y", ("10y",), kind="optional_float"),
+    ColumnSpec("rate_30y", ("30y",), kind="optional_float"),
+)
+
+SEC_FILING_SPECS = (
+    ColumnSpec("filing_type", ("filing_type", "form"), default=""),
+    ColumnSpec("filing_date", default=datetime.now),
+    ColumnSpec("filed_date"),
+    ColumnSpec("url"),
+    ColumnSpec("description"),
+)
+
+INSIDER_TRADING_SPECS = (
+    ColumnSpec("insider_name"),
+    ColumnSpec("transaction_type"),
+    ColumnSpec("shares", kind="optional_float"),
+    ColumnSpec("price", kind="optional_float"),
+    ColumnSpec("transaction_date"),
+)
+
+OPTIONS_SPECS = (
+    ColumnSpec("expiration", kind="str"),
+    ColumnSpec("strike", kind="float", default=0.0),
+    ColumnSpec("option_type", default=""),
+    ColumnSpec("last_price", kind="float", default=0.0),
+    ColumnSpec("bid", kind="float", default=0.0),
+    ColumnSpec("ask", kind="float", default=0.0),
+    ColumnSpec("volume", kind="int", default=0),
+    ColumnSpec("open_interest", kind="int", default=0),
+    ColumnSpec("implied_volatility", kind="float", default=0.0),
+)
+
+ECB_SPECS = (
+    ColumnSpec("date", kind="datetime", default=datetime.now, from_index=True),
+    ColumnSpec("rate", kind="float", default=0.0),
+)
+
+COT_SPECS = (
+    ColumnSpec("date", default=datetime.now),
+    ColumnSpec("market", ("market_name",), default=""),
+    ColumnSpec("non_commercial_long", kind="int", default=0),
+    ColumnSpec("non_commercial_short", kind="int", default=0),
+    ColumnSpec("commercial_long", kind="int", default=0),
+    ColumnSpec("commercial_short", kind="int", default=0),
+    ColumnSpec("open_interest", kind="int", default=0),
+)
@@ -4,11 +4,44 @@ OpenBB Platform API wrapper service.
 This service wraps the OpenBB Python SDK to fetch data from free providers.
 """
 import asyncio
-from datetime import datetime
-from typing import Optional, List, Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from functools import partial
+from typing import Optional, List, Any, Dict, Callable, Iterator, Tuple
 import pandas as pd
+from cachetools import TLRUCache, TTLCache
 
 from app.config import settings
+from app.metrics import timed_call
+from app.profiling import profiled
+from app.services.single_flight import SingleFlight, single_flight
+from app.services.bar_store import BarStore, last_final_day
+from app.services.options_index import OptionsChainIndex
+from app.services.frame_extractor import (
+    approx_nbytes,
+    to_frame,
+    extract_columns,
+    extract_records,
+    iter_record_chunks,
+    QUOTE_SPECS,
+    HISTORICAL_SPECS,
+    SCREENER_SPECS,
+    TREASURY_RATE_SPECS,
+    YIELD_CURVE_SPECS,
+    SEC_FILING_SPECS,
+    INSIDER_TRADING_SPECS,
+    OPTIONS_SPECS,
+    ECB_SPECS,
+    COT_SPECS
+)
+
+
+def _dataset_ttu(key: tuple, value: Any, now: float) -> float:
+    """Expiry of a cached historical dataset; long once its range is closed."""
+    end_date = key[3]
+    if date.fromisoformat(end_date) <= last_final_day():
+        return now + settings.CACHE_TTL_HISTORICAL_CLOSED
+    return now + settings.HISTORICAL_DATASET_TTL
 
 
 class OpenBBService:
@@ -17,11 +50,30 @@ class OpenBBService:
 
     Handles all interactions with the OpenBB SDK and transforms
     responses into mobile-optimized formats.
+
+    The SDK is synchronous, so every upstream call and extraction runs on
+    a bounded thread pool per provider instead of on the event loop.
+    Identical concurrent calls are coalesced into one upstream request.
     """
 
     def __init__(self):
         """Initialize OpenBB service."""
         self._obb = None
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._single_flight = SingleFlight()
+        self._bar_store = BarStore()
+        # Extracted historical datasets, sliced per page by the routers;
+        # both caches are bounded by bytes, and by entry count
+        self._datasets: TLRUCache = TLRUCache(
+            maxsize=settings.HISTORICAL_DATASET_MAX_BYTES,
+            ttu=_dataset_ttu,
+            getsizeof=approx_nbytes
+        )
+        self._options_indexes: TTLCache = TTLCache(
+            maxsize=settings.OPTIONS_INDEX_MAX_BYTES,
+            ttl=settings.OPTIONS_INDEX_TTL,
+            getsizeof=lambda index: index.nbytes
+        )
         self._initialize_openbb()
 
     def _initialize_openbb(self):
@@ -34,10 +86,76 @@ class OpenBBService:
                 f"OpenBB package not found. Make sure it's installed: {e}"
             )
 
+    # ========================================================================
+    # Executor Helpers
+    # ========================================================================
+
+    def _get_executor(self, pool: str) -> ThreadPoolExecutor:
+        """Get or create the thread pool for a provider."""
+        executor = self._executors.get(pool)
+        if executor is None:
+            max_workers = getattr(
+                settings,
+                f"EXECUTOR_WORKERS_{pool.upper()}",
+                settings.EXECUTOR_WORKERS_DEFAULT
+            )
+            executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix=f"openbb-{pool}"
+            )
+            self._executors[pool] = executor
+        return executor
+
+    async def _run(self, pool: str, func: Callable, /, *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the provider's thread pool.
+
+        SDK calls are counted and timed per provider, extraction helpers
+        per function (see app/metrics.py). During a profiled request the
+        pool thread is sampled into its profile (see app/profiling.py).
+
+        Args:
+            pool: Provider name selecting the pool (e.g., yfinance)
+            func: Blocking callable (SDK call or extraction helper)
+
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(pool),
+            partial(profiled(timed_call), pool, func, *args, **kwargs)
+        )
+
+    @staticmethod
+    def _remember(cache: Any, key: Any, value: Any, max_entries: int) -> None:
+        """Cache a value within the cache's byte budget and `max_entries` (oversized values are skipped)."""
+        try:
+            cache[key] = value
+        except ValueError:
+            return
+        while len(cache) > max_entries:
+            cache.popitem()
+
+    def get_single_flight_stats(self) -> Dict[str, int]:
+        """Get upstream call coalescing counters."""
+        return self._single_flight.stats()
+
+    def get_bar_store_stats(self) -> Dict[str, Any]:
+        """Get historical bar store counters."""
+        return self._bar_store.stats()
+
+    def shutdown(self) -> None:
+        """Shut down all provider thread pools."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+
     # ========================================================================
     # YFinance - Equity Methods
     # ========================================================================
 
+    @single_flight
     async def get_equity_quote(
         self,
         symbol: str,
@@ -46,22 +164,105 @@ class OpenBBService:
         """
         Get real-time equity quote.
 
+        Extracted with QUOTE_SPECS like batch quotes, so a symbol's payload
+        (and its version) does not depend on which route served it.
+
         Args:
             symbol: Stock symbol (e.g., AAPL)
             provider: Data provider (default: yfinance)
 
         Returns:
-            Dict with quote data
+            Dict with quote data (empty if the provider returned none),
+            owned by the caller
         """
+        quotes = await self._get_quote_chunk((symbol,), provider=provider)
+        # Coalesced callers share the chunk's inner dicts
+        return dict(quotes.get(symbol, {}))
+
+    async def get_equity_quotes(
+        self,
+        symbols: List[str],
+        provider: str = "yfinance"
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """
+        Get quotes for many symbols with multi-symbol upstream calls.
+
+        Symbols are sent BATCH_QUOTE_CHUNK_SIZE at a time as one
+        comma-separated upstream call (up to BATCH_QUOTE_CONCURRENCY calls
+        in flight, each bounded by BATCH_QUOTE_TIMEOUT), and the returned
+        frame is split back into per-symbol quotes. A chunk whose call
+        fails is retried symbol by symbol (same extraction), so one bad
+        symbol only fails itself.
+
+        Args:
+            symbols: Stock symbols (deduplicated by the caller)
+            provider: Data provider (default: yfinance)
+
+        Returns:
+            Tuple of (symbol -> quote dict, symbol -> error message);
+            symbols missing from the upstream result are in neither
+        """
+        size = settings.BATCH_QUOTE_CHUNK_SIZE
+        chunks = [tuple(symbols[i:i + size]) for i in range(0, len(symbols), size)]
+        semaphore = asyncio.Semaphore(settings.BATCH_QUOTE_CONCURRENCY)
+        timeout = settings.BATCH_QUOTE_TIMEOUT
+
+        async def fetch(call, *args):
+            async with semaphore:
+                return await asyncio.wait_for(call(*args, provider=provider), timeout=timeout)
+
+        quotes: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        retry: List[str] = []
+
+        outcomes = await asyncio.gather(
+            *(fetch(self._get_quote_chunk, chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                errors.update(dict.fromkeys(chunk, f"Timed out after {timeout}s"))
+            elif isinstance(outcome, Exception):
+                if len(chunk) == 1:
+                    errors[chunk[0]] = str(outcome)
+                else:
+                    retry.extend(chunk)
+            else:
+                quotes.update(outcome)
+
+        outcomes = await asyncio.gather(
+            *(fetch(self._get_quote_chunk, (symbol,)) for symbol in retry),
+            return_exceptions=True
+        )
+        for symbol, outcome in zip(retry, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                errors[symbol] = f"Timed out after {timeout}s"
+            elif isinstance(outcome, Exception):
+                errors[symbol] = str(outcome)
+            else:
+                quotes.update(outcome)
+
+        return quotes, errors
+
+    @single_flight
+    async def _get_quote_chunk(
+        self,
+        symbols: Tuple[str, ...],
+        provider: str = "yfinance"
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch quotes for several symbols in one upstream call."""
         try:
-            result = self._obb.equity.price.quote(
-                symbol=symbol,
+            result = await self._run(
+                provider,
+                self._obb.equity.price.quote,
+                symbol=",".join(symbols),
                 provider=provider
             )
-            return self._extract_quote_data(result, symbol)
+            return await self._run(provider, self._extract_quotes, result, symbols)
         except Exception as e:
-            raise RuntimeError(f"Error fetching quote for {symbol}: {e}")
+            raise RuntimeError(f"Error fetching quotes for {','.join(symbols)}: {e}")
 
+    @single_flight
     async def get_equity_historical(
         self,
         symbol: str,
@@ -80,18 +281,91 @@ class OpenBBService:
 
         Returns:
             List of historical data points
+
+        Bars come from the bar store; only date ranges it does not hold
+        yet are fetched upstream. The extracted list is cached per range,
+        so every page of it is a slice of the same dataset.
         """
         try:
-            result = self._obb.equity.price.historical(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date,
-                provider=provider
+            return await self._get_historical_dataset(
+                "records", self._extract_historical_data, symbol, start_date, end_date, provider
+            )
+        except Exception as e:
+            raise RuntimeError(f"Error fetching historical data for {symbol}: {e}")
+
+    @single_flight
+    async def get_historical_columns(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        provider: str = "yfinance"
+    ) -> Dict[str, List[Any]]:
+        """
+        Get historical prices in columnar form.
+
+        Args:
+            symbol: Stock, ETF, crypto or currency symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            provider: Data provider
+
+        Returns:
+            Dict of field name -> list of values (date, open, high, low,
+            close, volume), built straight from the DataFrame columns
+        """
+        try:
+            return await self._get_historical_dataset(
+                "columns", self._extract_historical_columns, symbol, start_date, end_date, provider
             )
-            return self._extract_historical_data(result)
         except Exception as e:
             raise RuntimeError(f"Error fetching historical data for {symbol}: {e}")
 
+    async def _get_historical_dataset(
+        self,
+        layout: str,
+        extract: Callable,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        provider: str
+    ) -> Any:
+        """Get an extracted historical dataset from cache or the bar store."""
+        key = (layout, symbol.upper(), start_date, end_date, provider)
+        data = self._datasets.get(key)
+        if data is None:
+            df = await self._bar_store.get_range(
+                symbol,
+                provider,
+                start_date,
+                end_date,
+                fetch=partial(self._fetch_historical_frame, symbol, provider=provider)
+            )
+            data = await self._run(provider, extract, df)
+            # Never pin a range with uncovered days (a closed one lives for weeks)
+            if not df.empty and self._bar_store.covers(symbol, provider, start_date, end_date):
+                self._remember(self._datasets, key, data, settings.HISTORICAL_DATASET_CACHE_SIZE)
+        return data
+
+    async def _fetch_historical_frame(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        provider: str = "yfinance"
+    ) -> Optional[pd.DataFrame]:
+        """Fetch one historical range upstream as a DataFrame."""
+        result = await self._run(
+            provider,
+            self._obb.equity.price.historical,
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date,
+            provider=provider
+        )
+        return to_frame(result)
+
+    @single_flight
     async def get_equity_profile(
         self,
         symbol: str,
@@ -108,14 +382,17 @@ class OpenBBService:
             Dict with profile data
         """
         try:
-            result = self._obb.equity.profile(
+            result = await self._run(
+                provider,
+                self._obb.equity.profile,
                 symbol=symbol,
                 provider=provider
             )
-            return self._extract_profile_data(result)
+            return await self._run(provider, self._extract_profile_data, result)
         except Exception as e:
             raise RuntimeError(f"Error fetching profile for {symbol}: {e}")
 
+    @single_flight
     async def get_screener_gainers(
         self,
         limit: int = 20,
@@ -123,13 +400,16 @@ class OpenBBService:
     ) -> List[Dict[str, Any]]:
         """Get top gainers from screener."""
         try:
-            result = self._obb.equity.discovery.gainers(
+            result = await self._run(
+                provider,
+                self._obb.equity.discovery.gainers,
                 provider=provider
             )
-            return self._extract_screener_data(result, limit)
+            return await self._run(provider, self._extract_screener_data, result, limit)
         except Exception as e:
             raise RuntimeError(f"Error fetching gainers: {e}")
 
+    @single_flight
     async def get_screener_losers(
         self,
         limit: int = 20,
@@ -137,13 +417,16 @@ class OpenBBService:
     ) -> List[Dict[str, Any]]:
         """Get top losers from screener."""
         try:
-            result = self._obb.equity.discovery.losers(
+            result = await self._run(
+                provider,
+                self._obb.equity.discovery.losers,
                 provider=provider
             )
-            return self._extract_screener_data(result, limit)
+            return await self._run(provider, self._extract_screener_data, result, limit)
         except Exception as e:
             raise RuntimeError(f"Error fetching losers: {e}")
 
+    @single_flight
     async def get_screener_active(
         self,
         limit: int = 20,
@@ -151,10 +434,12 @@ class OpenBBService:
     ) -> List[Dict[str, Any]]:
         """Get most active stocks."""
         try:
-            result = self._obb.equity.discovery.active(
+            result = await self._run(
+                provider,
+                self._obb.equity.discovery.active,
                 provider=provider
             )
-            return self._extract_screener_data(result, limit)
+            return await self._run(provider, self._extract_screener_data, result, limit)
         except Exception as e:
             raise RuntimeError(f"Error fetching active stocks: {e}")
 
@@ -220,62 +505,88 @@ class OpenBBService:
     # Federal Reserve Methods
     # ========================================================================
 
+    @single_flight
     async def get_treasury_rates(
         self,
         provider: str = "federal_reserve"
     ) -> List[Dict[str, Any]]:
         """Get Treasury yield curve rates."""
         try:
-            result = self._obb.economy.treasury_rates(
+            result = await self._run(
+                provider,
+                self._obb.economy.treasury_rates,
                 provider=provider
             )
-            return self._extract_treasury_rates(result)
+            return await self._run(provider, self._extract_treasury_rates, result)
         except Exception as e:
             raise RuntimeError(f"Error fetching treasury rates: {e}")
 
+    @single_flight
     async def get_federal_funds_rate(
         self,
         provider: str = "federal_reserve"
     ) -> Dict[str, Any]:
         """Get federal funds rate."""
         try:
-            result = self._obb.economy.federal_funds_rate(
+            result = await self._run(
+                provider,
+                self._obb.economy.federal_funds_rate,
                 provider=provider
             )
-            return self._extract_fed_funds_rate(result)
+            return await self._run(provider, self._extract_fed_funds_rate, result)
         except Exception as e:
             raise RuntimeError(f"Error fetching federal funds rate: {e}")
 
+    @single_flight
     async def get_sofr_rate(
         self,
         provider: str = "federal_reserve"
     ) -> Dict[str, Any]:
         """Get SOFR rate."""
         try:
-            result = self._obb.economy.sofr(
+            result = await self._run(
+                provider,
+                self._obb.economy.sofr,
                 provider=provider
             )
-            return self._extract_sofr_rate(result)
+            return await self._run(provider, self._extract_sofr_rate, result)
         except Exception as e:
             raise RuntimeError(f"Error fetching SOFR rate: {e}")
 
+    @single_flight
     async def get_yield_curve(
         self,
         provider: str = "federal_reserve"
     ) -> List[Dict[str, Any]]:
         """Get yield curve data."""
         try:
-            result = self._obb.economy.yield_curve(
-                provider=provider
-            )
-            return self._extract_yield_curve(result)
+            df = await self._get_yield_curve_frame(provider)
+            return await self._run(provider, self._extract_yield_curve, df)
+        except Exception as e:
+            raise RuntimeError(f"Error fetching yield curve: {e}")
+
+    async def stream_yield_curve(
+        self,
+        provider: str = "federal_reserve"
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Get yield curve data as lazily extracted record chunks."""
+        try:
+            df = await self._get_yield_curve_frame(provider)
+            return self._iter_chunks(df, YIELD_CURVE_SPECS)
         except Exception as e:
             raise RuntimeError(f"Error fetching yield curve: {e}")
 
+    @single_flight
+    async def _get_yield_curve_frame(self, provider: str = "federal_reserve") -> Optional[pd.DataFrame]:
+        """Fetch the yield curve as a DataFrame."""
+        result = await self._run(provider, self._obb.economy.yield_curve, provider=provider)
+        return to_frame(result)
+
     # ========================================================================
     # SEC Methods
     # ========================================================================
 
+    @single_flight
     async def get_sec_filings(
         self,
         symbol: str,
@@ -284,16 +595,19 @@ class OpenBBService:
     ) -> List[Dict[str, Any]]:
         """Get SEC filings for a symbol."""
         try:
-            result = self._obb.equity.filings(
+            result = await self._run(
+                "sec",
+                self._obb.equity.filings,
                 symbol=symbol,
                 filing_type=filing_type,
                 limit=limit,
                 provider="sec"
             )
-            return self._extract_sec_filings(result, symbol)
+            return await self._run("sec", self._extract_sec_filings, result, symbol)
         except Exception as e:
             raise RuntimeError(f"Error fetching SEC filings: {e}")
 
+    @single_flight
     async def get_insider_trading(
         self,
         symbol: str,
@@ -301,12 +615,14 @@ class OpenBBService:
     ) -> List[Dict[str, Any]]:
         """Get insider trading data."""
         try:
-            result = self._obb.regulators.insider_trading(
+            result = await self._run(
+                "sec",
+                self._obb.regulators.insider_trading,
                 symbol=symbol,
                 limit=limit,
                 provider="sec"
             )
-            return self._extract_insider_trading(result, symbol)
+            return await self._run("sec", self._extract_insider_trading, result, symbol)
         except Exception as e:
             raise RuntimeError(f"Error fetching insider trading: {e}")
 
@@ -314,25 +630,65 @@ class OpenBBService:
     # CBOE Methods
     # ========================================================================
 
-    async def get_options_chains(
+    @single_flight
+    async def get_options_chain_index(
         self,
         symbol: str,
         provider: str = "cboe"
-    ) -> List[Dict[str, Any]]:
-        """Get options chain data."""
+    ) -> OptionsChainIndex:
+        """
+        Get the options chain as an index for filtered lookups.
+
+        The index is built once per chain fetch and cached for
+        OPTIONS_INDEX_TTL seconds; filters are answered from it without
+        refetching.
+
+        Args:
+            symbol: Underlying symbol
+            provider: Data provider
+
+        Returns:
+            OptionsChainIndex over the chain
+        """
+        key = (symbol.upper(), provider)
         try:
-            result = self._obb.derivatives.options.chains(
-                symbol=symbol,
-                provider=provider
-            )
-            return self._extract_options_data(result)
+            index = self._options_indexes.get(key)
+            if index is None:
+                df = await self._get_options_frame(symbol, provider)
+                index = await self._run(provider, OptionsChainIndex.from_frame, df)
+                self._remember(self._options_indexes, key, index, settings.OPTIONS_INDEX_CACHE_SIZE)
+            return index
+        except Exception as e:
+            raise RuntimeError(f"Error fetching options for {symbol}: {e}")
+
+    async def stream_options_chains(
+        self,
+        symbol: str,
+        provider: str = "cboe"
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Get options chain data as lazily extracted record chunks."""
+        try:
+            df = await self._get_options_frame(symbol, provider)
+            return self._iter_chunks(df, OPTIONS_SPECS)
         except Exception as e:
             raise RuntimeError(f"Error fetching options for {symbol}: {e}")
 
+    @single_flight
+    async def _get_options_frame(self, symbol: str, provider: str = "cboe") -> Optional[pd.DataFrame]:
+        """Fetch an options chain as a DataFrame."""
+        result = await self._run(
+            provider,
+            self._obb.derivatives.options.chains,
+            symbol=symbol,
+            provider=provider
+        )
+        return to_frame(result)
+
     # ========================================================================
     # ECB Methods
     # ========================================================================
 
+    @single_flight
     async def get_ecb_forex(
         self,
         symbol: str = "EURUSD",
@@ -341,10 +697,12 @@ class OpenBBService:
         """Get ECB exchange rates."""
         try:
             # Note: OpenBB usually maps ECB to fixedincome/rate or similar
-            result = self._obb.fixedincome.rate.ecb(
+            result = await self._run(
+                provider,
+                self._obb.fixedincome.rate.ecb,
                 provider=provider
             )
-            return self._extract_ecb_data(result)
+            return await self._run(provider, self._extract_ecb_data, result)
         except Exception as e:
             raise RuntimeError(f"Error fetching ECB rates: {e}")
 
@@ -352,6 +710,7 @@ class OpenBBService:
     # CFTC Methods
     # ========================================================================
 
+    @single_flight
     async def get_cot_report(
         self,
         symbol: str,
@@ -359,71 +718,87 @@ class OpenBBService:
     ) -> List[Dict[str, Any]]:
         """Get Commitment of Traders (COT) report."""
         try:
-            result = self._obb.regulators.cftc.cot(
-                id=symbol,
-                provider=provider
-            )
-            return self._extract_cot_data(result)
+            df = await self._get_cot_frame(symbol, provider)
+            return await self._run(provider, self._extract_cot_data, df)
+        except Exception as e:
+            raise RuntimeError(f"Error fetching COT report for {symbol}: {e}")
+
+    async def stream_cot_report(
+        self,
+        symbol: str,
+        provider: str = "cftc"
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Get COT report as lazily extracted record chunks."""
+        try:
+            df = await self._get_cot_frame(symbol, provider)
+            return self._iter_chunks(df, COT_SPECS)
         except Exception as e:
             raise RuntimeError(f"Error fetching COT report for {symbol}: {e}")
 
+    @single_flight
+    async def _get_cot_frame(self, symbol: str, provider: str = "cftc") -> Optional[pd.DataFrame]:
+        """Fetch a COT report as a DataFrame."""
+        result = await self._run(
+            provider,
+            self._obb.regulators.cftc.cot,
+            id=symbol,
+            provider=provider
+        )
+        return to_frame(result)
+
     # ========================================================================
     # Data Extraction Helpers
     # ========================================================================
 
-    def _extract_quote_data(self, result, symbol: str) -> Dict[str, Any]:
-        """Extract quote data from OpenBB result."""
-        try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
-            if df is None or df.empty:
-                return {}
-
-            row = df.iloc[0] if isinstance(df, pd.DataFrame) else df
+    @staticmethod
+    def _iter_chunks(df: Optional[pd.DataFrame], specs) -> Iterator[List[Dict[str, Any]]]:
+        """Lazily extract records from a DataFrame in STREAM_CHUNK_SIZE chunks."""
+        if df is None or df.empty:
+            return iter(())
+        return iter_record_chunks(df, specs, settings.STREAM_CHUNK_SIZE)
+
+    def _extract_quotes(self, result, symbols: Tuple[str, ...]) -> Dict[str, Dict[str, Any]]:
+        """Split a multi-symbol quote result into per-symbol quote dicts."""
+        df = to_frame(result)
+        if df is None or df.empty:
+            return {}
 
-            return {
-                "symbol": symbol,
-                "name": row.get("name", row.get("longName", None)),
-                "price": float(row.get("price", row.get("regularMarketPrice", 0))),
-                "change": float(row.get("change", row.get("regularMarketChange", 0))),
-                "change_percent": float(row.get("change_percent", row.get("regularMarketChangePercent", 0))),
-                "volume": int(row.get("volume", row.get("regularMarketVolume", 0))) if row.get("volume") else None,
-                "market_cap": int(row.get("market_cap", row.get("marketCap", 0))) if row.get("market_cap") else None,
-                "last_updated": datetime.now()
-            }
-        except Exception:
-            return {
-                "symbol": symbol,
-                "price": 0,
-                "change": 0,
-                "change_percent": 0,
-                "last_updated": datetime.now()
-            }
+        requested = {symbol.upper(): symbol for symbol in symbols}
+        now = datetime.now()
+        quotes = {}
+        for record in extract_records(df, QUOTE_SPECS):
+            symbol = requested.get(str(record["symbol"]).upper())
+            if symbol is None and len(symbols) == 1 and len(df) == 1:
+                symbol = symbols[0]  # provider omitted the symbol column
+            if symbol is not None:
+                record["symbol"] = symbol
+                record["last_updated"] = now
+                quotes[symbol] = record
+        return quotes
 
     def _extract_historical_data(self, result) -> List[Dict[str, Any]]:
         """Extract historical data from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return []
 
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "date": row.name if isinstance(row.name, datetime) else datetime.now(),
-                    "open": float(row.get("open", 0)),
-                    "high": float(row.get("high", 0)),
-                    "low": float(row.get("low", 0)),
-                    "close": float(row.get("close", 0)),
-                    "volume": int(row.get("volume", 0))
-                })
-            return data
+            return extract_records(df, HISTORICAL_SPECS)
         except Exception:
             return []
 
+    def _extract_historical_columns(self, result) -> Dict[str, List[Any]]:
+        """Extract historical data from OpenBB result as columns."""
+        df = to_frame(result)
+        if df is None or df.empty:
+            return {spec.name: [] for spec in HISTORICAL_SPECS}
+
+        return extract_columns(df, HISTORICAL_SPECS)
+
     def _extract_profile_data(self, result) -> Dict[str, Any]:
         """Extract profile data from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return {}
 
@@ -445,46 +820,29 @@ class OpenBBService:
     def _extract_screener_data(self, result, limit: int) -> List[Dict[str, Any]]:
         """Extract screener data from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return []
 
-            data = []
-            for _, row in df.head(limit).iterrows():
-                data.append({
-                    "symbol": row.get("symbol", ""),
-                    "name": row.get("name", row.get("longName", None)),
-                    "price": float(row.get("price", row.get("regularMarketPrice", 0))),
-                    "change": float(row.get("change", row.get("regularMarketChange", 0))),
-                    "change_percent": float(row.get("change_percent", row.get("regularMarketChangePercent", 0))),
-                    "volume": int(row.get("volume", row.get("regularMarketVolume", 0))) if row.get("volume") else None
-                })
-            return data
+            return extract_records(df.head(limit), SCREENER_SPECS)
         except Exception:
             return []
 
     def _extract_treasury_rates(self, result) -> List[Dict[str, Any]]:
         """Extract treasury rates from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return []
 
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "date": row.name if isinstance(row.name, datetime) else datetime.now(),
-                    "maturity": row.get("maturity", ""),
-                    "rate": float(row.get("rate", 0))
-                })
-            return data
+            return extract_records(df, TREASURY_RATE_SPECS)
         except Exception:
             return []
 
     def _extract_fed_funds_rate(self, result) -> Dict[str, Any]:
         """Extract federal funds rate from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return {}
 
@@ -501,7 +859,7 @@ class OpenBBService:
     def _extract_sofr_rate(self, result) -> Dict[str, Any]:
         """Extract SOFR rate from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return {}
 
@@ -516,129 +874,55 @@ class OpenBBService:
     def _extract_yield_curve(self, result) -> List[Dict[str, Any]]:
         """Extract yield curve from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return []
 
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "date": row.get("date", datetime.now()),
-                    "rate_1m": float(row["1m"]) if "1m" in row else None,
-                    "rate_3m": float(row["3m"]) if "3m" in row else None,
-                    "rate_6m": float(row["6m"]) if "6m" in row else None,
-                    "rate_1y": float(row["1y"]) if "1y" in row else None,
-                    "rate_2y": float(row["2y"]) if "2y" in row else None,
-                    "rate_5y": float(row["5y"]) if "5y" in row else None,
-                    "rate_10y": float(row["10y"]) if "10y" in row else None,
-                    "rate_30y": float(row["30y"]) if "30y" in row else None
-                })
-            return data
+            return extract_records(df, YIELD_CURVE_SPECS)
         except Exception:
             return []
 
     def _extract_sec_filings(self, result, symbol: str) -> List[Dict[str, Any]]:
         """Extract SEC filings from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return []
 
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "symbol": symbol,
-                    "filing_type": row.get("filing_type", row.get("form", "")),
-                    "filing_date": row.get("filing_date", datetime.now()),
-                    "filed_date": row.get("filed_date", None),
-                    "url": row.get("url", None),
-                    "description": row.get("description", None)
-                })
-            return data
+            return extract_records(df, SEC_FILING_SPECS, constants={"symbol": symbol})
         except Exception:
             return []
 
     def _extract_insider_trading(self, result, symbol: str) -> List[Dict[str, Any]]:
         """Extract insider trading data from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
-            if df is None or df.empty:
-                return []
-
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "symbol": symbol,
-                    "insider_name": row.get("insider_name", None),
-                    "transaction_type": row.get("transaction_type", None),
-                    "shares": float(row.get("shares", 0)) if row.get("shares") else None,
-                    "price": float(row.get("price", 0)) if row.get("price") else None,
-                    "transaction_date": row.get("transaction_date", None)
-                })
-            return data
-        except Exception:
-            return []
-
-    def _extract_options_data(self, result) -> List[Dict[str, Any]]:
-        """Extract options data from OpenBB result."""
-        try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return []
 
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "expiration": str(row.get("expiration")),
-                    "strike": float(row.get("strike", 0)),
-                    "option_type": row.get("option_type", ""),
-                    "last_price": float(row.get("last_price", 0)),
-                    "bid": float(row.get("bid", 0)),
-                    "ask": float(row.get("ask", 0)),
-                    "volume": int(row.get("volume", 0)),
-                    "open_interest": int(row.get("open_interest", 0)),
-                    "implied_volatility": float(row.get("implied_volatility", 0))
-                })
-            return data
+            return extract_records(df, INSIDER_TRADING_SPECS, constants={"symbol": symbol})
         except Exception:
             return []
 
     def _extract_ecb_data(self, result) -> List[Dict[str, Any]]:
         """Extract ECB data from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return []
-            
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "date": row.name if isinstance(row.name, datetime) else datetime.now(),
-                    "rate": float(row.get("rate", 0))
-                })
-            return data
+
+            return extract_records(df, ECB_SPECS)
         except Exception:
             return []
 
     def _extract_cot_data(self, result) -> List[Dict[str, Any]]:
         """Extract COT data from OpenBB result."""
         try:
-            df = result.to_df() if hasattr(result, 'to_df') else result
+            df = to_frame(result)
             if df is None or df.empty:
                 return []
 
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "date": row.get("date", datetime.now()),
-                    "market": row.get("market_name", ""),
-                    "non_commercial_long": int(row.get("non_commercial_long", 0)),
-                    "non_commercial_short": int(row.get("non_commercial_short", 0)),
-                    "commercial_long": int(row.get("commercial_long", 0)),
-                    "commercial_short": int(row.get("commercial_short", 0)),
-                    "open_interest": int(row.get("open_interest", 0))
-                })
-            return data
+            return extract_records(df, COT_SPECS)
         except Exception:
             return []
 
@@ -653,3 +937,14 @@ def get_openbb_service() -> OpenBBService:
     if _openbb_service is None:
         _openbb_service = OpenBBService()
     return _openbb_service
+
+
+def peek_openbb_service() -> Optional[OpenBBService]:
+    """Get the singleton without creating it."""
+    return _openbb_service
+
+
+def shutdown_openbb_service() -> None:
+    """Release the singleton's thread pools, if it was ever created."""
+    if _openbb_service is not None:
+        _openbb_service.shutdown()
@@ -0,0 +1,141 @@
+"""
+Indexed options chain.
+
+Holds an extracted chain sorted by (expiration, option_type, strike) with
+the slice bounds of every (expiration, option_type) group, so filtered
+lookups are a dict lookup plus a binary search on strike instead of a
+scan over the full chain.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.frame_extractor import approx_nbytes, extract_columns, OPTIONS_SPECS
+
+
+class OptionsChainIndex:
+    """Options chain records indexed by expiration, option type and strike."""
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        strikes: np.ndarray,
+        groups: Dict[str, Dict[str, Tuple[int, int]]],
+        underlying_price: Optional[float] = None
+    ):
+        """
+        Initialize index.
+
+        Args:
+            records: Contracts sorted by (expiration, option_type, strike)
+            strikes: Strike of every record, same order
+            groups: expiration -> option_type -> (start, end) into records
+            underlying_price: Underlying spot price, if the chain has it
+        """
+        self.records = records
+        self.underlying_price = underlying_price
+        self._strikes = strikes
+        self._groups = groups
+
+    @classmethod
+    def from_frame(cls, df: Optional[pd.DataFrame]) -> "OptionsChainIndex":
+        """Build an index from an options chain DataFrame."""
+        if df is None or df.empty:
+            return cls([], np.empty(0), {})
+
+        columns = extract_columns(df, OPTIONS_SPECS)
+        columns["expiration"] = pd.Series(columns["expiration"], dtype=str).str[:10].tolist()
+        expirations = np.asarray(columns["expiration"])
+        option_types = pd.Series(columns["option_type"], dtype=str).str.lower().to_numpy()
+        strikes = np.asarray(columns["strike"], dtype="float64")
+
+        order = np.lexsort((strikes, option_types, expirations))
+        expirations, option_types, strikes = expirations[order], option_types[order], strikes[order]
+        positions = order.tolist()
+        names = list(columns)
+        records = [
+            dict(zip(names, row))
+            for row in zip(*([values[i] for i in positions] for values in columns.values()))
+        ]
+
+        # Group boundaries wherever expiration or option type changes
+        changes = np.flatnonzero(
+            (expirations[1:] != expirations[:-1]) | (option_types[1:] != option_types[:-1])
+        ) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [len(records)]))
+        groups: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            groups.setdefault(str(expirations[start]), {})[str(option_types[start])] = (start, end)
+
+        underlying_price = None
+        if "underlying_price" in df.columns:
+            prices = pd.to_numeric(df["underlying_price"], errors="coerce").dropna()
+            if not prices.empty:
+                underlying_price = float(prices.iloc[0])
+
+        return cls(records, strikes, groups, underlying_price)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index, in bytes."""
+        return approx_nbytes(self.records) + self._strikes.nbytes + approx_nbytes(self._groups)
+
+    @property
+    def expirations(self) -> List[str]:
+        """Available expirations, ascending."""
+        return list(self._groups)
+
+    def query(
+        self,
+        expiration: Optional[str] = None,
+        option_type: Optional[str] = None,
+        strike_min: Optional[float] = None,
+        strike_max: Optional[float] = None,
+        moneyness: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Look up contracts.
+
+        Args:
+            expiration: Expiration date (YYYY-MM-DD)
+            option_type: call or put
+            strike_min: Lowest strike (inclusive)
+            strike_max: Highest strike (inclusive)
+            moneyness: Strikes within this fraction of the underlying price
+                (e.g. 0.05 for +/-5%); replaces strike_min/strike_max
+            limit: Max contracts returned, in (expiration, type, strike) order
+
+        Returns:
+            List of contract records
+
+        Raises:
+            ValueError: If moneyness is used and the underlying price is unknown
+        """
+        if moneyness is not None:
+            if self.underlying_price is None:
+                raise ValueError("Underlying price unavailable; use strike_min/strike_max")
+            strike_min = self.underlying_price * (1 - moneyness)
+            strike_max = self.underlying_price * (1 + moneyness)
+
+        if expiration is None:
+            selected = self._groups.values()
+        else:
+            selected = [self._groups.get(expiration[:10], {})]
+
+        result: List[Dict[str, Any]] = []
+        for by_type in selected:
+            bounds = by_type.values() if option_type is None else [by_type.get(option_type.lower())]
+            for bound in bounds:
+                if bound is None:
+                    continue
+                start, end = bound
+                strikes = self._strikes[start:end]
+                low = start if strike_min is None else start + int(np.searchsorted(strikes, strike_min, "left"))
+                high = end if strike_max is None else start + int(np.searchsorted(strikes, strike_max, "right"))
+                result.extend(self.records[low:high])
+                if limit is not None and len(result) >= limit:
+                    return result[:limit]
+        return result
@@ -0,0 +1,208 @@
+"""
+Shared quote streaming.
+
+Clients subscribe to a set of symbols; one poll loop fetches every
+subscribed symbol with the batch quote path (a few multi-symbol upstream
+calls per tick, however many clients are connected) and fans each quote
+out only to that symbol's subscribers, and only when its price changed.
+Subscribers that read slowly skip intermediate updates instead of
+queueing them: they always get each symbol's latest quote.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.openbb_service import get_openbb_service
+
+logger = logging.getLogger(__name__)
+
+# (event name, payload)
+Event = Tuple[str, Dict[str, Any]]
+
+
+class QuoteSubscriber:
+    """One client's subscription: its symbols and undelivered events."""
+
+    def __init__(self, symbols: List[str]):
+        """
+        Initialize subscriber.
+
+        Args:
+            symbols: Subscribed symbols
+        """
+        self.symbols = symbols
+        self._pending: Dict[str, Event] = {}
+        self._ready = asyncio.Event()
+
+    def push(self, symbol: str, event: Event) -> None:
+        """Queue a symbol's event, replacing one not yet delivered."""
+        self._pending[symbol] = event
+        self._ready.set()
+
+    async def next_events(self, timeout: Optional[float] = None) -> List[Event]:
+        """
+        Wait for events.
+
+        Args:
+            timeout: Seconds to wait; an empty list is returned on timeout
+
+        Returns:
+            Latest undelivered event per symbol
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        events, self._pending = list(self._pending.values()), {}
+        return events
+
+
+class QuoteHub:
+    """Polls subscribed symbols once per interval and fans out price changes."""
+
+    def __init__(self, interval: float = 5, provider: str = "yfinance"):
+        """
+        Initialize hub.
+
+        Args:
+            interval: Seconds between upstream polls
+            provider: Data provider for quotes
+        """
+        self.interval = interval
+        self.provider = provider
+        self._subscribers: Dict[str, Set[QuoteSubscriber]] = {}
+        self._last: Dict[str, Event] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._polls = 0
+        self._published = 0
+        self._last_poll: Optional[float] = None
+
+    def subscribe(self, symbols: List[str]) -> QuoteSubscriber:
+        """
+        Subscribe to symbols, starting the poll loop if needed.
+
+        The latest known event of each symbol is delivered right away.
+        """
+        subscriber = QuoteSubscriber(symbols)
+        for symbol in symbols:
+            self._subscribers.setdefault(symbol, set()).add(subscriber)
+            if symbol in self._last:
+                subscriber.push(symbol, self._last[symbol])
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+        return subscriber
+
+    def unsubscribe(self, subscriber: QuoteSubscriber) -> None:
+        """Remove a subscriber; symbols nobody follows stop being polled."""
+        for symbol in subscriber.symbols:
+            subscribers = self._subscribers.get(symbol)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[symbol]
+                self._last.pop(symbol, None)
+
+    async def stream(self, symbols: List[str]) -> AsyncIterator[List[Event]]:
+        """
+        Subscribe for the lifetime of the iterator.
+
+        Yields batches of events; an empty batch after QUOTE_STREAM_HEARTBEAT
+        seconds without updates, so callers can keep the connection alive.
+        """
+        subscriber = self.subscribe(symbols)
+        try:
+            while True:
+                yield await subscriber.next_events(settings.QUOTE_STREAM_HEARTBEAT)
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def _loop(self) -> None:
+        """Poll until there are no subscribers left."""
+        while self._subscribers:
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Quote stream poll failed")
+            await asyncio.sleep(self.interval)
+        self._task = None
+
+    async def poll(self) -> int:
+        """
+        Fetch every subscribed symbol once and publish what changed.
+
+        Returns:
+            Number of symbols published
+        """
+        symbols = list(self._subscribers)
+        if not symbols:
+            return 0
+        quotes, errors = await get_openbb_service().get_equity_quotes(symbols, self.provider)
+        self._polls += 1
+        self._last_poll = time.time()
+
+        published = 0
+        for symbol in symbols:
+            # Dropped while the fetch was in flight; keep no state for it
+            if symbol not in self._subscribers:
+                continue
+            if symbol in quotes:
+                event: Event = ("quote", quotes[symbol])
+            else:
+                event = ("error", {"symbol": symbol, "error": errors.get(symbol, "Not found")})
+            if not self._changed(self._last.get(symbol), event):
+                continue
+            self._last[symbol] = event
+            for subscriber in self._subscribers.get(symbol, ()):
+                subscriber.push(symbol, event)
+            published += 1
+        self._published += published
+        return published
+
+    @staticmethod
+    def _changed(previous: Optional[Event], event: Event) -> bool:
+        """A quote is new if its price moved; an error only if the last event was not one."""
+        if previous is None or previous[0] != event[0]:
+            return True
+        if event[0] == "quote":
+            return previous[1].get("price") != event[1].get("price")
+        return False
+
+    async def close(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscription and polling counters."""
+        return {
+            "symbols": len(self._subscribers),
+            "subscriptions": sum(len(s) for s in self._subscribers.values()),
+            "polls": self._polls,
+            "published": self._published,
+            "last_poll": datetime.fromtimestamp(self._last_poll) if self._last_poll else None,
+        }
+
+
+# Global hub instance
+_quote_hub: Optional[QuoteHub] = None
+
+
+def get_quote_hub() -> QuoteHub:
+    """Get or create the quote hub."""
+    global _quote_hub
+    if _quote_hub is None:
+        _quote_hub = QuoteHub(interval=settings.QUOTE_STREAM_INTERVAL)
+    return _quote_hub
+
+
+async def shutdown_quote_hub() -> None:
+    """Stop the hub's poll loop, if it was ever created."""
+    if _quote_hub is not None:
+        await _quote_hub.close()
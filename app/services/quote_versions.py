@@ -0,0 +1,139 @@
+"""
+Quote versions for delta responses.
+
+A quote's version is a short hash of its content (fetch timestamps
+excluded), so every worker derives the same version for the same data.
+The last few versions of each symbol are kept, and a client that sends
+back the version it holds gets only the fields that changed since then,
+or an unchanged marker, instead of the full quote. Endpoints returning
+differently shaped quotes for the same symbol keep separate histories
+under their own scope.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from cachetools import LRUCache
+
+from app.config import settings
+from app.responses import dumps
+
+# Fields that change on every fetch and are left out of versions and deltas
+VOLATILE_FIELDS = frozenset({"last_updated", "version"})
+
+
+class QuoteVersionStore:
+    """Bounded per-symbol history of quote versions."""
+
+    def __init__(self, max_symbols: int = 5000, history: int = 8):
+        """
+        Initialize store.
+
+        Args:
+            max_symbols: Symbols tracked (least recently used are dropped)
+            history: Versions kept per symbol
+        """
+        self.history = history
+        self._versions: LRUCache = LRUCache(maxsize=max_symbols)
+
+    @staticmethod
+    def version_of(quote: Dict[str, Any]) -> str:
+        """Content hash of a quote, ignoring volatile fields."""
+        content = {k: v for k, v in sorted(quote.items()) if k not in VOLATILE_FIELDS}
+        return hashlib.blake2b(dumps(content), digest_size=8).hexdigest()
+
+    @staticmethod
+    def _key(symbol: str, scope: str) -> str:
+        """History key of a symbol within a scope."""
+        return f"{scope}:{symbol.upper()}" if scope else symbol.upper()
+
+    def record(self, symbol: str, quote: Dict[str, Any], scope: str = "") -> str:
+        """
+        Remember a quote as the latest version of a symbol.
+
+        Args:
+            symbol: Symbol (case-insensitive)
+            quote: Sanitized, unfiltered quote
+            scope: Payload shape the history belongs to (e.g. "crypto")
+
+        Returns:
+            The quote's version
+        """
+        key = self._key(symbol, scope)
+        version = self.version_of(quote)
+        versions = self._versions.get(key)
+        if versions is None:
+            versions = self._versions[key] = OrderedDict()
+        versions[version] = {k: v for k, v in quote.items() if k not in VOLATILE_FIELDS}
+        versions.move_to_end(version)
+        while len(versions) > self.history:
+            versions.popitem(last=False)
+        return version
+
+    def delta(
+        self,
+        symbol: str,
+        quote: Dict[str, Any],
+        since: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        scope: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Record a quote and describe it relative to a client's version.
+
+        Args:
+            symbol: Symbol (case-insensitive)
+            quote: Sanitized, unfiltered quote
+            since: Version the client holds
+            fields: Only report these fields (default: all)
+            scope: Payload shape the history belongs to (e.g. "crypto")
+
+        Returns:
+            `{"symbol", "version", "unchanged": True}` if the client is
+            current; `{"symbol", "version", "since", "changes"}` if `since`
+            is still in the history; otherwise the full quote plus
+            `version`. Fields dropped since `since` appear as null.
+        """
+        version = self.record(symbol, quote, scope)
+        wanted = None if fields is None else set(fields)
+
+        if since == version:
+            return {"symbol": symbol, "version": version, "unchanged": True}
+
+        versions = self._versions.get(self._key(symbol, scope))
+        base = versions.get(since) if versions is not None and since else None
+        if base is None:
+            full = quote if wanted is None else {k: v for k, v in quote.items() if k in wanted}
+            return {**full, "version": version}
+
+        changes = {
+            k: v for k, v in quote.items()
+            if k not in VOLATILE_FIELDS and base.get(k, None) != v
+        }
+        changes.update({k: None for k in base if k not in quote})
+        if wanted is not None:
+            changes = {k: v for k, v in changes.items() if k in wanted}
+        return {"symbol": symbol, "version": version, "since": since, "changes": changes}
+
+    def stats(self) -> Dict[str, Any]:
+        """Tracked symbols and configuration."""
+        return {
+            "symbols": len(self._versions),
+            "max_symbols": self._versions.maxsize,
+            "history": self.history,
+        }
+
+
+# Global store instance
+_quote_versions: Optional[QuoteVersionStore] = None
+
+
+def get_quote_version_store() -> QuoteVersionStore:
+    """Get or create the quote version store."""
+    global _quote_versions
+    if _quote_versions is None:
+        _quote_versions = QuoteVersionStore(
+            max_symbols=settings.QUOTE_VERSION_MAX_SYMBOLS,
+            history=settings.QUOTE_VERSION_HISTORY
+        )
+    return _quote_versions
@@ -0,0 +1,95 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight upstream
+call instead of each triggering their own.
+"""
+import asyncio
+import copy
+import inspect
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one shared task."""
+
+    def __init__(self):
+        """Initialize single-flight group."""
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `func` once for all concurrent callers of `key`.
+
+        The shared call runs as its own task, so a caller that is cancelled
+        (e.g. by a timeout) does not cancel it for everyone else.
+
+        Args:
+            key: Hashable call identity
+            func: Zero-argument coroutine factory performing the call
+
+        Returns:
+            The call result (shallow-copied for coalesced callers)
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return copy.copy(await asyncio.shield(task))
+
+        self.calls += 1
+        task = asyncio.ensure_future(func())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._on_done(key, t))
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished call."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert call arguments into a hashable key component."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def single_flight(method: Callable) -> Callable:
+    """
+    Decorator coalescing identical concurrent calls of a service method.
+
+    The key is the method name plus its bound arguments (defaults applied),
+    so `quote("AAPL")` and `quote(symbol="AAPL")` share one call. The
+    instance must expose a `_single_flight` SingleFlight attribute.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())[1:]
+        key = (method.__name__, _freeze(arguments))
+        return await self._single_flight.do(
+            key,
+            lambda: method(self, *args, **kwargs)
+        )
+
+    return wrapper
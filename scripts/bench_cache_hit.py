@@ -0,0 +1,107 @@
+"""
+Micro-benchmark: CacheMiddleware hit-path latency.
+
+Usage:
+    python -m scripts.bench_cache_hit [--rows N] [--requests N]
+
+Builds a throwaway app with the production middleware order (GZip inside
+CacheMiddleware) and a historical-style route, warms the cache, then
+drives raw ASGI GET requests through it with and without gzip.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+
+from app.config import settings
+from app.middleware import CacheMiddleware
+
+PATH = f"{settings.API_PREFIX}/yfinance/historical"
+
+
+def build_app(rows: int) -> FastAPI:
+    """App serving a fixed OHLCV payload of `rows` bars."""
+    start = datetime(2015, 1, 2)
+    payload = {
+        "data": [
+            {
+                "date": (start + timedelta(days=i)).isoformat(),
+                "open": 100.0 + i,
+                "high": 101.0 + i,
+                "low": 99.0 + i,
+                "close": 100.5 + i,
+                "volume": 1_000_000 + i,
+            }
+            for i in range(rows)
+        ],
+        "pagination": {"page": 1, "limit": rows, "total": rows},
+    }
+
+    app = FastAPI()
+
+    @app.get(PATH)
+    async def historical():
+        return payload
+
+    app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MIN_SIZE)
+    app.add_middleware(CacheMiddleware, cache_get_requests=True)
+    return app
+
+
+async def request(app: FastAPI, accept_encoding: bytes) -> dict:
+    """Send one GET through the ASGI app; return status and headers."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": PATH,
+        "raw_path": PATH.encode(),
+        "query_string": b"symbol=AAPL&start_date=2015-01-01&end_date=2020-01-01",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", accept_encoding)],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    result = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = dict(message["headers"])
+
+    await app(scope, receive, send)
+    return result
+
+
+async def run(rows: int, requests: int) -> None:
+    """Warm the cache and time hits for each encoding."""
+    app = build_app(rows)
+    print(f"{'accept-encoding':<18}{'x-cache':>10}{'us/request':>14}")
+    for encoding in (b"identity", b"gzip"):
+        await request(app, encoding)  # warm
+        result = await request(app, encoding)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await request(app, encoding)
+        elapsed = time.perf_counter() - start
+        x_cache = result["headers"].get(b"x-cache", b"-").decode()
+        print(f"{encoding.decode():<18}{x_cache:>10}{elapsed / requests * 1e6:>14.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark: JSON encode throughput, stdlib path vs. orjson.
+
+Usage:
+    python -m scripts.bench_json_encode [--rows-historical N] [--rows-options N]
+
+Encodes extracted historical and options payloads the way routes used to
+(`sanitize_for_mobile` per record, `jsonable_encoder`, then Starlette's
+`json.dumps`) and with `app.responses.dumps`.
+"""
+import argparse
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from app.responses import dumps
+from app.services.data_transformer import DataTransformer
+from app.services.frame_extractor import (
+    extract_records,
+    HISTORICAL_SPECS,
+    OPTIONS_SPECS,
+)
+from scripts.bench_extraction import best_of, make_historical, make_options
+
+
+def legacy_encode(records: list) -> bytes:
+    """Pre-orjson route path: sanitize, jsonable_encoder, stdlib json."""
+    content = jsonable_encoder([DataTransformer.sanitize_for_mobile(item) for item in records])
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows-historical", type=int, default=2520)  # ~10y daily
+    parser.add_argument("--rows-options", type=int, default=20000)  # large chain
+    args = parser.parse_args()
+
+    cases = [
+        ("historical", extract_records(make_historical(args.rows_historical), HISTORICAL_SPECS)),
+        ("options", extract_records(make_options(args.rows_options), OPTIONS_SPECS)),
+    ]
+    print(f"{'case':<12}{'rows':>8}{'KB':>8}{'stdlib ms':>12}{'orjson ms':>12}"
+          f"{'orjson MB/s':>14}{'speedup':>10}")
+    for name, records in cases:
+        assert json.loads(legacy_encode(records)) == json.loads(dumps(records))
+        size = len(dumps(records))
+        old = best_of(lambda: legacy_encode(records))
+        new = best_of(lambda: dumps(records))
+        print(f"{name:<12}{len(records):>8}{size / 1024:>8.0f}{old * 1e3:>12.1f}{new * 1e3:>12.2f}"
+              f"{size / new / 1e6:>14.0f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
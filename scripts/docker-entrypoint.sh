@@ -0,0 +1,12 @@
+#!/bin/sh
+# OpenBB Mobile API - Docker entrypoint
+# Workers write Prometheus samples to PROMETHEUS_MULTIPROC_DIR and /metrics
+# aggregates them; files left by a previous container run are cleared first.
+set -e
+
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+exec "$@"
@@ -19,6 +19,12 @@ pkill -f "uvicorn app.main:app" || echo "Çalışan süreç bulunamadı."
 # Log dizini oluştur
 mkdir -p logs
 
+# Prometheus metrikleri: worker'lar örneklerini bu dizine yazar, /metrics hepsini toplar.
+# Eski süreçlerin dosyaları her başlangıçta temizlenir.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-$(pwd)/data/metrics}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
 # API'yi nohup ile arka planda başlat
 echo "API arka planda başlatılıyor (Port 8007)..."
 nohup venv/bin/python3 -m uvicorn app.main:app --host 0.0.0.0 --port 8007 --workers 4 > logs/api.log 2>&1 &
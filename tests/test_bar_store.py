@@ -0,0 +1,112 @@
+"""Tests for the incremental bar store's gap fetching."""
+from datetime import date
+
+import pandas as pd
+import pytest
+import pytest_asyncio
+
+from app.config import settings
+from app.services import bar_store
+from app.services.bar_store import BarStore
+
+pytestmark = pytest.mark.asyncio
+
+KEY = ("AAPL", "yfinance")
+
+
+class EmptyDataError(Exception):
+    """Stand-in for the provider's "no data" error (matched by class name)."""
+
+
+def bars(start: str, end: str) -> pd.DataFrame:
+    index = pd.bdate_range(start, end)
+    return pd.DataFrame(
+        {"open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 100.0},
+        index=index
+    )
+
+
+class Upstream:
+    """Gap fetcher recording its calls; fails windows ending in `failing` months."""
+
+    def __init__(self):
+        self.calls = []
+        self.failing = set()
+
+    async def __call__(self, start_date: str, end_date: str) -> pd.DataFrame:
+        self.calls.append((start_date, end_date))
+        if date.fromisoformat(end_date).month in self.failing:
+            raise ConnectionError("upstream timeout")
+        return bars(start_date, end_date)
+
+
+@pytest_asyncio.fixture
+async def store(tmp_path):
+    store = BarStore(directory=str(tmp_path))
+    # Mid-August already held, so August and September are separate gaps
+    await store.get_range("AAPL", "yfinance", "2024-08-10", "2024-08-20", Upstream())
+    return store
+
+
+async def test_failed_gap_fails_the_request(store):
+    upstream = Upstream()
+    upstream.failing = {8}
+
+    with pytest.raises(ConnectionError):
+        await store.get_range("AAPL", "yfinance", "2024-08-01", "2024-09-30", upstream)
+
+    assert upstream.calls == [("2024-08-01", "2024-08-09"), ("2024-08-21", "2024-09-30")]
+
+
+async def test_failed_gap_is_retried_and_succeeded_gaps_are_kept(store, tmp_path):
+    upstream = Upstream()
+    upstream.failing = {8}
+    with pytest.raises(ConnectionError):
+        await store.get_range("AAPL", "yfinance", "2024-08-01", "2024-09-30", upstream)
+    assert not store.covers("AAPL", "yfinance", "2024-08-01", "2024-09-30")
+
+    # The succeeded gap was persisted; a fresh worker sees it, not the failed one
+    stored = BarStore(directory=str(tmp_path))._files.load(KEY)
+    assert stored.missing(date(2024, 8, 1), date(2024, 9, 30)) == [(date(2024, 8, 1), date(2024, 8, 9))]
+
+    # Once upstream recovers, only the failed gap is fetched again
+    upstream.failing = set()
+    upstream.calls.clear()
+    df = await store.get_range("AAPL", "yfinance", "2024-08-01", "2024-09-30", upstream)
+
+    assert upstream.calls == [("2024-08-01", "2024-08-09")]
+    assert len(df) == len(pd.bdate_range("2024-08-01", "2024-09-30"))
+    assert store.covers("AAPL", "yfinance", "2024-08-01", "2024-09-30")
+
+
+async def test_empty_gap_is_covered(store):
+    calls = []
+
+    async def fetch(start_date: str, end_date: str) -> pd.DataFrame:
+        calls.append((start_date, end_date))
+        raise EmptyDataError("no data")
+
+    for _ in range(2):
+        df = await store.get_range("AAPL", "yfinance", "2024-07-06", "2024-07-07", fetch)
+        assert df.empty
+
+    # Widened to BAR_STORE_MIN_FETCH_DAYS, and not refetched once covered
+    assert calls == [("2024-07-03", "2024-07-07")]
+
+
+@pytest.mark.parametrize("lag, last_covered", [(1, date(2024, 9, 10)), (2, date(2024, 9, 9))])
+async def test_only_days_before_the_utc_cutoff_are_final(tmp_path, monkeypatch, lag, last_covered):
+    monkeypatch.setattr(bar_store, "_utc_today", lambda: date(2024, 9, 11))
+    monkeypatch.setattr(settings, "BAR_STORE_FINAL_LAG_DAYS", lag)
+    store = BarStore(directory=str(tmp_path))
+    upstream = Upstream()
+
+    df = await store.get_range("AAPL", "yfinance", "2024-09-02", "2024-09-11", upstream)
+
+    assert len(df) == len(pd.bdate_range("2024-09-02", "2024-09-11"))
+    assert store._series[KEY].intervals == [(date(2024, 9, 2), last_covered)]
+
+    # Days after the cutoff may still be an open session: fetched again
+    upstream.calls.clear()
+    await store.get_range("AAPL", "yfinance", "2024-09-02", "2024-09-11", upstream)
+    assert upstream.calls == [("2024-09-07", "2024-09-11")]
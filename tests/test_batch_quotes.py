@@ -0,0 +1,101 @@
+"""Tests for multi-symbol batch quotes: chunking, retries, timeouts and errors."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routers.equity import router
+from app.services.openbb_service import OpenBBService, get_openbb_service
+
+
+class FakeOBB:
+    """
+    Multi-symbol `equity.price.quote` SDK call.
+
+    Fails any call including BAD, stalls on SLOW and leaves GONE out of
+    its result, like a provider that does not know the symbol.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.equity = SimpleNamespace(price=SimpleNamespace(quote=self.quote))
+
+    def quote(self, symbol: str, provider: str) -> pd.DataFrame:
+        symbols = symbol.split(",")
+        self.calls.append(symbols)
+        if "BAD" in symbols:
+            raise ConnectionError("upstream rejected BAD")
+        if "SLOW" in symbols:
+            time.sleep(0.3)
+        return pd.DataFrame([
+            {"symbol": s, "price": 100.0, "change": 1.0, "change_percent": 1.0}
+            for s in symbols if s != "GONE"
+        ])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "BAR_STORE_DIR", "")
+    monkeypatch.setattr(settings, "BATCH_QUOTE_CHUNK_SIZE", 2)
+    monkeypatch.setattr(OpenBBService, "_initialize_openbb", lambda self: None)
+    service = OpenBBService()
+    service._obb = FakeOBB()
+    yield service
+    for executor in service._executors.values():
+        executor.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_symbols_are_fetched_in_chunks(service):
+    quotes, errors = await service.get_equity_quotes(["AAPL", "MSFT", "TSLA"])
+
+    assert sorted(service._obb.calls) == [["AAPL", "MSFT"], ["TSLA"]]
+    assert sorted(quotes) == ["AAPL", "MSFT", "TSLA"]
+    assert errors == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_retried_symbol_by_symbol(service):
+    quotes, errors = await service.get_equity_quotes(["AAPL", "BAD", "MSFT", "TSLA"])
+
+    assert sorted(service._obb.calls) == [["AAPL"], ["AAPL", "BAD"], ["BAD"], ["MSFT", "TSLA"]]
+    assert sorted(quotes) == ["AAPL", "MSFT", "TSLA"]
+    assert list(errors) == ["BAD"]
+    assert "upstream rejected BAD" in errors["BAD"]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_chunk_fails_its_symbols(service, monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_QUOTE_TIMEOUT", 0.1)
+
+    quotes, errors = await service.get_equity_quotes(["SLOW", "AAPL", "MSFT"])
+
+    assert errors == dict.fromkeys(["SLOW", "AAPL"], "Timed out after 0.1s")
+    assert list(quotes) == ["MSFT"]
+    await asyncio.sleep(0.3)  # let the stalled call finish before the loop closes
+
+
+def test_batch_route_reports_missing_and_deduplicates(service):
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_openbb_service] = lambda: service
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/yfinance/batch/quotes",
+            json={"symbols": ["AAPL", "GONE", "AAPL", "BAD"]}
+        )
+
+    body = response.json()
+    assert response.status_code == 200
+    assert sorted(service._obb.calls) == [["AAPL", "GONE"], ["BAD"]]
+    assert list(body["data"]) == ["AAPL"]
+    assert body["data"]["AAPL"]["price"] == 100.0
+    assert body["errors"]["GONE"] == "Not found"
+    assert "upstream rejected BAD" in body["errors"]["BAD"]
+    assert (body["success_count"], body["error_count"]) == (1, 2)
@@ -0,0 +1,314 @@
+"""Tests for the Redis, disk and tiered cache backends (Redis on an in-memory fake client)."""
+import fnmatch
+import time
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.middleware import cache_backends
+from app.middleware.cache import SimpleCache
+from app.middleware.cache_backends import (
+    LEASE_KEY_PREFIX,
+    DiskCacheBackend,
+    RedisCacheBackend,
+    TieredCacheBackend
+)
+from app.middleware.cache_entry import CACHE_KEY_PREFIX, CacheEntry
+
+pytestmark = pytest.mark.asyncio
+
+KEY = f"{CACHE_KEY_PREFIX}/api/v2/mobile/yfinance/quote?symbol=AAPL"
+
+
+class FakeRedis:
+    """The subset of the redis.asyncio client used by RedisCacheBackend."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise RedisConnectionError("connection refused")
+
+    async def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        self._check()
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        self.ttls[key] = ex
+        return True
+
+    async def expire(self, key, seconds):
+        self._check()
+        if key not in self.data:
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    async def delete(self, key):
+        self._check()
+        self.data.pop(key, None)
+
+    async def scan_iter(self, match="*"):
+        self._check()
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key
+
+    async def aclose(self):
+        pass
+
+
+def make_entry(body: bytes = b'{"symbol":"AAPL","price":100.0}', ttl: float = 60) -> CacheEntry:
+    return CacheEntry.build(body, {"content-type": "application/json"}, time.time(), ttl, stale_ttl=30)
+
+
+class Clock:
+    """Settable stand-in for the backends' time module."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def client():
+    return FakeRedis()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(
+        cache_backends, "time", SimpleNamespace(time=clock.time, monotonic=time.monotonic)
+    )
+    return clock
+
+
+@pytest.fixture
+def redis_backend(client):
+    return RedisCacheBackend(client=client, retry_interval=60)
+
+
+async def test_redis_get_set_delete(client, redis_backend):
+    entry = make_entry()
+
+    assert await redis_backend.get(KEY) is None
+    await redis_backend.set(KEY, entry, ttl=90)
+    assert client.ttls[KEY] == 90
+
+    cached = await redis_backend.get(KEY)
+    assert cached.body == entry.body
+    assert cached.etag == entry.etag
+    assert cached.headers == entry.headers
+
+    await redis_backend.delete(KEY)
+    assert KEY not in client.data
+    assert await redis_backend.get(KEY) is None
+
+
+async def test_redis_clear_only_removes_own_keys(client, redis_backend):
+    await redis_backend.set(KEY, make_entry())
+    client.data["other:key"] = b"kept"
+
+    await redis_backend.clear()
+
+    assert client.data == {"other:key": b"kept"}
+
+
+@pytest.mark.parametrize("raw", [b'{"symbol": "AAPL"}', b"\x00\x01garbage"])
+async def test_redis_undecodable_value_is_a_miss_and_deleted(client, redis_backend, raw):
+    client.data[KEY] = raw
+
+    assert await redis_backend.get(KEY) is None
+    assert KEY not in client.data
+    assert redis_backend.available
+
+
+async def test_redis_error_marks_backend_down(client, redis_backend):
+    client.down = True
+
+    assert await redis_backend.get(KEY) is None
+    assert not redis_backend.available
+
+    # Backing off: the client is not called until the retry interval passes
+    client.down = False
+    await redis_backend.set(KEY, make_entry())
+    assert KEY not in client.data
+
+
+async def test_tiered_get_set_delete(client, redis_backend):
+    l1 = SimpleCache()
+    tiered = TieredCacheBackend(l1, redis_backend, l1_max_ttl=5)
+    entry = make_entry()
+
+    await tiered.set(KEY, entry, ttl=90)
+    assert (await l1.get(KEY)).body == entry.body
+    assert client.ttls[KEY] == 90
+
+    # An L1 miss is filled from L2
+    await l1.delete(KEY)
+    assert (await tiered.get(KEY)).body == entry.body
+    assert (await l1.get(KEY)).body == entry.body
+
+    await tiered.delete(KEY)
+    assert await l1.get(KEY) is None
+    assert KEY not in client.data
+    assert await tiered.get(KEY) is None
+
+
+async def test_tiered_falls_back_to_l1_while_l2_is_down(client, redis_backend):
+    l1 = SimpleCache()
+    tiered = TieredCacheBackend(l1, redis_backend, l1_max_ttl=5)
+    client.down = True
+
+    # The first error marks L2 down; reads and writes keep working on L1
+    assert await tiered.get(KEY) is None
+    assert not redis_backend.available
+
+    entry = make_entry()
+    await tiered.set(KEY, entry, ttl=90)
+    assert KEY not in client.data
+    assert (await tiered.get(KEY)).body == entry.body
+
+    # With L2 down, the L1 copy takes the entry's full TTL, not l1_max_ttl
+    expires_at, _ = l1._cache[KEY]
+    assert expires_at - time.time() > 5
+
+
+async def test_tiered_undecodable_l2_value_is_a_miss(client, redis_backend):
+    tiered = TieredCacheBackend(SimpleCache(), redis_backend)
+    client.data[KEY] = b"not an entry"
+
+    assert await tiered.get(KEY) is None
+    assert KEY not in client.data
+
+
+async def test_redis_lease_is_held_by_one_owner(client, redis_backend):
+    lease = f"{LEASE_KEY_PREFIX}warm:job"
+
+    assert await redis_backend.acquire_lease("warm:job", "worker-a", ttl=60)
+    assert not await redis_backend.acquire_lease("warm:job", "worker-b", ttl=60)
+    assert await redis_backend.acquire_lease("warm:job", "worker-a", ttl=90)
+    assert client.ttls[lease] == 90
+
+    # Clearing the cache leaves leases alone
+    await redis_backend.clear()
+    assert lease in client.data
+
+    # While Redis is down every worker warms its own L1
+    client.down = True
+    assert await redis_backend.acquire_lease("warm:job", "worker-b", ttl=60)
+
+
+async def test_disk_lease_is_held_by_one_owner(tmp_path):
+    path = str(tmp_path / "cache.db")
+    a = DiskCacheBackend(path=path, compact_interval=0)
+    b = DiskCacheBackend(path=path, compact_interval=0)
+
+    assert await a.acquire_lease("warm:job", "worker-a", ttl=60)
+    assert not await b.acquire_lease("warm:job", "worker-b", ttl=60)
+    assert await a.acquire_lease("warm:job", "worker-a", ttl=60)
+    assert await b.acquire_lease("warm:other", "worker-b", ttl=60)
+
+    # A lapsed lease goes to the next worker asking for it
+    assert await a.acquire_lease("warm:short", "worker-a", ttl=0)
+    assert await b.acquire_lease("warm:short", "worker-b", ttl=60)
+    assert not await a.acquire_lease("warm:short", "worker-a", ttl=60)
+
+    await a.clear()
+    assert not await b.acquire_lease("warm:job", "worker-b", ttl=60)
+    await a.close()
+    await b.close()
+
+
+async def test_disk_round_trip_across_workers(tmp_path):
+    path = str(tmp_path / "cache" / "cache.db")
+    writer = DiskCacheBackend(path=path, compact_interval=0)
+    reader = DiskCacheBackend(path=path, compact_interval=0)
+    entry = make_entry()
+
+    await writer.set(KEY, entry, ttl=60)
+    cached = await reader.get(KEY)
+    assert cached.body == entry.body
+    assert cached.etag == entry.etag
+    assert cached.headers == entry.headers
+
+    await reader.delete(KEY)
+    assert await writer.get(KEY) is None
+
+    await writer.set(KEY, entry, ttl=60)
+    await reader.clear()
+    assert await writer.get(KEY) is None
+    await writer.close()
+    await reader.close()
+
+
+async def test_disk_entries_expire_and_are_compacted(tmp_path, clock):
+    backend = DiskCacheBackend(path=str(tmp_path / "cache.db"), compact_interval=0)
+    await backend.set(KEY, make_entry(), ttl=60)
+    await backend.set(f"{KEY}2", make_entry(), ttl=120)
+
+    clock.now += 59
+    assert await backend.get(KEY) is not None
+    clock.now += 1
+    assert await backend.get(KEY) is None
+
+    await backend.compact()
+    assert (backend.stats()["entries"], backend.stats()["expired_removed"]) == (1, 1)
+    assert await backend.get(f"{KEY}2") is not None
+    await backend.close()
+
+
+async def test_disk_compaction_evicts_entries_closest_to_expiry(tmp_path):
+    entry = make_entry()
+    size = len(f"{KEY}0") + len(entry.to_bytes())
+    backend = DiskCacheBackend(
+        path=str(tmp_path / "cache.db"), max_bytes=2 * size + size // 2, compact_interval=0
+    )
+    for i, ttl in enumerate((300, 60, 600)):
+        await backend.set(f"{KEY}{i}", entry, ttl=ttl)
+
+    await backend.compact()
+
+    assert await backend.get(f"{KEY}1") is None
+    assert all([await backend.get(f"{KEY}{i}") for i in (0, 2)])
+    assert (backend.stats()["entries"], backend.stats()["evicted"]) == (2, 1)
+    await backend.close()
+
+
+async def test_disk_unusable_path_is_a_miss(tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    backend = DiskCacheBackend(path=str(blocker / "cache.db"), compact_interval=0)
+
+    await backend.set(KEY, make_entry(), ttl=60)
+    assert await backend.get(KEY) is None
+    await backend.close()
+
+
+async def test_simple_cache_is_bounded_by_bytes():
+    entry_size = make_entry().size
+    l1 = SimpleCache(maxsize=100, max_bytes=3 * entry_size)
+    for i in range(4):
+        await l1.set(f"{KEY}{i}", make_entry(), ttl=60)
+
+    # The least recently used entry made room for the fourth
+    assert await l1.get(f"{KEY}0") is None
+    assert all([await l1.get(f"{KEY}{i}") for i in (1, 2, 3)])
+    assert l1.stats()["bytes"] == 3 * entry_size
+
+    # An entry over the whole budget is not stored, and drops the old value
+    await l1.set(f"{KEY}1", make_entry(body=b"x" * 4 * entry_size), ttl=60)
+    assert await l1.get(f"{KEY}1") is None
+    assert l1.stats()["entries"] == 2
+
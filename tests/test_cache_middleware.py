@@ -0,0 +1,135 @@
+"""Tests for CacheMiddleware in front of a stubbed quote route."""
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.middleware import cache
+from app.middleware.cache import CacheMiddleware, SimpleCache
+
+QUOTE = f"{settings.API_PREFIX}/yfinance/quote"
+AAPL = {"symbol": "AAPL"}
+
+
+class Clock:
+    """Settable stand-in for the middleware's time module."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class QuoteService:
+    """Stub upstream quoting a new price on every call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def quote(self, symbol: str) -> dict:
+        self.calls += 1
+        return {"symbol": symbol, "price": 100.0 + self.calls}
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    """Wait (in real time) for a background refresh to land."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "background refresh did not run"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def service():
+    return QuoteService()
+
+
+@pytest.fixture
+def client(monkeypatch, clock, service):
+    monkeypatch.setattr(cache, "_cache", SimpleCache())
+    app = FastAPI()
+    app.add_middleware(CacheMiddleware)
+
+    @app.get(QUOTE)
+    async def quote(symbol: str):
+        return service.quote(symbol)
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_miss_then_hit_then_not_modified(client, service):
+    miss = client.get(QUOTE, params=AAPL)
+    assert miss.headers["X-Cache"] == "MISS"
+    assert miss.json() == {"symbol": "AAPL", "price": 101.0}
+
+    hit = client.get(QUOTE, params=AAPL)
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.content == miss.content
+    assert hit.headers["ETag"] == miss.headers["ETag"]
+    assert service.calls == 1
+
+    not_modified = client.get(QUOTE, params=AAPL, headers={"If-None-Match": miss.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == miss.headers["ETag"]
+
+    changed = client.get(QUOTE, params=AAPL, headers={"If-None-Match": '"another-version"'})
+    assert changed.status_code == 200
+    assert service.calls == 1
+
+
+def test_query_params_are_part_of_the_key(client, service):
+    client.get(QUOTE, params=AAPL)
+    msft = client.get(QUOTE, params={"symbol": "MSFT"})
+
+    assert msft.headers["X-Cache"] == "MISS"
+    assert service.calls == 2
+
+
+def test_stale_entry_is_served_while_refreshed(client, service, clock):
+    ttl = settings.CACHE_TTL_QUOTE
+    stale_ttl = min(int(ttl * settings.CACHE_STALE_RATIO), settings.CACHE_STALE_MAX)
+    client.get(QUOTE, params=AAPL)
+
+    clock.now += ttl
+    stale = client.get(QUOTE, params=AAPL)
+    assert stale.headers["X-Cache"] == "STALE"
+    assert stale.json()["price"] == 101.0
+
+    # One background replay refreshes the entry; the next request is a hit
+    wait_for(lambda: any(b"102.0" in item[1].body for item in cache._cache._cache.values()))
+    assert service.calls == 2
+    hit = client.get(QUOTE, params=AAPL)
+    assert hit.headers["X-Cache"] == "HIT"
+    assert hit.json()["price"] == 102.0
+
+    # Past the stale window the entry is gone: a normal miss
+    clock.now += ttl + stale_ttl
+    miss = client.get(QUOTE, params=AAPL)
+    assert miss.headers["X-Cache"] == "MISS"
+    assert miss.json()["price"] == 103.0
+
+
+def test_entry_over_the_route_limit_is_served_but_not_stored(client, service, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_MAX_ENTRY_BYTES", 64)
+
+    first = client.get(QUOTE, params=AAPL)
+    second = client.get(QUOTE, params=AAPL)
+
+    assert first.json() == {"symbol": "AAPL", "price": 101.0}
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "MISS")
+    assert service.calls == 2
+    assert cache._cache.stats()["entries"] == 0
+
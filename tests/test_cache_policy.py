@@ -0,0 +1,41 @@
+"""Tests for per-route cache TTLs."""
+from datetime import date
+
+import pytest
+
+from app.config import settings
+from app.middleware.cache_policy import get_cache_policy
+from app.services import bar_store
+
+PATH = f"{settings.API_PREFIX}/yfinance/crypto/historical"
+
+
+@pytest.fixture(autouse=True)
+def utc_today(monkeypatch):
+    # 21:30 UTC on 2024-09-10: already 2024-09-11 on a UTC+3 host
+    monkeypatch.setattr(bar_store, "_utc_today", lambda: date(2024, 9, 10))
+
+
+@pytest.mark.parametrize("end_date, ttl_setting", [
+    ("2024-09-09", "CACHE_TTL_HISTORICAL_CLOSED"),
+    ("2024-09-10", "CACHE_TTL_HISTORICAL"),
+    ("2024-09-11", "CACHE_TTL_HISTORICAL"),
+    ("not-a-date", "CACHE_TTL_HISTORICAL"),
+])
+def test_closed_range_ttl_follows_the_bar_store_cutoff(end_date, ttl_setting):
+    ttl = get_cache_policy().ttl_for(PATH, {"end_date": end_date})
+
+    assert ttl == getattr(settings, ttl_setting)
+
+
+def test_lag_setting_moves_the_cutoff(monkeypatch):
+    monkeypatch.setattr(settings, "BAR_STORE_FINAL_LAG_DAYS", 2)
+
+    assert get_cache_policy().ttl_for(PATH, {"end_date": "2024-09-09"}) == settings.CACHE_TTL_HISTORICAL
+
+
+def test_uncached_and_default_routes():
+    policy = get_cache_policy()
+
+    assert policy.ttl_for("/health", {}) == 0
+    assert policy.ttl_for(f"{settings.API_PREFIX}/yfinance/quote", {}) == settings.CACHE_TTL_QUOTE
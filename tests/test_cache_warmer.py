@@ -0,0 +1,180 @@
+"""Tests for the cache warmer and hot key prewarmer schedules."""
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.config import settings
+from app.middleware import cache_warmer, metrics
+from app.middleware.cache import SimpleCache, refresh_cached_route
+from app.middleware.cache_backends import DiskCacheBackend
+from app.middleware.cache_entry import CacheEntry
+from app.middleware.cache_warmer import CacheWarmer, HotKeyPrewarmer, WarmJob
+from app.middleware.hot_keys import HotKeyTracker
+from app.middleware.metrics import MetricsMiddleware
+
+pytestmark = pytest.mark.asyncio
+
+PATH = f"{settings.API_PREFIX}/yfinance/quote"
+
+
+class Clock:
+    """Settable stand-in for the warmer's time module."""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self) -> float:
+        return self.now
+
+
+class Histogram:
+    """Records the label sets observed on the request histogram."""
+
+    def __init__(self):
+        self.observed = []
+
+    def labels(self, *labels):
+        self.observed.append(labels)
+        return SimpleNamespace(observe=lambda value: None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(
+        cache_warmer, "time", SimpleNamespace(time=clock.time, perf_counter=time.perf_counter)
+    )
+    return clock
+
+
+@pytest.fixture
+def refreshed(monkeypatch):
+    """Routes the warmers replay, answered with `statuses` (default 200)."""
+    routes = []
+    statuses = {}
+
+    async def refresh(app, path, query_string=""):
+        route = f"{path}?{query_string}" if query_string else path
+        routes.append(route)
+        return statuses.get(route, 200)
+
+    monkeypatch.setattr(cache_warmer, "refresh_cached_route", refresh)
+    return SimpleNamespace(routes=routes, statuses=statuses)
+
+
+def use_cache(monkeypatch, backend):
+    monkeypatch.setattr(cache_warmer, "get_cache", lambda: backend)
+    return backend
+
+
+async def test_warm_job_runs_in_one_worker_per_interval(monkeypatch, tmp_path, refreshed):
+    path = str(tmp_path / "cache.db")
+    backend = use_cache(monkeypatch, DiskCacheBackend(path=path, compact_interval=0))
+    warmer = CacheWarmer(None, {"/fed/sofr/rate": 1800})
+    (job,) = warmer.jobs
+
+    assert await warmer.run_once(job) is True
+    assert refreshed.routes == [f"{settings.API_PREFIX}/fed/sofr/rate"]
+    assert job.status()["runs"] == 1
+
+    # Another worker sharing the cache file waits out the interval
+    monkeypatch.setattr(cache_warmer, "WORKER_ID", "other-host:1:00000000")
+    assert await warmer.run_once(job) is False
+    assert len(refreshed.routes) == 1
+    assert (job.runs, job.skipped) == (1, 1)
+    await backend.close()
+
+
+async def test_warm_job_runs_in_every_worker_with_a_local_cache(monkeypatch, refreshed):
+    use_cache(monkeypatch, SimpleCache())
+    job = WarmJob("/fed/sofr/rate", 1800)
+    warmer = CacheWarmer(None, {})
+
+    for worker in ("a:1:0", "b:2:0"):
+        monkeypatch.setattr(cache_warmer, "WORKER_ID", worker)
+        assert await warmer.run_once(job) is True
+
+    assert job.runs == 2
+
+
+async def test_only_client_requests_are_timed(monkeypatch):
+    histogram = Histogram()
+    monkeypatch.setattr(metrics, "REQUEST_DURATION", histogram)
+    api = FastAPI()
+
+    @api.get(PATH)
+    async def quote(symbol: str):
+        return {"symbol": symbol}
+
+    app = MetricsMiddleware(api)
+    assert await refresh_cached_route(app, PATH, "symbol=AAPL") == 200
+    assert histogram.observed == []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get(PATH, params={"symbol": "AAPL"})
+    assert histogram.observed == [("GET", PATH, "200")]
+
+
+def hot_key(tracker: HotKeyTracker, symbol: str, requests: int = 3) -> str:
+    key = f"quote:{symbol}"
+    for _ in range(requests):
+        tracker.record(key, PATH, f"symbol={symbol}")
+    return key
+
+
+async def cache_entry(backend, clock: Clock, key: str, expires_in: float) -> None:
+    entry = CacheEntry.build(b"{}", {"content-type": "application/json"}, clock.now, expires_in)
+    await backend.set(key, entry, ttl=3600)
+
+
+async def test_prewarm_refreshes_hot_keys_about_to_expire(monkeypatch, clock, refreshed):
+    backend = use_cache(monkeypatch, SimpleCache())
+    tracker = HotKeyTracker(top_k=8)
+    prewarmer = HotKeyPrewarmer(None, tracker, top_n=4, lead=15, interval=5, min_count=3)
+    await cache_entry(backend, clock, hot_key(tracker, "AAPL"), expires_in=60)
+    await cache_entry(backend, clock, hot_key(tracker, "MSFT"), expires_in=10)
+    await cache_entry(backend, clock, hot_key(tracker, "TSLA", requests=1), expires_in=10)
+    hot_key(tracker, "NVDA")  # hot, but left to the next client request
+
+    assert await prewarmer.run_once() == 1
+    assert refreshed.routes == [f"{PATH}?symbol=MSFT"]
+    assert prewarmer.leader is True
+
+    clock.now += 45
+    assert await prewarmer.run_once() == 2
+    assert sorted(refreshed.routes[1:]) == [f"{PATH}?symbol=AAPL", f"{PATH}?symbol=MSFT"]
+
+
+async def test_failed_prewarm_is_retried_once_per_lead(monkeypatch, clock, refreshed):
+    backend = use_cache(monkeypatch, SimpleCache())
+    tracker = HotKeyTracker(top_k=8)
+    prewarmer = HotKeyPrewarmer(None, tracker, lead=15, interval=5)
+    await cache_entry(backend, clock, hot_key(tracker, "MSFT"), expires_in=10)
+    refreshed.statuses[f"{PATH}?symbol=MSFT"] = 503
+
+    assert await prewarmer.run_once() == 1
+    clock.now += 5
+    assert await prewarmer.run_once() == 0
+    clock.now += 10
+    assert await prewarmer.run_once() == 1
+
+    (status,) = (await prewarmer.status())["keys"]
+    assert (status["last_error"], status["refreshes"], status["failures"]) == ("HTTP 503", 2, 2)
+
+
+async def test_prewarm_runs_only_in_the_lease_holder(monkeypatch, tmp_path, clock, refreshed):
+    path = str(tmp_path / "cache.db")
+    backend = use_cache(monkeypatch, DiskCacheBackend(path=path, compact_interval=0))
+    tracker = HotKeyTracker(top_k=8)
+    prewarmer = HotKeyPrewarmer(None, tracker, lead=15, interval=5)
+    await cache_entry(backend, clock, hot_key(tracker, "MSFT"), expires_in=10)
+    assert await backend.acquire_lease("warm:hot-keys", "other-host:1:00000000", ttl=15)
+
+    assert await prewarmer.run_once() == 0
+    assert prewarmer.leader is False
+    assert refreshed.routes == []
+    await backend.close()
@@ -0,0 +1,67 @@
+"""Tests for vectorized DataFrame-to-record extraction."""
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.services.frame_extractor import (
+    ColumnSpec,
+    HISTORICAL_SPECS,
+    OPTIONS_SPECS,
+    extract_columns,
+    extract_records
+)
+
+
+def test_missing_numeric_cells_are_none_not_default():
+    df = pd.DataFrame({
+        "close": [101.5, np.nan],
+        "volume": [1000, np.nan],
+    }, index=pd.to_datetime(["2024-09-09", "2024-09-10"]))
+
+    columns = extract_columns(df, HISTORICAL_SPECS)
+
+    assert columns["close"] == [101.5, None]
+    assert columns["volume"] == [1000, None]
+    assert isinstance(columns["volume"][0], int)
+
+
+def test_absent_numeric_column_gets_the_default():
+    df = pd.DataFrame({"strike": [100.0], "bid": [np.nan]})
+
+    (record,) = extract_records(df, OPTIONS_SPECS)
+
+    assert record["bid"] is None
+    assert record["ask"] == 0.0
+    assert record["volume"] == 0
+
+
+def test_optional_kinds_stay_none_without_a_column():
+    specs = (ColumnSpec("market_cap", kind="optional_int"), ColumnSpec("beta", kind="optional_float"))
+    df = pd.DataFrame({"market_cap": [3.0e12, np.nan]})
+
+    assert extract_columns(df, specs) == {"market_cap": [3_000_000_000_000, None], "beta": [None, None]}
+
+
+def test_unparseable_numbers_are_none():
+    specs = (ColumnSpec("price", kind="float", default=0.0),)
+
+    assert extract_columns(pd.DataFrame({"price": ["1.5", "n/a"]}), specs) == {"price": [1.5, None]}
+
+
+def test_datetimes_are_python_datetimes_without_warnings():
+    df = pd.DataFrame({"close": [1.0, 2.0]}, index=pd.to_datetime(["2024-09-09", "2024-09-10"]))
+    specs = (
+        ColumnSpec("date", kind="datetime", default=None, from_index=True),
+        ColumnSpec("filed", kind="datetime", sources=("filing_date",), default=None),
+    )
+    df["filing_date"] = ["2024-09-09", "not a date"]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        columns = extract_columns(df, specs)
+
+    assert columns["date"] == [datetime(2024, 9, 9), datetime(2024, 9, 10)]
+    assert all(type(value) is datetime for value in columns["date"])
+    assert columns["filed"] == [datetime(2024, 9, 9), None]
@@ -0,0 +1,85 @@
+"""Tests for the hot cache key tracker (count-min sketch plus top-K)."""
+from types import SimpleNamespace
+
+import pytest
+
+from app.middleware import hot_keys
+from app.middleware.hot_keys import HotKeyTracker
+
+PATH = "/api/v2/mobile/yfinance/quote"
+
+
+class Clock:
+    """Settable stand-in for the tracker's time module."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(hot_keys, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+def request(tracker: HotKeyTracker, symbol: str, times: int = 1) -> int:
+    count = 0
+    for _ in range(times):
+        count = tracker.record(f"quote:{symbol}", PATH, f"symbol={symbol}")
+    return count
+
+
+def test_counts_are_estimated_without_undercounting(clock):
+    tracker = HotKeyTracker(width=64, depth=4, top_k=8)
+    for i in range(200):
+        request(tracker, f"SYM{i}", times=i % 5 + 1)
+
+    assert all(tracker.estimate(f"quote:SYM{i}") >= i % 5 + 1 for i in range(200))
+    assert tracker.estimate("quote:NEVER") >= 0
+    assert tracker.stats()["requests"] == sum(i % 5 + 1 for i in range(200))
+
+
+def test_top_k_keeps_the_most_requested_keys(clock):
+    tracker = HotKeyTracker(top_k=2, decay_interval=0)
+    request(tracker, "AAPL", times=3)
+    request(tracker, "MSFT", times=2)
+    request(tracker, "TSLA")
+
+    assert [k.key for k in tracker.top()] == ["quote:AAPL", "quote:MSFT"]
+
+    # A key overtaking the coldest tracked key replaces it
+    request(tracker, "TSLA", times=3)
+    assert [(k.key, k.count) for k in tracker.top()] == [("quote:TSLA", 4), ("quote:AAPL", 3)]
+    assert tracker.stats()["tracked"] == 2
+
+
+def test_top_keys_keep_how_to_replay_them(clock):
+    tracker = HotKeyTracker(top_k=4)
+    request(tracker, "AAPL", times=2)
+
+    (hot,) = tracker.top(1)
+    assert (hot.path, hot.query_string) == (PATH, "symbol=AAPL")
+    assert hot.status()["route"] == f"{PATH}?symbol=AAPL"
+    assert hot.status()["count"] == 2
+
+
+def test_counts_are_halved_every_decay_interval(clock):
+    tracker = HotKeyTracker(top_k=4, decay_interval=600)
+    request(tracker, "AAPL", times=8)
+    request(tracker, "MSFT")
+
+    clock.now += 599
+    request(tracker, "TSLA")
+    assert tracker.stats()["decays"] == 0
+
+    clock.now += 1
+    assert request(tracker, "AAPL") == 5
+
+    # Keys halved to zero are no longer tracked
+    assert [(k.key, k.count) for k in tracker.top()] == [("quote:AAPL", 5)]
+    assert tracker.estimate("quote:MSFT") == 0
+    assert tracker.stats()["decays"] == 1
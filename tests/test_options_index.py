@@ -0,0 +1,82 @@
+"""Tests for filtered lookups on the indexed options chain."""
+import pandas as pd
+import pytest
+
+from app.services.options_index import OptionsChainIndex
+
+EXPIRATIONS = ("2025-01-17", "2024-12-20")
+STRIKES = (110.0, 90.0, 100.0, 95.0, 105.0)
+
+
+def chain(underlying_price=100.0) -> pd.DataFrame:
+    """Unsorted chain of calls and puts at five strikes for two expirations."""
+    rows = [
+        {
+            "expiration": expiration,
+            "strike": strike,
+            "option_type": option_type,
+            "bid": strike / 100,
+            "underlying_price": underlying_price,
+        }
+        for expiration in EXPIRATIONS
+        for option_type in ("put", "call")
+        for strike in STRIKES
+    ]
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def index() -> OptionsChainIndex:
+    return OptionsChainIndex.from_frame(chain())
+
+
+def keys(records):
+    return [(r["expiration"], r["option_type"], r["strike"]) for r in records]
+
+
+def test_records_are_sorted_and_grouped(index):
+    assert index.expirations == ["2024-12-20", "2025-01-17"]
+    assert index.underlying_price == 100.0
+    assert keys(index.query()) == sorted(keys(index.records))
+    assert len(index.query()) == 20
+
+
+def test_expiration_and_type_filter(index):
+    records = index.query(expiration="2024-12-20T00:00:00", option_type="CALL")
+
+    assert keys(records) == [("2024-12-20", "call", s) for s in sorted(STRIKES)]
+
+
+def test_strike_bounds_are_inclusive(index):
+    records = index.query(expiration="2025-01-17", option_type="put", strike_min=95, strike_max=105)
+
+    assert [r["strike"] for r in records] == [95.0, 100.0, 105.0]
+
+
+def test_moneyness_selects_strikes_around_the_underlying(index):
+    records = index.query(option_type="call", moneyness=0.05)
+
+    assert keys(records) == [
+        (expiration, "call", strike)
+        for expiration in sorted(EXPIRATIONS)
+        for strike in (95.0, 100.0, 105.0)
+    ]
+
+
+def test_moneyness_needs_the_underlying_price():
+    index = OptionsChainIndex.from_frame(chain(underlying_price=None))
+
+    with pytest.raises(ValueError):
+        index.query(moneyness=0.05)
+
+
+def test_limit_stops_in_index_order(index):
+    records = index.query(limit=7)
+
+    assert keys(records) == keys(index.query())[:7]
+
+
+def test_unknown_expiration_and_empty_chain_return_nothing(index):
+    assert index.query(expiration="2030-01-01") == []
+    assert index.query(option_type="straddle") == []
+    assert OptionsChainIndex.from_frame(None).query() == []
@@ -0,0 +1,69 @@
+"""Tests for page-number and cursor pagination of historical datasets."""
+import base64
+import json
+
+import pytest
+
+from app.services.data_transformer import DataTransformer
+
+SCOPE = "AAPL:2024-01-01:2024-12-31:yfinance"
+RECORDS = [{"close": float(i)} for i in range(10)]
+
+
+def test_cursor_round_trip():
+    cursor = DataTransformer.encode_cursor(20, 10, SCOPE)
+
+    assert "=" not in cursor
+    assert DataTransformer.decode_cursor(cursor, SCOPE) == (20, 10)
+
+
+def test_cursor_from_another_scope_is_rejected():
+    cursor = DataTransformer.encode_cursor(20, 10, SCOPE)
+
+    with pytest.raises(ValueError, match="does not belong"):
+        DataTransformer.decode_cursor(cursor, "MSFT:2024-01-01:2024-12-31:yfinance")
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "W10", "!!!"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        DataTransformer.decode_cursor(cursor, SCOPE)
+
+
+@pytest.mark.parametrize("offset, limit", [(-1, 10), (0, 0), (0, 10_000)])
+def test_tampered_cursor_is_rejected(offset, limit):
+    cursor = DataTransformer.encode_cursor(0, 10, SCOPE)
+    payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    payload.update(o=offset, l=limit)
+    tampered = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    with pytest.raises(ValueError, match="out of range"):
+        DataTransformer.decode_cursor(tampered, SCOPE)
+
+
+def test_cursors_walk_the_dataset():
+    page, meta = DataTransformer.paginate(RECORDS, 1, 4, cursor_scope=SCOPE)
+    assert page == RECORDS[:4]
+    assert meta["prev_cursor"] is None
+
+    page, meta = DataTransformer.paginate(RECORDS, 1, 4, meta["next_cursor"], SCOPE)
+    assert page == RECORDS[4:8]
+    assert meta["page"] == 2
+
+    page, last = DataTransformer.paginate(RECORDS, 1, 4, meta["next_cursor"], SCOPE)
+    assert page == RECORDS[8:]
+    assert last["next_cursor"] is None
+
+    page, _ = DataTransformer.paginate(RECORDS, 1, 4, last["prev_cursor"], SCOPE)
+    assert page == RECORDS[4:8]
+
+
+def test_columnar_data_is_sliced_per_column():
+    columns = {"close": [r["close"] for r in RECORDS], "volume": list(range(10))}
+
+    page, meta = DataTransformer.paginate(columns, 2, 3)
+
+    assert page == {"close": [3.0, 4.0, 5.0], "volume": [3, 4, 5]}
+    assert meta["total"] == 10
+    assert meta["total_pages"] == 4
+    assert "next_cursor" not in meta
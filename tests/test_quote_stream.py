@@ -0,0 +1,112 @@
+"""Tests for the shared quote stream hub."""
+import pytest
+
+from app.services import quote_stream
+from app.services.quote_stream import QuoteHub
+
+pytestmark = pytest.mark.asyncio
+
+
+class QuoteService:
+    """Stub batch quote service; symbols without a price are not found."""
+
+    def __init__(self):
+        self.prices = {}
+        self.calls = []
+        self.during_fetch = None
+
+    async def get_equity_quotes(self, symbols, provider="yfinance"):
+        self.calls.append(sorted(symbols))
+        if self.during_fetch is not None:
+            self.during_fetch()
+        quotes = {
+            s: {"symbol": s, "price": self.prices[s], "volume": len(self.calls)}
+            for s in symbols if s in self.prices
+        }
+        return quotes, {}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = QuoteService()
+    monkeypatch.setattr(quote_stream, "get_openbb_service", lambda: service)
+    return service
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    async def no_loop(self):
+        pass
+
+    # Polls are driven by the tests
+    monkeypatch.setattr(QuoteHub, "_loop", no_loop)
+    return QuoteHub(interval=60)
+
+
+async def events(subscriber, timeout=0.1):
+    return sorted(await subscriber.next_events(timeout), key=lambda e: e[1]["symbol"])
+
+
+async def test_only_price_changes_are_published(hub, service):
+    subscriber = hub.subscribe(["AAPL", "MSFT"])
+    service.prices = {"AAPL": 190.0, "MSFT": 420.0}
+
+    assert await hub.poll() == 2
+    assert [(name, quote["price"]) for name, quote in await events(subscriber)] == [
+        ("quote", 190.0), ("quote", 420.0)
+    ]
+
+    # Volume moved, prices did not
+    assert await hub.poll() == 0
+    assert await events(subscriber, timeout=0.01) == []
+
+    service.prices["AAPL"] = 191.0
+    assert await hub.poll() == 1
+    assert await events(subscriber) == [("quote", {"symbol": "AAPL", "price": 191.0, "volume": 3})]
+
+
+async def test_missing_symbol_is_reported_once(hub, service):
+    subscriber = hub.subscribe(["GONE"])
+
+    assert await hub.poll() == 1
+    assert await events(subscriber) == [("error", {"symbol": "GONE", "error": "Not found"})]
+    assert await hub.poll() == 0
+
+
+async def test_new_subscriber_gets_the_latest_event(hub, service):
+    hub.subscribe(["AAPL"])
+    service.prices = {"AAPL": 190.0}
+    await hub.poll()
+
+    late = hub.subscribe(["AAPL"])
+
+    assert [quote["price"] for _, quote in await events(late)] == [190.0]
+
+
+async def test_unsubscribed_symbols_stop_being_polled(hub, service):
+    both = hub.subscribe(["AAPL", "MSFT"])
+    aapl = hub.subscribe(["AAPL"])
+    service.prices = {"AAPL": 190.0, "MSFT": 420.0}
+    await hub.poll()
+
+    hub.unsubscribe(both)
+    service.prices = {"AAPL": 191.0, "MSFT": 421.0}
+    assert await hub.poll() == 1
+
+    assert service.calls[-1] == ["AAPL"]
+    assert [quote["price"] for _, quote in await events(aapl)] == [191.0]
+    assert hub.stats()["symbols"] == 1
+
+
+async def test_symbol_unsubscribed_during_a_poll_is_dropped(hub, service):
+    subscriber = hub.subscribe(["AAPL"])
+    service.prices = {"AAPL": 190.0}
+    service.during_fetch = lambda: hub.unsubscribe(subscriber)
+
+    assert await hub.poll() == 0
+
+    # No state is kept for it: a new subscriber waits for a fresh poll
+    service.during_fetch = None
+    late = hub.subscribe(["AAPL"])
+    assert await events(late, timeout=0.01) == []
+    assert hub.stats()["symbols"] == 1
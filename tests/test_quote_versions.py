@@ -0,0 +1,91 @@
+"""Tests for quote versions and delta responses."""
+import pytest
+
+from app.services.data_transformer import DataTransformer
+from app.services.quote_versions import QuoteVersionStore
+
+QUOTE = {
+    "symbol": "AAPL",
+    "name": "Apple Inc.",
+    "price": 190.0,
+    "change": 1.5,
+    "volume": 1000,
+    "last_updated": "2024-09-10T15:00:00",
+}
+
+
+@pytest.fixture
+def versions() -> QuoteVersionStore:
+    return QuoteVersionStore(max_symbols=10, history=3)
+
+
+def test_version_ignores_fetch_timestamps(versions):
+    refetched = {**QUOTE, "last_updated": "2024-09-10T15:00:05"}
+
+    assert versions.record("AAPL", QUOTE) == versions.record("aapl", refetched)
+    assert versions.record("AAPL", {**QUOTE, "price": 191.0}) != versions.record("AAPL", QUOTE)
+
+
+def test_unchanged_quote(versions):
+    version = versions.record("AAPL", QUOTE)
+
+    assert versions.delta("AAPL", QUOTE, version) == {
+        "symbol": "AAPL", "version": version, "unchanged": True
+    }
+
+
+def test_changed_fields_only(versions):
+    since = versions.record("AAPL", QUOTE)
+    changed = {**QUOTE, "price": 191.0, "change": 2.5, "last_updated": "2024-09-10T15:01:00"}
+
+    delta = versions.delta("AAPL", changed, since)
+
+    assert delta == {
+        "symbol": "AAPL",
+        "version": versions.version_of(changed),
+        "since": since,
+        "changes": {"price": 191.0, "change": 2.5},
+    }
+
+
+def test_dropped_fields_are_null(versions):
+    since = versions.record("AAPL", QUOTE)
+    without_volume = {k: v for k, v in QUOTE.items() if k != "volume"}
+
+    assert versions.delta("AAPL", without_volume, since)["changes"] == {"volume": None}
+
+
+@pytest.mark.parametrize("since", [None, "", "0123456789abcdef"])
+def test_unknown_version_gets_the_full_quote(versions, since):
+    delta = versions.delta("AAPL", QUOTE, since)
+
+    assert delta == {**QUOTE, "version": versions.version_of(QUOTE)}
+
+
+def test_version_evicted_from_history_gets_the_full_quote(versions):
+    since = versions.record("AAPL", QUOTE)
+    for price in (191.0, 192.0, 193.0):
+        versions.record("AAPL", {**QUOTE, "price": price})
+
+    assert "changes" not in versions.delta("AAPL", {**QUOTE, "price": 194.0}, since)
+
+
+def test_fields_limit_the_delta(versions):
+    since = versions.record("AAPL", QUOTE)
+    changed = {**QUOTE, "price": 191.0, "change": 2.5, "volume": 2000}
+    fields = DataTransformer.parse_fields("price, change")
+
+    assert versions.delta("AAPL", changed, since, fields)["changes"] == {"price": 191.0, "change": 2.5}
+    assert set(versions.delta("AAPL", changed, None, fields)) == {"price", "change", "version"}
+
+
+def test_scopes_keep_separate_histories(versions):
+    crypto = {**QUOTE, "symbol": "BTC-USD", "pair": "BTC-USD"}
+    equity = {k: v for k, v in crypto.items() if k != "pair"}
+    since = versions.record("BTC-USD", crypto, scope="crypto")
+
+    # The equity route does not know the crypto version: no `pair: null` delta
+    delta = versions.delta("BTC-USD", equity, since)
+    assert delta == {**equity, "version": versions.version_of(equity)}
+
+    assert versions.delta("BTC-USD", crypto, since, scope="crypto")["unchanged"] is True
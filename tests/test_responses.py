@@ -0,0 +1,64 @@
+"""Tests for NDJSON streaming, plain and gzipped."""
+import gzip
+import zlib
+
+import pytest
+
+from app.responses import NDJSON_MEDIA_TYPE, NDJSONResponse, loads
+
+pytestmark = pytest.mark.asyncio
+
+CHUNKS = [
+    [{"strike": 95.0, "bid": 1.2}, {"strike": 100.0, "bid": float("nan")}],
+    [],
+    [{"strike": 105.0, "bid": 0.4}],
+]
+
+
+async def blocks(response: NDJSONResponse) -> list:
+    return [block async for block in response.body_iterator]
+
+
+def lines(block: bytes) -> list:
+    assert block.endswith(b"\n")
+    return [loads(line) for line in block.splitlines()]
+
+
+async def test_one_block_of_lines_per_chunk():
+    response = NDJSONResponse(iter(CHUNKS))
+
+    body = await blocks(response)
+
+    assert response.media_type == NDJSON_MEDIA_TYPE
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in response.headers
+    assert [lines(block) for block in body] == [
+        [{"strike": 95.0, "bid": 1.2}, {"strike": 100.0, "bid": None}],
+        [{"strike": 105.0, "bid": 0.4}],
+    ]
+
+
+async def test_gzipped_blocks_decompress_to_whole_lines():
+    response = NDJSONResponse(iter(CHUNKS), compress=True)
+
+    body = await blocks(response)
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    # Every flushed block decompresses on its own to complete lines
+    decompressor = zlib.decompressobj(wbits=31)
+    decoded = [decompressor.decompress(block) for block in body]
+    assert [lines(block) for block in decoded[:-1]] == [
+        [{"strike": 95.0, "bid": 1.2}, {"strike": 100.0, "bid": None}],
+        [{"strike": 105.0, "bid": 0.4}],
+    ]
+    assert decoded[-1] == b""
+    assert decompressor.eof
+
+    # And the whole stream is one valid gzip member
+    assert len(lines(gzip.decompress(b"".join(body)))) == 3
+
+
+async def test_empty_stream_is_valid_gzip():
+    response = NDJSONResponse(iter([]), compress=True)
+
+    assert gzip.decompress(b"".join(await blocks(response))) == b""
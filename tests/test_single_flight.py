@@ -0,0 +1,150 @@
+"""Tests for single-flight coalescing of identical upstream calls."""
+import asyncio
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.services.openbb_service import OpenBBService
+from app.services.single_flight import SingleFlight, single_flight
+
+pytestmark = pytest.mark.asyncio
+
+
+class Upstream:
+    """Slow upstream call, released by the test, counting invocations."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error = None
+
+    async def __call__(self, value="result"):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {"value": value}
+
+
+async def test_concurrent_callers_share_one_call():
+    group, upstream = SingleFlight(), Upstream()
+    callers = [asyncio.ensure_future(group.do("key", upstream)) for _ in range(3)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+
+    results = await asyncio.gather(*callers)
+
+    assert upstream.calls == 1
+    assert results == [{"value": "result"}] * 3
+    # Coalesced callers get their own (shallow) copy
+    assert results[0] is not results[1]
+    assert group.stats() == {"calls": 1, "coalesced": 2, "in_flight": 0}
+
+
+async def test_finished_call_is_not_reused():
+    group, upstream = SingleFlight(), Upstream()
+    upstream.release.set()
+
+    await group.do("key", upstream)
+    await group.do("key", upstream)
+
+    assert upstream.calls == 2
+
+
+async def test_different_keys_do_not_coalesce():
+    group, upstream = SingleFlight(), Upstream()
+    upstream.release.set()
+
+    await asyncio.gather(group.do("a", upstream), group.do("b", upstream))
+
+    assert upstream.calls == 2
+
+
+async def test_exception_reaches_every_caller_and_is_not_cached():
+    group, upstream = SingleFlight(), Upstream()
+    upstream.error = ConnectionError("upstream timeout")
+    callers = [asyncio.ensure_future(group.do("key", upstream)) for _ in range(2)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert all(isinstance(r, ConnectionError) for r in results)
+    upstream.error = None
+    assert await group.do("key", upstream) == {"value": "result"}
+    assert upstream.calls == 2
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    group, upstream = SingleFlight(), Upstream()
+    leader = asyncio.ensure_future(group.do("key", upstream))
+    follower = asyncio.ensure_future(group.do("key", upstream))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    upstream.release.set()
+
+    assert await follower == {"value": "result"}
+    assert leader.cancelled()
+    assert upstream.calls == 1
+
+
+async def test_decorator_keys_on_bound_arguments():
+    upstream = Upstream()
+    upstream.release.set()
+
+    class Service:
+        def __init__(self):
+            self._single_flight = SingleFlight()
+
+        @single_flight
+        async def quote(self, symbol, provider="yfinance"):
+            return await upstream(symbol)
+
+    service = Service()
+    await asyncio.gather(
+        service.quote("AAPL"),
+        service.quote(symbol="AAPL"),
+        service.quote("AAPL", provider="yfinance"),
+        service.quote("MSFT")
+    )
+
+    assert upstream.calls == 2
+
+
+class FakeOBB:
+    """The `equity.price.quote` SDK call, counting invocations."""
+
+    def __init__(self):
+        self.calls = 0
+        self.equity = SimpleNamespace(price=SimpleNamespace(quote=self.quote))
+
+    def quote(self, symbol: str, provider: str) -> pd.DataFrame:
+        self.calls += 1
+        return pd.DataFrame([{"symbol": s, "price": 100.0} for s in symbol.split(",")])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "BAR_STORE_DIR", "")
+    monkeypatch.setattr(OpenBBService, "_initialize_openbb", lambda self: None)
+    service = OpenBBService()
+    service._obb = FakeOBB()
+    yield service
+    for executor in service._executors.values():
+        executor.shutdown(wait=False)
+
+
+async def test_coalesced_quote_callers_do_not_share_mutations(service):
+    first, second = await asyncio.gather(
+        service.get_equity_quote("BTC-USD"),
+        service.get_equity_quote("BTC-USD")
+    )
+    assert service._obb.calls == 1
+    assert service.get_single_flight_stats()["coalesced"] == 1
+
+    first["pair"] = "BTC-USD"
+    assert "pair" not in second